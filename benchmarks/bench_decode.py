@@ -0,0 +1,114 @@
+"""TFA.me station integration: decode throughput and bytes on the wire.
+
+Decode of a large '/sensors' reply into the record store:
+- stream: 'TFAmeSensorStream.feed()' chunk by chunk (stdlib decoder)
+- json: 'TFAmeSensorStream.parse_body()' at once with 'json.loads'
+- orjson: 'TFAmeSensorStream.parse_body()' at once with 'orjson.loads'
+  (decoder.py, used when installed)
+
+Bytes on the wire: polls of the local stand-in station (simulator.py) with
+and without gzip, over a session like the shared one (client.py). Needs
+aiohttp, the decode part runs without it.
+
+Usage: python benchmarks/bench_decode.py [sensors] [polls]
+"""
+
+import asyncio
+import json
+import sys
+import time
+
+from bench_memory import build_payload
+from common import load_integration_module
+
+const = load_integration_module("const")
+decoder = load_integration_module("decoder")
+records = load_integration_module("records")
+stream = load_integration_module("stream")
+
+REPEAT = 20
+
+
+def parse_stream(store, body: bytes, now_ts: int) -> None:
+    """Feed chunks as received."""
+    parser = stream.TFAmeSensorStream(store, False, now_ts)
+    for pos in range(0, len(body), const.STREAM_CHUNK):
+        parser.feed(body[pos : pos + const.STREAM_CHUNK])
+    parser.close()
+
+
+def parse_json(store, body: bytes, now_ts: int) -> None:
+    """Complete reply with the stdlib decoder."""
+    stream.TFAmeSensorStream(store, False, now_ts).parse_body(body, json.loads)
+
+
+def parse_fast(store, body: bytes, now_ts: int) -> None:
+    """Complete reply with the decoder of decoder.py."""
+    stream.TFAmeSensorStream(store, False, now_ts).parse_body(body)
+
+
+def measure_decode(parse, body: bytes, now_ts: int) -> float:
+    """Return best ms per reply."""
+    store = records.TFAmeRecordStore(False)
+    parse(store, body, now_ts)  # First poll creates the records
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        parse(store, body, now_ts)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+async def measure_wire(sensors: int, polls: int) -> None:
+    """Print bytes on the wire and latency with and without gzip."""
+    import aiohttp  # noqa: PLC0415
+
+    from simulator import SimulatorConfig, StationSimulator  # noqa: PLC0415
+
+    for use_gzip in (False, True):
+        simulator = StationSimulator(SimulatorConfig(sensors=sensors, gzip=use_gzip))
+        await simulator.start()
+        latencies: list[float] = []
+        try:
+            async with aiohttp.ClientSession(
+                headers={aiohttp.hdrs.ACCEPT_ENCODING: "gzip"}
+            ) as session:
+                for _ in range(polls):
+                    start = time.perf_counter()
+                    async with session.get(simulator.url) as response:
+                        body = await response.read()
+                    latencies.append(time.perf_counter() - start)
+        finally:
+            await simulator.stop()
+        latencies.sort()
+        print(
+            f"  {'gzip' if use_gzip else 'plain':<7} "
+            f"{simulator.bytes_sent / simulator.requests / 1024:8.1f} KiB on wire "
+            f"{len(body) / 1024:8.1f} KiB decoded  "
+            f"p50 {latencies[len(latencies) // 2] * 1000:7.2f} ms"
+        )
+
+
+def main(sensors: int, polls: int) -> None:
+    """Run benchmark."""
+    now_ts = int(time.time())
+    body = json.dumps(build_payload(1, sensors, now_ts)).encode()
+    mib = len(body) / (1024 * 1024)
+    print(f"{sensors} sensors, {len(body) / 1024:.1f} KiB reply")
+    variants = [("stream", parse_stream), ("json", parse_json)]
+    if decoder.DECODER == "orjson":
+        variants.append(("orjson", parse_fast))
+    for name, parse in variants:
+        ms = measure_decode(parse, body, now_ts)
+        print(f"  {name:<7} {ms:8.2f} ms  {mib / (ms / 1000):7.1f} MiB/s")
+
+    print(f"{polls} polls of the stand-in station")
+    try:
+        asyncio.run(measure_wire(sensors, polls))
+    except ImportError as error:
+        print(f"  skipped: {error}")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    main(*(args + [3000, 50][len(args) :]))
@@ -0,0 +1,57 @@
+"""TFA.me station integration: cost of the derived measurements.
+
+Dew point, absolute humidity, heat index, wind chill, Beaufort and rain rate
+('TFAmeDerivedMetrics', derived.py) after a poll:
+- all: every sensor transmitted (first poll, restore)
+- changed: some sensors transmitted, the usual poll
+
+Usage: python benchmarks/bench_derived.py [sensors] [changed]
+"""
+
+import sys
+import time
+
+from bench_memory import build_payload
+from common import load_integration_module
+
+derived = load_integration_module("derived")
+records = load_integration_module("records")
+
+REPEAT = 20
+
+
+def measure(sensors: int, changed: int) -> tuple[float, float, int]:
+    """Return best ms of parse and derived update, number of derived records."""
+    now_ts = int(time.time())
+    payload = build_payload(1, sensors, now_ts)
+    store = records.TFAmeRecordStore(False)
+    metrics = derived.TFAmeDerivedMetrics()
+    metrics.update(store, store.update(payload, False, now_ts))
+    best_parse = best_derived = float("inf")
+    for poll in range(1, REPEAT + 1):
+        for sensor in payload["sensors"][:changed]:
+            sensor["ts"] = now_ts + 60 * poll  # New transmission
+        start = time.perf_counter()
+        changed_ids = store.update(payload, False, now_ts + 60 * poll)
+        parsed = time.perf_counter()
+        metrics.update(store, changed_ids)
+        best_parse = min(best_parse, parsed - start)
+        best_derived = min(best_derived, time.perf_counter() - parsed)
+    count = sum(record.derived for record in store.records.values())
+    return best_parse * 1000, best_derived * 1000, count
+
+
+def main(sensors: int, changed: int) -> None:
+    """Run benchmark."""
+    print(f"{sensors} sensors")
+    for name, count in (("all", sensors), ("changed", changed)):
+        parse_ms, derived_ms, derived_count = measure(sensors, count)
+        print(
+            f"  {name:<8} {count:6d} sensors  parse {parse_ms:8.2f} ms  "
+            f"derived {derived_ms:8.2f} ms  ({derived_count} derived entities)"
+        )
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    main(*(args + [3000, 30][len(args) :]))
@@ -0,0 +1,151 @@
+"""TFA.me station integration: end-to-end benchmark against the simulator.
+
+Sets up the integration (config entry, coordinator, sensor platform) in a
+test instance of Home Assistant against a local stand-in station
+(simulator.py) and reports for 10, 100 and 1000 entities:
+- poll: 'coordinator.async_refresh()' incl. request, parse and state writes
+- parse: time spent in the reply parser (stream.py) per poll
+- alloc: peak of allocated memory during one poll (tracemalloc)
+- writes/s: 'state_changed' events per second of polling
+
+Every request is a new transmission of all sensors (worst case), entities
+write their state unless the publish filter holds it back (state.py).
+
+Requires Home Assistant and its test helpers:
+    pip install pytest-homeassistant-custom-component
+
+Usage: python benchmarks/bench_e2e.py [polls] [entities ...]
+"""
+
+import asyncio
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from homeassistant import loader
+from homeassistant.const import CONF_IP_ADDRESS, EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, callback
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_test_home_assistant,
+)
+
+from simulator import SimulatorConfig, StationSimulator, sensors_for_entities
+
+REPO_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(REPO_DIR))  # Import "custom_components" of this repo
+
+from custom_components.a_tfa_me_1.const import (  # noqa: E402
+    CONF_INTERVAL,
+    CONF_MIN_SPACING,
+    CONF_MULTIPLE_ENTITIES,
+    DOMAIN,
+)
+
+ALLOC_POLLS = 5  # Polls measured with tracemalloc (slows down everything)
+
+
+def percentile(values: list[float], share: float) -> float:
+    """Return percentile of values (share 0...1)."""
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+async def bench_station(hass: HomeAssistant, entities: int, polls: int) -> str:
+    """Set up one station with about 'entities' entities, return report line."""
+    simulator = StationSimulator(
+        SimulatorConfig(sensors=sensors_for_entities(entities))
+    )
+    host = await simulator.start()
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="TFA.me benchmark",
+        unique_id=f"bench_{entities}",
+        data={
+            CONF_IP_ADDRESS: host,
+            CONF_INTERVAL: 3600,  # Only polls of the benchmark
+            CONF_MULTIPLE_ENTITIES: False,
+        },
+        # Back-to-back refreshes: every refresh is a request
+        options={CONF_MIN_SPACING: 0},
+    )
+    entry.add_to_hass(hass)
+
+    writes = 0
+
+    @callback
+    def _count_write(_event: Event) -> None:
+        nonlocal writes
+        writes += 1
+
+    try:
+        if not await hass.config_entries.async_setup(entry.entry_id):
+            raise RuntimeError("Setup of config entry failed")
+        await hass.async_block_till_done()
+        coordinator = entry.runtime_data
+        unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, _count_write)
+
+        # Poll latency, parse time & state writes
+        latencies: list[float] = []
+        parse_times: list[float] = []
+        for _ in range(polls):
+            start = time.perf_counter()
+            await coordinator.async_refresh()
+            latencies.append(time.perf_counter() - start)
+            # Decode & parse of the reply (feed() or parse_body()), timed by
+            # the parser for the poll metrics
+            timing = coordinator.timing
+            parse_times.append(timing.decode + timing.parse)
+        await hass.async_block_till_done()
+        poll_writes = writes
+
+        # Allocations
+        peaks: list[int] = []
+        tracemalloc.start()
+        for _ in range(ALLOC_POLLS):
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            await coordinator.async_refresh()
+            peaks.append(tracemalloc.get_traced_memory()[1] - base)
+        tracemalloc.stop()
+        unsub()
+
+        if not coordinator.last_update_success:
+            raise RuntimeError("Polls failed: " + str(coordinator.last_exception))
+        entity_count = len(coordinator.entity_index)
+    finally:
+        await hass.config_entries.async_unload(entry.entry_id)
+        await simulator.stop()
+
+    return (
+        f"{entity_count:8d} {simulator.bytes_sent / simulator.requests / 1024:8.1f} "
+        f"{statistics.median(latencies) * 1000:8.2f} "
+        f"{percentile(latencies, 0.95) * 1000:8.2f} "
+        f"{statistics.median(parse_times) * 1000:8.2f} "
+        f"{max(peaks) / 1024:10.1f} "
+        f"{poll_writes / sum(latencies):10.0f}"
+    )
+
+
+async def main(polls: int, sizes: list[int]) -> None:
+    """Run benchmark, one Home Assistant instance per size."""
+    print(f"{polls} polls per size, times in ms")
+    print(
+        f"{'entities':>8} {'KiB':>8} {'poll p50':>8} {'poll p95':>8} "
+        f"{'parse':>8} {'alloc KiB':>10} {'writes/s':>10}"
+    )
+    for entities in sizes:
+        # Storage (snapshot, rain history, registries) in a temporary
+        # directory, the integration is imported from this repository
+        with tempfile.TemporaryDirectory() as config_dir:
+            async with async_test_home_assistant(config_dir=config_dir) as hass:
+                hass.data.pop(loader.DATA_CUSTOM_COMPONENTS, None)
+                print(await bench_station(hass, entities, polls))
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    asyncio.run(main(args[0] if args else 50, args[1:] or [10, 100, 1000]))
@@ -0,0 +1,76 @@
+"""TFA.me station integration: cost of an unchanged reply.
+
+Between sensor transmissions the station sends the same '/sensors' reply
+again. Compares per poll:
+- parse: 'TFAmeSensorStream' fed chunk by chunk (stream.py), as before
+- fingerprint: BLAKE2b of the chunks and 'TFAmeRecordStore.refresh()' for
+  entities going stale, what the coordinator does for an equal reply
+
+Usage: python benchmarks/bench_fingerprint.py [sensors ...]
+"""
+
+import hashlib
+import json
+import sys
+import time
+
+from bench_memory import build_payload
+from common import load_integration_module
+
+const = load_integration_module("const")
+records = load_integration_module("records")
+stream = load_integration_module("stream")
+
+REPEAT = 50
+
+
+def parse(store, chunks: list[bytes], now_ts: int) -> None:
+    """Parse every reply."""
+    parser = stream.TFAmeSensorStream(store, False, now_ts)
+    for chunk in chunks:
+        parser.feed(chunk)
+    parser.close()
+
+
+def fingerprint(store, chunks: list[bytes], now_ts: int) -> None:
+    """Hash the reply, refresh stale entities only."""
+    digest = hashlib.blake2b(digest_size=16)
+    for chunk in chunks:
+        digest.update(chunk)
+    digest.digest()
+    store.refresh(now_ts)
+
+
+def measure(poll, chunks: list[bytes], now_ts: int) -> float:
+    """Return ms per poll (best of three)."""
+    store = records.TFAmeRecordStore(False)
+    parse(store, chunks, now_ts)  # First poll creates the records
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(REPEAT):
+            poll(store, chunks, now_ts)
+        best = min(best, (time.perf_counter() - start) / REPEAT)
+    return best * 1000
+
+
+def main(sizes: list[int]) -> None:
+    """Run benchmark."""
+    now_ts = int(time.time())
+    print(f"{'sensors':>8} {'KiB':>8} {'parse ms':>10} {'hash ms':>10} {'saved':>7}")
+    for sensors in sizes:
+        body = json.dumps(build_payload(1, sensors, now_ts)).encode()
+        chunks = [
+            body[pos : pos + const.STREAM_CHUNK]
+            for pos in range(0, len(body), const.STREAM_CHUNK)
+        ]
+        parse_ms = measure(parse, chunks, now_ts)
+        hash_ms = measure(fingerprint, chunks, now_ts)
+        print(
+            f"{sensors:8d} {len(body) / 1024:8.1f} {parse_ms:10.3f} "
+            f"{hash_ms:10.3f} {100 * (1 - hash_ms / parse_ms):6.1f}%"
+        )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10, 100, 1000])
@@ -0,0 +1,141 @@
+"""TFA.me station integration: memory of parsed data, dicts vs. records.
+
+Compares the old per-entity dict snapshot (rebuilt every poll) with the
+slotted records of 'TFAmeRecordStore' (records.py, updated in place) for
+several gateways with many sensors.
+
+Usage: python benchmarks/bench_memory.py [gateways] [sensors_per_gateway]
+"""
+
+import sys
+import time
+import tracemalloc
+
+from common import load_integration_module
+
+records = load_integration_module("records")
+
+# Mix of sensor types: A0 T/H, A1 rain, A2 wind, station 05 T/H/BP
+SENSOR_TYPES = {
+    "a0": {"temperature": "°C", "humidity": "%"},
+    "a1": {"rain": "mm"},
+    "a2": {"wind_direction": "", "wind_speed": "m/s", "wind_gust": "m/s"},
+    "05": {"temperature": "°C", "humidity": "%", "barometric_pressure": "hPa"},
+}
+
+
+def build_payload(gateway: int, sensor_count: int, ts: int) -> dict:
+    """Build a decoded '/sensors' reply."""
+    sensors = []
+    for i in range(sensor_count):
+        prefix = list(SENSOR_TYPES)[i % len(SENSOR_TYPES)]
+        measurements = {
+            name: {"value": str(20 + i % 7), "unit": unit}
+            for name, unit in SENSOR_TYPES[prefix].items()
+        }
+        measurements["rssi"] = {"value": "180", "unit": ""}
+        measurements["lowbatt"] = {"value": "0", "unit": ""}
+        sensors.append(
+            {
+                "sensor_id": f"{prefix}{gateway:02x}{i:05x}",
+                "name": f"{prefix.upper()}{gateway:02X}{i:05X}",
+                "timestamp": "2025-03-06T08:46:01Z",
+                "ts": ts,
+                "measurements": measurements,
+            }
+        )
+    return {"gateway_id": f"01765{gateway:04x}", "sensors": sensors}
+
+
+# ---- Old parser: new dict per entity and poll (coordinator before records) ----
+def parse_dicts(json_data: dict, multiple_entities: bool) -> dict:
+    """Old parser."""
+    parsed_data = {}
+    gateway_id: str = json_data.get("gateway_id", "tfame").lower()
+    for sensor in json_data.get("sensors", []):
+        sensor_id = sensor["sensor_id"]
+        for measurement, values in sensor.get("measurements", {}).items():
+            if multiple_entities:
+                entity_id = f"sensor.{gateway_id}_{sensor_id}_{measurement}"
+            else:
+                entity_id = f"sensor.{sensor_id}_{measurement}"
+            parsed_data[entity_id] = {
+                "sensor_id": sensor_id,
+                "gateway_id": gateway_id,
+                "sensor_name": sensor["name"],
+                "measurement": measurement,
+                "value": values["value"],
+                "unit": values["unit"],
+                "timestamp": sensor.get("timestamp", "unknown"),
+                "ts": sensor["ts"],
+            }
+            if measurement == "rain":
+                for suffix in ("rel", "hour"):
+                    parsed_data[f"{entity_id}_{suffix}"] = {
+                        "sensor_id": sensor_id,
+                        "gateway_id": gateway_id,
+                        "sensor_name": f"{sensor['name']} {suffix}",
+                        "measurement": measurement,
+                        "value": values["value"],
+                        "unit": values["unit"],
+                        "timestamp": sensor.get("timestamp", "unknown"),
+                        "ts": sensor["ts"],
+                        "reset_rain": False,
+                    }
+    return parsed_data
+
+
+def measure(payloads: list[dict], polls: int, use_records: bool) -> tuple:
+    """Return (entities, retained bytes, allocated bytes per poll, s per poll)."""
+    stores = [records.TFAmeRecordStore(True) for _ in payloads]
+    snapshots: list[dict] = [{} for _ in payloads]
+
+    tracemalloc.start()
+    # First poll creates everything, this is the retained memory
+    for index, payload in enumerate(payloads):
+        if use_records:
+            stores[index].update(payload, False, payload["sensors"][0]["ts"])
+            snapshots[index] = stores[index].records
+        else:
+            snapshots[index] = parse_dicts(payload, True)
+    retained = tracemalloc.get_traced_memory()[0]
+
+    # Following polls, old snapshot is replaced (dicts) or updated (records)
+    def poll() -> None:
+        for index, payload in enumerate(payloads):
+            if use_records:
+                stores[index].update(payload, False, payload["sensors"][0]["ts"])
+            else:
+                snapshots[index] = parse_dicts(payload, True)
+
+    tracemalloc.reset_peak()
+    poll()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    # Time without tracing
+    start = time.perf_counter()
+    for _ in range(polls):
+        poll()
+    duration = (time.perf_counter() - start) / polls
+
+    entities = sum(len(snapshot) for snapshot in snapshots)
+    return entities, retained, peak - retained, duration
+
+
+def main(gateways: int, sensors: int) -> None:
+    """Run benchmark."""
+    ts = int(time.time())
+    payloads = [build_payload(gateway, sensors, ts) for gateway in range(gateways)]
+    for name, use_records in (("dicts", False), ("records", True)):
+        entities, retained, per_poll, duration = measure(payloads, 50, use_records)
+        print(
+            f"{name:<8} {entities} entities  retained {retained / 1024:8.1f} KiB  "
+            f"({retained / entities:6.1f} B/entity)  "
+            f"poll peak {per_poll / 1024:8.1f} KiB  {duration * 1000:6.2f} ms/poll"
+        )
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    main(*(args + [4, 60][len(args) :]))
@@ -0,0 +1,91 @@
+"""TFA.me station integration: peak memory and event loop blocking of parsing.
+
+Compares for a small and a large '/sensors' reply:
+- json: complete body decoded at once on the event loop (old 'response.json()')
+- stream: 'TFAmeSensorStream' fed chunk by chunk (stream.py)
+- executor: body decoded in executor, only the record update on the loop
+  (not used by the coordinator: the record update alone blocks longer than
+  any stream step and the peak memory is that of 'json')
+
+"blocking" is the longest single step running on the event loop.
+
+Usage: python benchmarks/bench_parse.py [small_sensors] [large_sensors]
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+
+from bench_memory import build_payload
+from common import load_integration_module
+
+const = load_integration_module("const")
+records = load_integration_module("records")
+stream = load_integration_module("stream")
+
+REPEAT = 20
+
+
+def parse_json(store, body: bytes, now_ts: int) -> float:
+    """Old: decode complete body on the loop."""
+    start = time.perf_counter()
+    json_data = json.loads(bytes(body))  # bytes(): response.read() buffer
+    store.update(json_data, False, now_ts)
+    return time.perf_counter() - start
+
+
+def parse_stream(store, body: bytes, now_ts: int) -> float:
+    """New: feed chunks as received, every chunk is one step on the loop."""
+    parser = stream.TFAmeSensorStream(store, False, now_ts)
+    blocking = 0.0
+    for pos in range(0, len(body), const.STREAM_CHUNK):
+        chunk = body[pos : pos + const.STREAM_CHUNK]
+        start = time.perf_counter()
+        parser.feed(chunk)
+        blocking = max(blocking, time.perf_counter() - start)
+    start = time.perf_counter()
+    parser.close()
+    return max(blocking, time.perf_counter() - start)
+
+
+def parse_executor(store, body: bytes, now_ts: int) -> float:
+    """New, large replies: decode in executor, update records on the loop."""
+    json_data = json.loads(bytes(body))  # Runs in executor thread
+    start = time.perf_counter()
+    store.update(json_data, False, now_ts)
+    return time.perf_counter() - start
+
+
+def measure(parse, body: bytes, now_ts: int) -> tuple[float, float]:
+    """Return (peak KiB, longest blocking step ms)."""
+    store = records.TFAmeRecordStore(True)
+    parse(store, body, now_ts)  # First poll creates the records
+
+    tracemalloc.start()
+    parse(store, body, now_ts)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    blocking = min(parse(store, body, now_ts) for _ in range(REPEAT))
+    return peak / 1024, blocking * 1000
+
+
+def main(small: int, large: int) -> None:
+    """Run benchmark."""
+    now_ts = int(time.time())
+    for sensors in (small, large):
+        body = json.dumps(build_payload(1, sensors, now_ts)).encode()
+        print(f"{sensors} sensors, {len(body) / 1024:.1f} KiB reply")
+        for name, parse in (
+            ("json", parse_json),
+            ("stream", parse_stream),
+            ("executor", parse_executor),
+        ):
+            peak, blocking = measure(parse, body, now_ts)
+            print(f"  {name:<9} peak {peak:9.1f} KiB  blocking {blocking:7.3f} ms")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    main(*(args + [10, 3000][len(args) :]))
@@ -0,0 +1,122 @@
+"""TFA.me station integration: station requests and state writes per minute.
+
+Sets up the integration (config entry, coordinator, sensor platform) in a
+test instance of Home Assistant against the stand-in station (simulator.py,
+sensors transmit by their real interval) and runs one hour on a frozen clock:
+every second the clock moves on and all due timers of Home Assistant fire
+(coordinator interval, refresh debouncer, entity polling, ...). Counts HTTP
+requests to the station and 'state_changed' events.
+
+The integration is loaded from this repository, or with '--repo' from another
+checkout, e.g. before the entities became coordinator listeners:
+    git worktree add /tmp/tfa_before 25370b9~1
+    python benchmarks/bench_requests.py --repo /tmp/tfa_before
+
+Requires Home Assistant and its test helpers:
+    pip install pytest-homeassistant-custom-component
+
+Usage: python benchmarks/bench_requests.py [--repo DIR] [entities] [interval]
+"""
+
+import argparse
+import asyncio
+from datetime import UTC, datetime
+import importlib
+from pathlib import Path
+import sys
+import tempfile
+
+from freezegun import freeze_time
+from homeassistant import loader
+from homeassistant.const import CONF_IP_ADDRESS, EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, callback
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+    async_test_home_assistant,
+)
+
+from simulator import SimulatorConfig, StationSimulator, sensors_for_entities
+
+REPO_DIR = Path(__file__).parent.parent
+DURATION = 3600  # Seconds of virtual time
+STEP = 1  # Seconds between fired timers
+
+
+async def bench_station(
+    hass: HomeAssistant, const, entities: int, interval: int, frozen
+) -> tuple[int, float, float]:
+    """Run one hour, return entities, requests and state writes per minute."""
+    simulator = StationSimulator(
+        SimulatorConfig(sensors=sensors_for_entities(entities), realtime=True)
+    )
+    host = await simulator.start()
+    entry = MockConfigEntry(
+        domain=const.DOMAIN,
+        title="TFA.me benchmark",
+        unique_id=f"bench_{entities}",
+        data={
+            CONF_IP_ADDRESS: host,
+            const.CONF_INTERVAL: interval,
+            const.CONF_MULTIPLE_ENTITIES: False,
+        },
+    )
+    entry.add_to_hass(hass)
+
+    writes = 0
+
+    @callback
+    def _count_write(_event: Event) -> None:
+        nonlocal writes
+        writes += 1
+
+    try:
+        if not await hass.config_entries.async_setup(entry.entry_id):
+            raise RuntimeError("Setup of config entry failed")
+        await hass.async_block_till_done()
+        # Steady state only: setup and first states are not counted
+        unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, _count_write)
+        requests = simulator.requests
+        for _ in range(DURATION // STEP):
+            frozen.tick(STEP)
+            async_fire_time_changed(hass)
+            await hass.async_block_till_done()
+        unsub()
+        requests = simulator.requests - requests
+        entity_count = len(hass.states.async_entity_ids("sensor"))
+    finally:
+        await hass.config_entries.async_unload(entry.entry_id)
+        await simulator.stop()
+
+    minutes = DURATION / 60
+    return entity_count, requests / minutes, writes / minutes
+
+
+async def main(repo: Path, entities: int, interval: int) -> None:
+    """Run benchmark for the integration of a repository."""
+    sys.path.insert(0, str(repo))  # Import "custom_components" of the repo
+    const = importlib.import_module("custom_components.a_tfa_me_1.const")
+    # Storage (snapshot, rain history, registries) in a temporary directory
+    with (
+        tempfile.TemporaryDirectory() as config_dir,
+        freeze_time(datetime.now(UTC)) as frozen,
+    ):
+        async with async_test_home_assistant(config_dir=config_dir) as hass:
+            hass.data.pop(loader.DATA_CUSTOM_COMPONENTS, None)
+            entity_count, requests, writes = await bench_station(
+                hass, const, entities, interval, frozen
+            )
+    print(
+        f"{repo}: {entity_count} entities, coordinator interval {interval} s, "
+        f"{DURATION} s virtual time"
+    )
+    print(f"  {requests:6.2f} requests/min  {writes:8.1f} state writes/min")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repo", type=Path, default=REPO_DIR)
+    parser.add_argument("entities", type=int, nargs="?", default=300)
+    parser.add_argument("interval", type=int, nargs="?", default=60)
+    args = parser.parse_args()
+    asyncio.run(main(args.repo.resolve(), args.entities, args.interval))
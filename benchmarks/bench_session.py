@@ -0,0 +1,86 @@
+"""TFA.me station integration: benchmark fresh vs. shared HTTP session.
+
+Starts a local stand-in station (simulator.py) and measures the poll
+latency of a new 'aiohttp.ClientSession' per poll (old behaviour) against
+one shared keep-alive session (client.py).
+
+Usage: python benchmarks/bench_session.py [polls] [stations]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+
+import aiohttp
+
+from simulator import SimulatorConfig, StationSimulator
+
+HTTP_LIMIT_PER_HOST = 2  # Same as const.py
+
+
+# ---- Poll variants ----
+async def poll_fresh_session(url: str) -> None:
+    """Old behaviour: new session (and connector) for every poll."""
+    async with aiohttp.ClientSession() as session, session.get(url) as response:
+        await response.json()
+
+
+async def poll_shared_session(session: aiohttp.ClientSession, url: str) -> None:
+    """New behaviour: request over the shared keep-alive pool."""
+    async with session.get(url) as response:
+        await response.json()
+
+
+async def measure(poll, polls: int, stations: int) -> list[float]:
+    """Run 'polls' rounds, every round polls all stations concurrently."""
+    latencies: list[float] = []
+
+    async def timed() -> None:
+        start = time.perf_counter()
+        await poll()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    for _ in range(polls):
+        await asyncio.gather(*(timed() for _ in range(stations)))
+    return latencies
+
+
+def report(name: str, latencies: list[float]) -> None:
+    """Print latency summary in milliseconds."""
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{name:<16} mean {statistics.mean(latencies):7.3f} ms  "
+        f"p50 {statistics.median(latencies):7.3f} ms  p95 {p95:7.3f} ms"
+    )
+
+
+async def main(polls: int, stations: int) -> None:
+    """Run benchmark."""
+    simulator = StationSimulator(SimulatorConfig(sensors=10, types=("A0",)))
+    await simulator.start()
+    url = simulator.url
+    try:
+        fresh = await measure(lambda: poll_fresh_session(url), polls, stations)
+
+        # All stand-in stations share one local host, so scale the host limit
+        connector = aiohttp.TCPConnector(
+            limit_per_host=HTTP_LIMIT_PER_HOST * stations
+        )
+        async with aiohttp.ClientSession(connector=connector) as session:
+            await poll_shared_session(session, url)  # Warm up pool
+            shared = await measure(
+                lambda: poll_shared_session(session, url), polls, stations
+            )
+    finally:
+        await simulator.stop()
+
+    print(f"{polls} polls x {stations} stations against {url}")
+    report("fresh session", fresh)
+    report("shared session", shared)
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    asyncio.run(main(*(args + [200, 1][len(args) :])))
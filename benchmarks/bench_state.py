@@ -0,0 +1,186 @@
+"""TFA.me station integration: cost of the entity state read by a state write.
+
+A state write of Home Assistant reads value, icon, name, unit and attributes
+of an entity. Compares:
+- old: properties of 'TFAmeSensorEntity' before state.py, every read is
+  calculated again ('icon' calculates the value again, every value calls
+  'datetime.now()' and looks up the timeout)
+- new: 'TFAmeEntityState' (state.py), calculated once per coordinator
+  generation with the "now" of the poll, reads return the cached values
+
+Usage: python benchmarks/bench_state.py [sensors] [polls]
+"""
+
+from datetime import datetime
+import sys
+import time
+
+from bench_memory import build_payload
+from common import load_integration_module
+
+const = load_integration_module("const")
+lookup = load_integration_module("lookup")
+records = load_integration_module("records")
+state = load_integration_module("state")
+
+
+# ---- Old entity properties (sensor.py before state.py) ----
+class OldEntity:
+    """Properties read by a state write, calculated on every read."""
+
+    def __init__(self, data: dict, entity_id: str) -> None:
+        """Initialize entity."""
+        self.data = data
+        self.entity_id = entity_id
+        self.sensor_id = data[entity_id].sensor_id
+        self.init_measure_value = data[entity_id].value
+        self.hour_values: dict[str, float] = {}
+
+    @property
+    def name(self) -> str:
+        """Name of sensors in Home Assistant."""
+        sensor_data = self.data[self.entity_id]
+        str1 = f"{sensor_data.sensor_name} {sensor_data.measurement.capitalize()}"
+        str2 = str1.replace("Rssi", "RSSI")
+        str3 = str2.replace("Co2", "CO2")
+        return str3.replace("_", " ")
+
+    @property
+    def native_value(self):
+        """Actual measurement value."""
+        last_update_ts: int = int(self.data[self.entity_id].ts)
+        utc_now_ts = int(datetime.now().timestamp())
+        timeout = self.get_timeout(self.sensor_id)
+        if (utc_now_ts - last_update_ts) <= (timeout):
+            measurement_value = self.data[self.entity_id].value
+            if "rain_rel" in self.entity_id:
+                measurement_value = round(
+                    float(measurement_value) - float(self.init_measure_value), 1
+                )
+            elif "rain_hour" in self.entity_id:
+                measurement_value = self.hour_values.get(self.entity_id, 0.0)
+        else:
+            measurement_value = None
+        return measurement_value
+
+    @property
+    def native_unit_of_measurement(self) -> str | None:
+        """Unit of measurement value."""
+        return str(self.data[self.entity_id].unit)
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Additional attributes."""
+        sensor_data = self.data[self.entity_id]
+        return {
+            "sensor_name": sensor_data.sensor_name,
+            "measurement": sensor_data.measurement,
+            "timestamp": sensor_data.timestamp,
+            "icon": "",
+        }
+
+    @property
+    def icon(self) -> str:
+        """Returns icon based on actual measurement value."""
+        measurement = self.data[self.entity_id].measurement
+        return lookup.get_icon(measurement, self.native_value)
+
+    def get_timeout(self, sensor_id: str):
+        """Return the timeout time for a station or sensor."""
+        try:
+            timeout_val = const.TIMEOUT_MAPPING[sensor_id[:2].upper()]
+        except KeyError:
+            timeout_val = 0
+        return timeout_val
+
+
+# ---- New entity properties (sensor.py with state.py) ----
+class NewEntity:
+    """Properties read by a state write, cached per generation."""
+
+    generation = 0  # Coordinator generation, shared by all entities
+    poll_ts = 0  # Coordinator "now" of the poll
+
+    def __init__(self, data: dict, entity_id: str) -> None:
+        """Initialize entity."""
+        self.data = data
+        self.entity_id = entity_id
+        self.hour_values: dict[str, float] = {}
+        self.entity_state = state.TFAmeEntityState(entity_id, data[entity_id])
+
+    @property
+    def state_cache(self):
+        """State of last poll."""
+        entity_state = self.entity_state
+        if entity_state.generation != NewEntity.generation:
+            entity_state.update(
+                self.data.get(self.entity_id),
+                NewEntity.generation,
+                NewEntity.poll_ts,
+                self.hour_values,
+            )
+        return entity_state
+
+    @property
+    def name(self) -> str:
+        """Name of sensors in Home Assistant."""
+        return self.state_cache.name
+
+    @property
+    def native_value(self):
+        """Actual measurement value."""
+        return self.state_cache.value
+
+    @property
+    def native_unit_of_measurement(self) -> str | None:
+        """Unit of measurement value."""
+        return str(self.data[self.entity_id].unit)
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Additional attributes."""
+        return self.state_cache.attributes
+
+    @property
+    def icon(self) -> str:
+        """Returns icon based on actual measurement value."""
+        return self.state_cache.icon
+
+
+def write_state(entity) -> tuple:
+    """Reads of one state write."""
+    return (
+        entity.native_value,
+        entity.native_unit_of_measurement,
+        entity.extra_state_attributes,
+        entity.icon,
+        entity.name,
+    )
+
+
+def measure(entities: list, polls: int) -> float:
+    """Return µs per state write, every entity written once per poll."""
+    start = time.perf_counter()
+    for _ in range(polls):
+        NewEntity.generation += 1
+        NewEntity.poll_ts = int(time.time())
+        for entity in entities:
+            write_state(entity)
+    return (time.perf_counter() - start) * 1e6 / (polls * len(entities))
+
+
+def main(sensors: int, polls: int) -> None:
+    """Run benchmark."""
+    store = records.TFAmeRecordStore(False)
+    store.update(build_payload(1, sensors, int(time.time())), False, int(time.time()))
+    data = store.records
+    print(f"{len(data)} entities, {polls} polls")
+    for name, entity_class in (("old", OldEntity), ("new", NewEntity)):
+        entities = [entity_class(data, entity_id) for entity_id in data]
+        per_write = min(measure(entities, polls) for _ in range(3))
+        print(f"  {name:<4} {per_write:6.2f} µs per state write")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    main(*(args + [1000, 20][len(args) :]))
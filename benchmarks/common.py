@@ -0,0 +1,11 @@
+"""TFA.me station integration: helpers shared by the benchmarks."""
+
+from pathlib import Path
+import sys
+
+# Modules of the integration are loaded like in the tests
+sys.path.insert(0, str(Path(__file__).parent.parent / "tests"))
+
+from conftest import load_integration_module  # noqa: E402
+
+__all__ = ["load_integration_module"]
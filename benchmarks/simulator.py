@@ -0,0 +1,291 @@
+"""TFA.me station integration: local stand-in for a TFA.me station.
+
+Serves '/sensors' in the format of a station with a configurable number and
+mix of stations/sensors, reply latency, error rate and payload size. Used by
+the benchmarks, can also be started alone and added to Home Assistant with
+host '127.0.0.1:<port>'. With '--push' it posts the replies to the webhook
+of push mode instead (like a station or a relay would).
+
+Usage: python benchmarks/simulator.py [--port 8080] [--sensors 20]
+       [--types 01,A0,A1,A2] [--latency 0] [--error-rate 0] [--pad 0]
+       [--realtime] [--gzip] [--push URL] [--push-interval 10]
+"""
+
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+import gzip
+import json
+import random
+import time
+
+import aiohttp
+from aiohttp import web
+
+# Measurements (name: (unit, start value, step)) of stations and sensors
+_T = ("temperature", "°C", 21.0, 0.1)
+_H = ("humidity", "%", 45.0, 1.0)
+_BP = ("barometric_pressure", "hPa", 1013.0, 0.1)
+_CO2 = ("co2", "ppm", 600.0, 10.0)
+_TP = ("temperature_probe", "°C", 18.0, 0.1)
+_RAIN = ("rain", "mm", 0.0, 0.3)
+_WIND = (
+    ("wind_direction", "", 8.0, 1.0),
+    ("wind_speed", "m/s", 3.0, 0.2),
+    ("wind_gust", "m/s", 5.0, 0.3),
+)
+_RADIO = (("rssi", "", 180.0, 1.0), ("lowbatt", "", 0.0, 0.0))
+
+SENSOR_TYPES: dict[str, tuple[tuple[str, str, float, float], ...]] = {
+    # Stations
+    **{f"0{number}": (_T, _H) for number in (1, 2, 3, 4, 6, 7, 8)},
+    "05": (_T, _H, _BP),
+    "99": (_T, _H, _BP, _CO2),
+    # Sensors (868 MHz, with RSSI & battery)
+    "A0": (_T, _H, *_RADIO),
+    "A1": (_RAIN, *_RADIO),
+    "A2": (*_WIND, *_RADIO),
+    "A3": (_T, _TP, *_RADIO),
+    "A4": (_T, _H, _TP, *_RADIO),
+    "A5": (_T, *_RADIO),
+    "A6": (_T, _H, *_RADIO),
+}
+DEFAULT_TYPES = ("A0", "A1", "A2", "A4")
+
+# Transmission interval in seconds (same as const.py)
+TRANSMIT_INTERVALS = {"A1": 120 * 60, "A4": 60, "A6": 60}
+TRANSMIT_DEFAULT = 5 * 60
+
+# Entities per measurement: rain has "_rel", "_hour", "_24h", "_7d" & "_today"
+# entities too
+RAIN_ENTITIES = 6
+# Derived entities of an input measurement (derived.py): dew point, absolute
+# humidity & heat index (with temperature), Beaufort & wind chill, rain rate
+DERIVED_ENTITIES = {"humidity": 3, "wind_speed": 2, "rain": 1}
+
+
+@dataclass
+class SimulatorConfig:
+    """Stand-in station settings."""
+
+    sensors: int = 20  # Number of stations/sensors in the reply
+    types: tuple[str, ...] = DEFAULT_TYPES  # Mix of types, used in turn
+    latency: float = 0.0  # Seconds until the reply is sent
+    error_rate: float = 0.0  # Share of requests answered with HTTP 500
+    pad: int = 0  # Extra bytes in the reply (top level "pad" string)
+    # True: sensors transmit by their real interval, False: on every request
+    realtime: bool = False
+    # True: replies are gzip compressed when the request accepts it (like a
+    # proxy in front of the station would do)
+    gzip: bool = False
+    gateway_id: str = "017654321"
+    seed: int = 1
+
+
+@dataclass
+class SimulatedSensor:
+    """One station/sensor of the stand-in station."""
+
+    sensor_id: str
+    type_id: str
+    interval: int
+    ts: int
+    values: dict[str, float] = field(default_factory=dict)
+
+
+def entities_of_type(type_id: str) -> int:
+    """Number of entities the integration creates for one station/sensor."""
+    return sum(
+        (RAIN_ENTITIES if name == "rain" else 1) + DERIVED_ENTITIES.get(name, 0)
+        for name, _unit, _value, _step in SENSOR_TYPES[type_id.upper()]
+    )
+
+
+def sensors_for_entities(entities: int, types: tuple[str, ...] = DEFAULT_TYPES) -> int:
+    """Number of stations/sensors needed for about 'entities' entities."""
+    count = 0
+    total = 0
+    while total < entities:
+        total += entities_of_type(types[count % len(types)])
+        count += 1
+    return max(count, 1)
+
+
+# ---- Stand-in station ----
+class StationSimulator:
+    """Generate '/sensors' replies and serve them with aiohttp."""
+
+    def __init__(self, config: SimulatorConfig) -> None:
+        """Create stations/sensors."""
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.requests = 0
+        self.errors = 0
+        self.bytes_sent = 0
+        now = int(time.time())
+        self.sensors: list[SimulatedSensor] = []
+        for number in range(config.sensors):
+            type_id = config.types[number % len(config.types)].upper()
+            self.sensors.append(
+                SimulatedSensor(
+                    sensor_id=f"{type_id.lower()}{number:07x}",
+                    type_id=type_id,
+                    interval=TRANSMIT_INTERVALS.get(type_id, TRANSMIT_DEFAULT),
+                    ts=now - self.random.randrange(60),
+                    values={
+                        name: value
+                        for name, _unit, value, _step in SENSOR_TYPES[type_id]
+                    },
+                )
+            )
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+
+    def _transmit(self, sensor: SimulatedSensor, now: int) -> None:
+        """New measurement values of one station/sensor."""
+        sensor.ts = now
+        for name, _unit, _value, step in SENSOR_TYPES[sensor.type_id]:
+            if name == "rain":
+                sensor.values[name] += step * self.random.randrange(2)
+            elif name == "wind_direction":
+                sensor.values[name] = float(self.random.randrange(16))
+            else:
+                sensor.values[name] += step * self.random.choice((-1, 0, 1))
+
+    def build_reply(self) -> bytes:
+        """Build a '/sensors' reply, sensors transmit new values first."""
+        now = int(time.time())
+        sensors = []
+        for sensor in self.sensors:
+            if not self.config.realtime or now - sensor.ts >= sensor.interval:
+                self._transmit(sensor, now)
+            sensors.append(
+                {
+                    "sensor_id": sensor.sensor_id,
+                    "name": sensor.sensor_id.upper(),
+                    "timestamp": time.strftime(
+                        "%Y-%m-%dT%H:%M:%SZ", time.gmtime(sensor.ts)
+                    ),
+                    "ts": sensor.ts,
+                    "measurements": {
+                        name: {
+                            "value": f"{sensor.values[name]:.1f}",
+                            "unit": unit,
+                        }
+                        for name, unit, _value, _step in SENSOR_TYPES[sensor.type_id]
+                    },
+                }
+            )
+        reply: dict = {"gateway_id": self.config.gateway_id, "sensors": sensors}
+        if self.config.pad:
+            reply["pad"] = "x" * self.config.pad
+        return json.dumps(reply).encode()
+
+    async def _handle_sensors(self, request: web.Request) -> web.Response:
+        """Reply to '/sensors'."""
+        self.requests += 1
+        if self.config.latency:
+            await asyncio.sleep(self.config.latency)
+        if self.random.random() < self.config.error_rate:
+            self.errors += 1
+            return web.Response(status=500, text="Simulated error")
+        body = self.build_reply()
+        headers = {}
+        if self.config.gzip and "gzip" in request.headers.get(
+            "Accept-Encoding", ""
+        ):
+            body = gzip.compress(body, compresslevel=6)
+            headers["Content-Encoding"] = "gzip"
+        self.bytes_sent += len(body)
+        return web.Response(
+            body=body, headers=headers, content_type="application/json"
+        )
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving (port 0: free port), return host:port for the entry."""
+        app = web.Application()
+        app.router.add_get("/sensors", self._handle_sensors)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]  # noqa: SLF001
+        self.url = f"http://{host}:{port}/sensors"
+        return f"{host}:{port}"
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def push(self, session: aiohttp.ClientSession, url: str) -> int:
+        """Post one reply to the webhook of push mode, return HTTP status."""
+        body = self.build_reply()
+        async with session.post(
+            url, data=body, headers={"Content-Type": "application/json"}
+        ) as response:
+            self.requests += 1
+            self.bytes_sent += len(body)
+            if response.status != 200:
+                self.errors += 1
+            return response.status
+
+
+async def main(config: SimulatorConfig, port: int) -> None:
+    """Serve until interrupted."""
+    simulator = StationSimulator(config)
+    host = await simulator.start("0.0.0.0", port)
+    entities = sum(entities_of_type(sensor.type_id) for sensor in simulator.sensors)
+    print(f"Serving {config.sensors} sensors ({entities} entities) on {host}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await simulator.stop()
+
+
+async def main_push(config: SimulatorConfig, url: str, interval: float) -> None:
+    """Post replies to the webhook until interrupted."""
+    simulator = StationSimulator(config)
+    print(f"Pushing {config.sensors} sensors to {url} every {interval} s")
+    async with aiohttp.ClientSession() as session:
+        while True:
+            start = time.perf_counter()
+            status = await simulator.push(session, url)
+            print(
+                f"HTTP {status} in {(time.perf_counter() - start) * 1000:.1f} ms "
+                f"({simulator.requests} pushes, {simulator.errors} errors)"
+            )
+            await asyncio.sleep(interval)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--sensors", type=int, default=20)
+    parser.add_argument("--types", default=",".join(DEFAULT_TYPES))
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--pad", type=int, default=0, help="extra bytes")
+    parser.add_argument("--realtime", action="store_true")
+    parser.add_argument("--gzip", action="store_true")
+    parser.add_argument("--push", help="webhook URL, post instead of serving")
+    parser.add_argument("--push-interval", type=float, default=10.0, help="seconds")
+    args = parser.parse_args()
+    types = tuple(type_id.strip().upper() for type_id in args.types.split(","))
+    unknown = [type_id for type_id in types if type_id not in SENSOR_TYPES]
+    if unknown:
+        parser.error("Unknown types: " + ", ".join(unknown))
+    config = SimulatorConfig(
+        sensors=args.sensors,
+        types=types,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        pad=args.pad,
+        realtime=args.realtime,
+        gzip=args.gzip,
+    )
+    if args.push:
+        asyncio.run(main_push(config, args.push, args.push_interval))
+    else:
+        asyncio.run(main(config, args.port))
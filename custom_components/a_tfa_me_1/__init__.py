@@ -5,11 +5,28 @@ from datetime import timedelta
 import logging
 
 from homeassistant.config_entries import ConfigEntry, ConfigEntryState
-from homeassistant.const import CONF_IP_ADDRESS, Platform
+from homeassistant.const import CONF_IP_ADDRESS, CONF_WEBHOOK_ID, Platform
 from homeassistant.core import HomeAssistant
 
-from .const import CONF_INTERVAL, CONF_MULTIPLE_ENTITIES, DOMAIN
+from .client import async_get_shared_session, async_release_shared_session
+from .const import (
+    CONF_ADAPTIVE,
+    CONF_HUB_CONCURRENCY,
+    CONF_HUB_MODE,
+    CONF_INTERVAL,
+    CONF_MIN_SPACING,
+    CONF_MULTIPLE_ENTITIES,
+    CONF_PUSH,
+    DATA_HUB,
+    DOMAIN,
+    HUB_CONCURRENCY,
+    REFRESH_MIN_SPACING,
+)
 from .coordinator import TFAmeDataCoordinator
+from .history import TFAmeRainHistoryStore
+from .hub import async_get_hub, async_remove_from_hub
+from .push import async_register_push
+from .snapshot import TFAmeSnapshotStore
 
 PLATFORMS: list[Platform] = [Platform.SENSOR]
 _LOGGER = logging.getLogger(__name__)
@@ -36,8 +53,31 @@ async def async_setup_entry(
     # Use multiple entities
     multiple_entities = entry.data[CONF_MULTIPLE_ENTITIES]
 
+    # Hub mode: station is polled by the shared scheduler
+    hub_mode = entry.options.get(CONF_HUB_MODE, False)
+    # Adaptive polling: interval follows sensor transmissions
+    adaptive = entry.options.get(CONF_ADAPTIVE, False)
+    # Push mode: data is posted to a webhook, polling is a slow safety net
+    push = entry.options.get(CONF_PUSH, False)
+
+    # Keep-alive HTTP session shared by all stations
+    session = async_get_shared_session(hass)
+
     # DataUpdateCoordinator for cyclic requests
-    coordinator = TFAmeDataCoordinator(hass, host, delta_interval, multiple_entities)
+    coordinator = TFAmeDataCoordinator(
+        hass,
+        host,
+        delta_interval,
+        multiple_entities,
+        session,
+        hub_mode,
+        adaptive,
+        entry_id=entry.entry_id,
+        push=push,
+        min_spacing=entry.options.get(CONF_MIN_SPACING, REFRESH_MIN_SPACING),
+    )
+    # Rain history of "last hour", "24h", "7d" and "today" saved before restart
+    await coordinator.history.async_load()
 
     # Register listener for option changes
     entry.async_on_unload(entry.add_update_listener(async_update_listener))
@@ -45,8 +85,17 @@ async def async_setup_entry(
     # Save coordinator for later usage
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
 
-    # First request for sensor data
-    await coordinator.async_config_entry_first_refresh()
+    # Records of last run: entities are created at once, first poll runs in
+    # background, else wait for first request for sensor data
+    restored = await coordinator.async_restore_snapshot()
+    if not restored:
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except Exception:
+            hass.data[DOMAIN].pop(entry.entry_id, None)
+            await coordinator.async_shutdown()
+            await async_release_shared_session(hass)
+            raise
     # Save coordinator
     entry.runtime_data = coordinator
 
@@ -55,6 +104,23 @@ async def async_setup_entry(
     _LOGGER.debug("Setting up platforms")
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    if hub_mode:
+        async_get_hub(hass).async_add_station(
+            entry.entry_id,
+            coordinator,
+            entry.options.get(CONF_HUB_CONCURRENCY, HUB_CONCURRENCY),
+        )
+
+    if push and CONF_WEBHOOK_ID in entry.options:
+        async_register_push(hass, entry, coordinator)
+
+    if restored:
+        entry.async_create_background_task(
+            hass,
+            coordinator.async_refresh_after_restore(),
+            f"{DOMAIN} first refresh {entry.entry_id}",
+        )
+
     # Get running instances
     instances = await get_instances(hass)
     msg = f"Instances: {len(instances)}"
@@ -65,22 +131,53 @@ async def async_setup_entry(
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id, None)
+        if coordinator is not None:
+            if coordinator.hub_mode:
+                async_remove_from_hub(hass, entry.entry_id)
+            await coordinator.async_shutdown()
+        # Close shared session when this was the last station
+        await async_release_shared_session(hass)
+    return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored data of a deleted config entry."""
+    await TFAmeRainHistoryStore(hass, entry.entry_id).async_remove()
+    await TFAmeSnapshotStore(hass, entry.entry_id).async_remove()
 
 
 # ---- Options update listener: option is pull/request interval ----
 async def async_update_listener(hass: HomeAssistant, entry: ConfigEntry):
     """Will be called when options are changed."""
 
-    reset_rain = entry.options.get("action_rain", False)
-    msg: str = "Options 'reset rain': " + str(reset_rain)
-    _LOGGER.info(msg)
-
-    new_interval = entry.options.get(CONF_INTERVAL, 10)
-    msg = "Options 'pull interval': " + str(new_interval)
+    new_interval = entry.options.get(CONF_INTERVAL, entry.data[CONF_INTERVAL])
+    msg: str = "Options 'pull interval': " + str(new_interval)
     _LOGGER.info(msg)
     coordinator = hass.data[DOMAIN][entry.entry_id]
-    coordinator.update_interval = timedelta(seconds=new_interval)
+
+    # Hub/push mode, adaptive polling or hub cap changed: set up station again
+    hub_mode = entry.options.get(CONF_HUB_MODE, False)
+    push = entry.options.get(CONF_PUSH, False)
+    adaptive = entry.options.get(CONF_ADAPTIVE, False) and not push
+    hub_concurrency = entry.options.get(CONF_HUB_CONCURRENCY, HUB_CONCURRENCY)
+    hub = hass.data.get(DATA_HUB)
+    hub_station = hub.stations.get(entry.entry_id) if hub is not None else None
+    if (
+        hub_mode != coordinator.hub_mode
+        or adaptive != coordinator.adaptive
+        or push != coordinator.push
+        or (hub_station is not None and hub_station.concurrency != hub_concurrency)
+    ):
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    coordinator.set_poll_interval(timedelta(seconds=new_interval))
+    coordinator.min_spacing = entry.options.get(CONF_MIN_SPACING, REFRESH_MIN_SPACING)
+    if not hub_mode and not coordinator.adaptive:
+        coordinator.update_interval = coordinator.poll_interval
 
     await coordinator.async_refresh()
 
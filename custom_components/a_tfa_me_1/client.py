@@ -0,0 +1,112 @@
+"""TFA.me station integration: client.py."""
+
+import logging
+import time
+from types import SimpleNamespace
+
+import aiohttp
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .const import DATA_SESSION, HTTP_KEEPALIVE, HTTP_LIMIT, HTTP_LIMIT_PER_HOST
+from .metrics import PollTiming
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# ---- Keep-alive connection pool shared by all TFA.me stations ----
+class TFAmeSharedSession:
+    """Reference counted HTTP session, one for all config entries."""
+
+    def __init__(self) -> None:
+        """Initialize empty shared session."""
+        self.session: aiohttp.ClientSession | None = None
+        self.users: int = 0  # Number of config entries using the session
+
+
+# ---- Connect time of a poll, request passes its PollTiming as trace context ----
+async def _on_connection_create_start(
+    _session: aiohttp.ClientSession,
+    context: SimpleNamespace,
+    _params: aiohttp.TraceConnectionCreateStartParams,
+) -> None:
+    """New connection to a station is opened."""
+    timing = context.trace_request_ctx
+    if isinstance(timing, PollTiming):
+        timing.connect_start = time.perf_counter()
+
+
+async def _on_connection_create_end(
+    _session: aiohttp.ClientSession,
+    context: SimpleNamespace,
+    _params: aiohttp.TraceConnectionCreateEndParams,
+) -> None:
+    """New connection to a station is open."""
+    timing = context.trace_request_ctx
+    if isinstance(timing, PollTiming):
+        timing.connect += time.perf_counter() - timing.connect_start
+
+
+def _trace_config() -> aiohttp.TraceConfig:
+    """Trace of new connections for poll metrics."""
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_connection_create_start.append(_on_connection_create_start)
+    trace_config.on_connection_create_end.append(_on_connection_create_end)
+    return trace_config
+
+
+@callback
+def async_get_shared_session(hass: HomeAssistant) -> aiohttp.ClientSession:
+    """Get (and create on first use) the shared session, add one user."""
+    shared: TFAmeSharedSession = hass.data.setdefault(
+        DATA_SESSION, TFAmeSharedSession()
+    )
+
+    if shared.session is None or shared.session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_LIMIT,
+            limit_per_host=HTTP_LIMIT_PER_HOST,
+            keepalive_timeout=HTTP_KEEPALIVE,
+        )
+        shared.session = aiohttp.ClientSession(
+            connector=connector,
+            # Compressed replies (station behind a proxy), decompressed
+            # while received
+            headers={aiohttp.hdrs.ACCEPT_ENCODING: "gzip"},
+            auto_decompress=True,
+            trace_configs=[_trace_config()],
+        )
+        msg: str = (
+            "Shared HTTP session created, connections per station: "
+            + str(HTTP_LIMIT_PER_HOST)
+        )
+        _LOGGER.debug(msg)
+
+        # HA does not unload config entries on stop, close the pool here too
+        session = shared.session
+
+        async def _async_close_session(_event: Event) -> None:
+            """Close the session when Home Assistant stops."""
+            await session.close()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_session)
+
+    shared.users += 1
+    return shared.session
+
+
+async def async_release_shared_session(hass: HomeAssistant) -> None:
+    """Remove one user from shared session, close it when it was the last one."""
+    shared: TFAmeSharedSession | None = hass.data.get(DATA_SESSION)
+    if shared is None:
+        return
+
+    shared.users -= 1
+    if shared.users > 0:
+        return
+
+    hass.data.pop(DATA_SESSION)
+    if shared.session is not None and not shared.session.closed:
+        await shared.session.close()
+        _LOGGER.debug("Shared HTTP session closed")
@@ -6,13 +6,14 @@ from typing import Any
 
 import voluptuous as vol
 
+from homeassistant.components import webhook
 from homeassistant.config_entries import (
     ConfigEntry,
     ConfigFlow,
     ConfigFlowResult,
     OptionsFlow,
 )
-from homeassistant.const import CONF_IP_ADDRESS
+from homeassistant.const import CONF_IP_ADDRESS, CONF_WEBHOOK_ID
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.selector import (
     SelectOptionDict,
@@ -21,7 +22,18 @@ from homeassistant.helpers.selector import (
     SelectSelectorMode,
 )
 
-from .const import CONF_INTERVAL, CONF_MULTIPLE_ENTITIES, DOMAIN
+from .const import (
+    CONF_ADAPTIVE,
+    CONF_HUB_CONCURRENCY,
+    CONF_HUB_MODE,
+    CONF_INTERVAL,
+    CONF_MIN_SPACING,
+    CONF_MULTIPLE_ENTITIES,
+    CONF_PUSH,
+    DOMAIN,
+    HUB_CONCURRENCY,
+    REFRESH_MIN_SPACING,
+)
 from .data import TFAmeData, TFAmeException
 
 # Scheme for IP/Domain and poll interval
@@ -177,10 +189,18 @@ class OptionsFlowHandler(OptionsFlow):
         if user_input is not None:
             if "interval" in user_input:
                 return await self.async_step_set_interval(user_input)
+            if CONF_HUB_MODE in user_input:
+                return await self.async_step_hub(user_input)
+            if CONF_PUSH in user_input:
+                return await self.async_step_push(user_input)
 
             if "select_option" in user_input:
                 if user_input["select_option"] == "menu_interval":
                     return await self.async_step_set_interval(user_input)
+                if user_input["select_option"] == "menu_hub":
+                    return await self.async_step_hub(user_input)
+                if user_input["select_option"] == "menu_push":
+                    return await self.async_step_push(user_input)
                 if user_input["select_option"] == "discover_sensors":
                     return await self.async_discover_sensors(user_input)
                 if user_input["select_option"] == "action_rain":
@@ -194,6 +214,8 @@ class OptionsFlowHandler(OptionsFlow):
         opt_dict = [
             SelectOptionDict(value="none", label="None"),
             SelectOptionDict(value="menu_interval", label="Change request interval"),
+            SelectOptionDict(value="menu_hub", label="Hub mode (shared polling)"),
+            SelectOptionDict(value="menu_push", label="Push mode (webhook)"),
             SelectOptionDict(value="discover_sensors", label="Discover new sensors"),
             SelectOptionDict(value="action_rain", label="Reset all rain sensors"),
             SelectOptionDict(value="udapte_data", label="Reload sensor data"),
@@ -231,7 +253,9 @@ class OptionsFlowHandler(OptionsFlow):
                         "notification_id": "options_saved",
                     },
                 )
-                return self.async_create_entry(title="", data=user_input)
+                return self.async_create_entry(
+                    title="", data={**self.config_entry.options, **user_input}
+                )
 
         # Get actual values from entry
         interval = self.config_entry.data.get("interval")
@@ -243,7 +267,17 @@ class OptionsFlowHandler(OptionsFlow):
                 vol.Required(CONF_INTERVAL, default=current_interval): vol.All(
                     vol.Coerce(int),
                     vol.Range(min=10, max=3600),
-                )
+                ),
+                vol.Required(
+                    CONF_ADAPTIVE,
+                    default=self.config_entry.options.get(CONF_ADAPTIVE, False),
+                ): bool,
+                vol.Required(
+                    CONF_MIN_SPACING,
+                    default=self.config_entry.options.get(
+                        CONF_MIN_SPACING, REFRESH_MIN_SPACING
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=60)),
             }
         )
         # Show the form
@@ -255,6 +289,67 @@ class OptionsFlowHandler(OptionsFlow):
             },
         )
 
+    # ---- Change option: hub mode, one scheduler polls all stations ----
+    async def async_step_hub(self, user_input=None) -> ConfigFlowResult:
+        """Entry point for options: hub mode and concurrency cap."""
+
+        if user_input is not None and CONF_HUB_MODE in user_input:
+            return self.async_create_entry(
+                title="", data={**self.config_entry.options, **user_input}
+            )
+
+        # Build options schema with actual values
+        options_schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_HUB_MODE,
+                    default=self.config_entry.options.get(CONF_HUB_MODE, False),
+                ): bool,
+                vol.Required(
+                    CONF_HUB_CONCURRENCY,
+                    default=self.config_entry.options.get(
+                        CONF_HUB_CONCURRENCY, HUB_CONCURRENCY
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=32)),
+            }
+        )
+        # Show the form
+        return self.async_show_form(step_id="init", data_schema=options_schema)
+
+    # ---- Change option: push mode, data is posted to a webhook ----
+    async def async_step_push(self, user_input=None) -> ConfigFlowResult:
+        """Entry point for options: push mode."""
+
+        if user_input is not None and CONF_PUSH in user_input:
+            options = {**self.config_entry.options, **user_input}
+            # Webhook ID is kept when push mode is switched off and on again
+            if CONF_WEBHOOK_ID not in options:
+                options[CONF_WEBHOOK_ID] = webhook.async_generate_id()
+            if user_input[CONF_PUSH]:
+                path = webhook.async_generate_path(options[CONF_WEBHOOK_ID])
+                await self.hass.services.async_call(
+                    "persistent_notification",
+                    "create",
+                    {
+                        "title": "Push mode",
+                        "message": f"Post the '/sensors' data of the station to {path} (local network only).",
+                        "notification_id": "options_saved",
+                    },
+                )
+            return self.async_create_entry(title="", data=options)
+
+        # Build options schema with actual value
+        options_schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_PUSH,
+                    default=self.config_entry.options.get(CONF_PUSH, False),
+                ): bool,
+            }
+        )
+        # Show the form
+        return self.async_show_form(step_id="init", data_schema=options_schema)
+
     # ---- Change option: Reload/reinit coordinator ----
     async def async_step_action_sensors(self) -> ConfigFlowResult:
         """Entry point for option: Reload sensors (Warniung: reinits coordinator!)."""
@@ -277,17 +372,10 @@ class OptionsFlowHandler(OptionsFlow):
             if user_input["select_option"] == "action_rain":
                 coordinator = self.hass.data[DOMAIN][self.config_entry.entry_id]
                 coordinator.reset_rain_sensors = True
-                # Store in options TODO remove ?
-                self.hass.config_entries.async_update_entry(
-                    self.config_entry,
-                    options={**self.config_entry.options, "action_rain": True},
+                # One poll, then all rain entities are updated on dashboard
+                await coordinator.async_refresh_entities(
+                    coordinator.entity_index.by_measurement("rain")
                 )
-                await coordinator.async_refresh()
-                # Update all entities on dashboard
-                for entity in coordinator.sensor_entity_list:
-                    await self.hass.services.async_call(
-                        "homeassistant", "update_entity", {"entity_id": entity}
-                    )
 
                 return self.async_create_entry(title="", data=self.config_entry.options)
 
@@ -303,12 +391,8 @@ class OptionsFlowHandler(OptionsFlow):
         if user_input is not None:
             if user_input["select_option"] == "udapte_data":
                 coordinator = self.hass.data[DOMAIN][self.config_entry.entry_id]
-                await coordinator.async_refresh()
-                # Update all entities on dashboard
-                for entity in coordinator.sensor_entity_list:
-                    await self.hass.services.async_call(
-                        "homeassistant", "update_entity", {"entity_id": entity}
-                    )
+                # One poll, then all entities are updated on dashboard
+                await coordinator.async_refresh_entities(coordinator.entity_index)
 
         return self.async_create_entry(title="", data=self.config_entry.options)
 
@@ -4,3 +4,139 @@ DOMAIN = "a_tfa_me_1"
 DEFAULT_NAME = "TFA.me Station"
 CONF_INTERVAL = "interval"
 CONF_MULTIPLE_ENTITIES = "multiple_entities"
+CONF_HUB_MODE = "hub_mode"
+CONF_HUB_CONCURRENCY = "hub_concurrency"
+CONF_ADAPTIVE = "adaptive"
+CONF_PUSH = "push"
+CONF_MIN_SPACING = "min_spacing"
+
+# Shared HTTP connection pool (one for all TFA.me config entries)
+DATA_SESSION = f"{DOMAIN}_session"
+HTTP_LIMIT = 100  # Max. open connections over all stations
+HTTP_LIMIT_PER_HOST = 2  # Max. open connections to one station
+HTTP_KEEPALIVE = 75  # Seconds an idle connection is kept open
+HTTP_TIMEOUT = 5  # Seconds for one request
+STREAM_CHUNK = 16 * 1024  # Bytes parsed at once while reply is received
+
+# Hub mode: one scheduler polls all stations
+DATA_HUB = f"{DOMAIN}_hub"
+HUB_CONCURRENCY = 4  # Default max. stations polled at the same time
+HUB_TICK = 1  # Seconds between checks for due stations
+
+# Adaptive polling: poll shortly after the next expected transmission
+ADAPTIVE_MIN_INTERVAL = 10  # Seconds, shortest poll interval
+ADAPTIVE_MAX_INTERVAL = 300  # Seconds, longest poll interval (back off)
+ADAPTIVE_MARGIN = 3  # Seconds after expected transmission until poll
+
+# Refresh requests (timer, hub, button, options flow, ...) of one station
+REFRESH_MIN_SPACING = 2  # Seconds, default min. time between two requests
+
+# Push mode: station or relay posts '/sensors' data to a webhook
+PUSH_POLL_INTERVAL = 15 * 60  # Seconds, min. poll interval as safety net
+
+# Rain history for "last hour", "24h", "7d" and "today" values, saved in HA
+# storage: a fine ring for the last hour and a coarse ring for the rest (a
+# multiple of 15 minutes, so local midnight is on a bucket border)
+HISTORY_MAX_AGE = 60 * 60  # Seconds
+HISTORY_BUCKET = 60  # Seconds per ring buffer slot
+HISTORY_LONG_MAX_AGE = 7 * 24 * 60 * 60  # Seconds
+HISTORY_LONG_BUCKET = 15 * 60  # Seconds per ring buffer slot
+HISTORY_SAVE_DELAY = 60  # Seconds, collect changes before writing
+HISTORY_STORAGE_VERSION = 1
+
+# Records of the last poll, saved in HA storage for a fast startup
+SNAPSHOT_SAVE_DELAY = 5 * 60  # Seconds, collect changes before writing
+SNAPSHOT_STORAGE_VERSION = 1
+
+# Poll metrics, exposed as diagnostic sensors
+METRICS_WINDOW = 100  # Polls used for p50/p95/p99
+METRICS_FAILURES = 20  # Recent failed polls kept for diagnostics
+
+# Diagnostics download
+DIAGNOSTICS_PAYLOAD_MAX = 256 * 1024  # Bytes of last reply kept
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+# mDNS resolver for station IDs 'XXX-XXX-XXX'
+MDNS_TTL = 300  # Seconds a resolved IP is used before re-resolving
+MDNS_RETRY = 30  # Seconds until the next try after a failed lookup
+MDNS_TIMEOUT = 3  # Seconds for one lookup
+
+# Transmission interval of stations and sensors in seconds
+TRANSMIT_1_MIN = 1 * 60
+TRANSMIT_5_MIN = 5 * 60
+TRANSMIT_120_MIN = 120 * 60
+
+TRANSMIT_MAPPING = {
+    # Stations
+    "01": TRANSMIT_5_MIN,
+    "02": TRANSMIT_5_MIN,
+    "03": TRANSMIT_5_MIN,
+    "04": TRANSMIT_5_MIN,
+    "05": TRANSMIT_5_MIN,
+    "06": TRANSMIT_5_MIN,
+    "07": TRANSMIT_5_MIN,
+    "08": TRANSMIT_5_MIN,
+    # Add other stations here ...
+    # Debug station ID
+    "99": TRANSMIT_5_MIN,
+    # Sensors
+    "A0": TRANSMIT_5_MIN,  # Sensor A0: T/H
+    "A1": TRANSMIT_120_MIN,  # Sensor A1: Rain
+    "A2": TRANSMIT_5_MIN,  # Sensor A2: Wind: D/W/G
+    "A3": TRANSMIT_5_MIN,  # Sensor A3: T/TP
+    "A4": TRANSMIT_1_MIN,  # Sensor Prof. A4: T/H/TP
+    "A5": TRANSMIT_5_MIN,  # Sensor A5: T
+    "A6": TRANSMIT_1_MIN,  # Sensor Prof. A6: T/H
+    # Add other sensors here ...
+}
+
+# Timeout time use sensor marked "old"/unavailable
+# Rule: Timeout time = 2 * (transmission interval in seconds) + 30
+TIMEOUT_MAPPING = {
+    type_id: (2 * interval) + 30 for type_id, interval in TRANSMIT_MAPPING.items()
+}
+
+# Short description of all stations & sensors
+DEVICE_MAPPING = {
+    # Stations
+    "01": "Station 01: T/H",
+    "02": "Station 02: T/H",
+    "03": "Station 03: T/H",
+    "04": "Station 04: T/H",
+    "05": "Station 05: T/H/BP",
+    "06": "Station 06: T/H",
+    "07": "Station 07: T/H",
+    "08": "Station 08: T/H",
+    # Add other stations here ...
+    # Debug station ID
+    "99": "Station 99: T/H/BP/CO2",
+    # Sensors
+    "A0": "Sensor A0: T/H",
+    "A1": "Sensor A1: Rain",
+    "A2": "Sensor A2: Wind: D/W/G",
+    "A3": "Sensor A3: T/TP",
+    "A4": "Sensor Prof. A4: T/H/TP",
+    "A5": "Sensor A5: T",
+    "A6": "Sensor Prof. A6: T/H",
+    # Add other sensors here ...
+}
+
+# State writes of an entity (recorder rows): a new value is written when it
+# differs from the last written one by at least the deadband, and not before
+# the min. interval (seconds) after the last write. Stale values, availability
+# changes and options flow actions are written at once.
+# Measurement: (deadband, min. interval)
+PUBLISH_MAX_AGE = 30 * 60  # Seconds, then a value within the deadband is written
+PUBLISH_FILTER_MAPPING = {
+    "temperature": (0.2, 0),  # °C, 0.1 jitter is not written
+    "temperature_probe": (0.2, 0),  # °C
+    "humidity": (2, 0),  # %
+    "barometric_pressure": (0.3, 0),  # hPa
+    "co2": (20, 0),  # ppm
+    "rssi": (10, 15 * 60),  # Changes with every transmission
+    # Derived measurements (derived.py), follow their inputs
+    "dew_point": (0.2, 0),  # °C
+    "absolute_humidity": (0.2, 0),  # g/m³
+    "heat_index": (0.2, 0),  # °C
+    "wind_chill": (0.2, 0),  # °C
+}
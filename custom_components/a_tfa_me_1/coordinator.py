@@ -1,18 +1,39 @@
 """TFA.me station integration: coordinator.py."""
 
 import asyncio
+from collections.abc import Iterable
+import hashlib
 import logging
-import socket
+import time
+from typing import Any
 
 import aiohttp
 from requests import HTTPError
 
 from homeassistant.components.sensor import timedelta
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .const import DOMAIN
+from .const import (
+    DIAGNOSTICS_PAYLOAD_MAX,
+    DOMAIN,
+    HTTP_TIMEOUT,
+    PUSH_POLL_INTERVAL,
+    REFRESH_MIN_SPACING,
+    STREAM_CHUNK,
+)
+from .derived import TFAmeDerivedMetrics
+from .expiry import TFAmeExpiryQueue
+from .history import TFAmeRainHistoryStore
+from .index import TFAmeEntityIndex
+from .metrics import PollTiming, TFAmePollMetrics
+from .records import TFAmeRecordStore
+from .resolver import TFAmeResolver
+from .scheduler import TFAmeAdaptiveScheduler
+from .snapshot import TFAmeSnapshotStore
+from .stream import TFAmeSensorStream
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,25 +47,133 @@ class TFAmeDataCoordinator(DataUpdateCoordinator):
         host: str,
         interval: timedelta,
         multiple_entities: bool,
+        session: aiohttp.ClientSession,
+        hub_mode: bool = False,
+        adaptive: bool = False,
+        entry_id: str = "",
+        push: bool = False,
+        min_spacing: float = REFRESH_MIN_SPACING,
     ) -> None:
         """Initialize data update coordinator."""
         self.host = host
+        self.session = session  # Shared keep-alive session, see client.py
         self.first_init = 0
         self.ha = hass
-        self.sensor_entity_list = [str]  # [Entity ID strings]
+        self.entity_index = TFAmeEntityIndex()  # Entities of this station
         self.reset_rain_sensors = False
+        self._reset_rain_parsed = False  # Parser of this update reset rain
         self.multiple_entities = multiple_entities
         self.gateway_id = ""
-        self.poll_interval = interval
+        # Push mode: data is posted to a webhook (push.py), polls are only
+        # a slow safety net
+        self.push = push
+        self.set_poll_interval(interval)
+        self.hub_mode = hub_mode  # Polled by hub (hub.py), no own timer
+        # Adaptive polling: interval from expected sensor transmissions
+        self.adaptive = adaptive and not push
+        self.scheduler = TFAmeAdaptiveScheduler()
+        self.next_interval = self.poll_interval  # Delay until next poll
+        self.resolver = TFAmeResolver(hass)  # Cached mDNS lookups
+        # Records of all entities, updated in place by every poll
+        self.store = TFAmeRecordStore(multiple_entities)
+        # Change tracking: entities with new data in the last poll
+        self.changed_entities: set[str] = set()
+        # Shared "now" of the last poll and its number, entities calculate
+        # their state once per generation (state.py)
+        self.poll_ts = 0
+        self.generation = 0
+        # Poll timings & counts, exposed as diagnostic sensors
+        self.metrics = TFAmePollMetrics()
+        self.timing = PollTiming()
+        self.payload_bytes = 0
+        # Chunks of the last reply for diagnostics (up to a max. size)
+        self.last_payload: list[bytes] = []
+        self.last_payload_truncated = False
+        # Fingerprint & ETag of the last parsed reply, an equal reply is not
+        # parsed again, and decode & parse time of that reply
+        self.fingerprint = b""
+        self.etag: str | None = None
+        self.parse_cost = 0.0
+        # Entities written after the next poll, changed or not
+        self.forced_entities: set[str] = set()
+        # Expiry times of all sensors, one timer marks entities stale on time
+        self.expiry = TFAmeExpiryQueue()
+        self._expiry_at: int | None = None
+        self._unsub_expiry: CALLBACK_TYPE | None = None
+        # Dew point, heat index, ... of all sensors, calculated once per poll
+        self.derived = TFAmeDerivedMetrics()
+        # Rain of "last hour", saved in HA storage over restarts
+        self.history = TFAmeRainHistoryStore(hass, entry_id)
+        # Records of last poll, entities are created from them at startup
+        self.snapshot = TFAmeSnapshotStore(hass, entry_id)
+        # Polls and pushes update the records one after the other
+        self._store_lock = asyncio.Lock()
+        # Single flight: refreshes share the running poll, a refresh shortly
+        # after the last update uses its records
+        self.min_spacing = min_spacing
+        self._inflight: asyncio.Task | None = None
+        self._last_update: float | None = None  # Monotonic time
+        # Generation & success of the last dispatch, entities are updated
+        # once per generation
+        self._dispatched: tuple[int, bool] | None = None
 
         # self.devices = hass.config_entry.data.get("tfa_me_stations", [])
 
-        super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=self.poll_interval)
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=DOMAIN,
+            update_interval=None if hub_mode else self.poll_interval,
+        )
 
     async def _async_update_data(self):
-        """Request and update data."""
-        parsed_data = {}  # dict
+        """Request and update data, concurrent refreshes share one poll."""
+        while self._inflight is not None:
+            if not self.reset_rain_sensors:
+                # Poll running: use its result
+                self.metrics.coalesced += 1
+                return await asyncio.shield(self._inflight)
+            # Rain reset after the running poll started (ETag or parser
+            # chosen before): wait for it, poll again unless it reset rain
+            await asyncio.wait((self._inflight,))
+        # Spacing is below the poll interval: refreshes of the timer or the
+        # hub always poll
+        spacing = min(
+            self.min_spacing,
+            min(self.poll_interval, self.next_interval).total_seconds() / 2,
+        )
+        if (
+            self._last_update is not None
+            and time.monotonic() - self._last_update < spacing
+            and not self.reset_rain_sensors
+        ):
+            # Updated just now: no new request
+            self.metrics.spaced += 1
+            return self.store.records
+
+        task = self._inflight = self.hass.async_create_task(
+            self._async_locked_poll(), f"{DOMAIN} poll {self.host}"
+        )
+        task.add_done_callback(self._inflight_done)
+        return await asyncio.shield(task)
+
+    async def _async_locked_poll(self):
+        """Poll, not at the same time as a push."""
+        async with self._store_lock:
+            return await self._async_poll()
 
+    @callback
+    def _inflight_done(self, task: asyncio.Task) -> None:
+        """Poll done, next refresh starts a new one."""
+        self._inflight = None
+        if not task.cancelled():
+            task.exception()  # Retrieved, also when no refresh waits anymore
+
+    async def _async_poll(self):
+        """Request '/sensors' of the station and update records."""
+        poll_start = time.perf_counter()
+        self.timing = PollTiming()
+        self.payload_bytes = 0
         # Try to get an IP for a mDNS host name:
         # - when IP can be solved it returns the IP
         # - when it is an IP it just returns the IP
@@ -52,92 +181,33 @@ class TFAmeDataCoordinator(DataUpdateCoordinator):
             # station ID, contains "-"
             mdns_name = f"tfa-me-{self.host:}.local"
             resolved_host = await self.resolve_mdns(mdns_name)
+            self.timing.dns = time.perf_counter() - poll_start
         else:
             resolved_host = self.host
 
         # Build the URL to the device and request all available sensors
         url = f"http://{resolved_host}/sensors"
         msg: str = "Request URL " + url
-        _LOGGER.info(msg)
+        _LOGGER.debug(msg)
         try:
-            async with aiohttp.ClientSession() as session:
-                async with asyncio.timeout(5):  # 5 seconds timeout
-                    async with session.get(url) as response:
-                        if response.status != 200:
-                            raise UpdateFailed(f"HTTP Error {response.status}")  # noqa: TRY301
-
-                        # Get JSON reply from response
-                        json_data = await response.json()
-
-                        # Parse JSON data
-                        gateway_id: str = json_data.get("gateway_id", "tfame")
-                        gateway_id = gateway_id.lower()
-                        self.gateway_id = gateway_id
-
-                        for sensor in json_data.get("sensors", []):
-                            sensor_id = sensor["sensor_id"]
-
-                            for measurement, values in sensor.get(
-                                "measurements", {}
-                            ).items():
-                                if self.multiple_entities:
-                                    entity_id = f"sensor.{gateway_id}_{sensor_id}_{measurement}"  # Entity ID
-                                else:
-                                    entity_id = (
-                                        f"sensor.{sensor_id}_{measurement}"  # Entity ID
-                                    )
-
-                                parsed_data[entity_id] = {
-                                    "sensor_id": sensor_id,
-                                    "gateway_id": gateway_id,
-                                    "sensor_name": sensor["name"],
-                                    "measurement": measurement,
-                                    "value": values["value"],
-                                    "unit": values["unit"],
-                                    "timestamp": sensor.get(
-                                        "timestamp", "unknown"
-                                    ),  # datetime.utcnow()
-                                    "ts": sensor["ts"],
-                                }
-
-                                if measurement == "rain":
-                                    entity_id_2 = f"{entity_id}_rel"  # Entity ID
-                                    parsed_data[entity_id_2] = {
-                                        "sensor_id": sensor_id,
-                                        "gateway_id": gateway_id,
-                                        "sensor_name": f"{sensor['name']} rel",
-                                        "measurement": measurement,
-                                        "value": values["value"],
-                                        "unit": values["unit"],
-                                        "timestamp": sensor.get(
-                                            "timestamp", "unknown"
-                                        ),  # datetime.utcnow()
-                                        "ts": sensor["ts"],
-                                        "reset_rain": self.reset_rain_sensors,
-                                    }
-                                    entity_id_3 = f"{entity_id}_hour"  # Entity ID
-                                    parsed_data[entity_id_3] = {
-                                        "sensor_id": sensor_id,
-                                        "gateway_id": gateway_id,
-                                        "sensor_name": f"{sensor['name']} hour",
-                                        "measurement": measurement,
-                                        "value": values["value"],
-                                        "unit": values["unit"],
-                                        "timestamp": sensor.get(
-                                            "timestamp", "unknown"
-                                        ),  # datetime.utcnow()
-                                        "ts": sensor["ts"],
-                                        "reset_rain": self.reset_rain_sensors,
-                                    }
-
-                        self.reset_rain_sensors = False
-                        if self.first_init < 2:
-                            self.first_init += 1
-                        return parsed_data  # values are available with self.coordinator.data[self.entity_id]["keyword"]
+            # Request and update records in place, find changed entities
+            self.poll_ts = int(time.time())
+            async with asyncio.timeout(HTTP_TIMEOUT):  # 5 seconds timeout
+                changed = await self.request_sensors(url)
+            self._finish_update(changed, poll_start)
+
+            if self.adaptive:
+                self.set_next_interval(
+                    self.scheduler.next_delay(self.store.sensors.values(), self.poll_ts)
+                )
+            return self.store.records  # values are available with self.coordinator.data[self.entity_id].keyword
 
         except HTTPError as error:
             msg: str = "HTTP Error requesting data: " + str(error.__doc__)
             _LOGGER.error(msg)
+            self.metrics.add_error(msg)
+            if self.adaptive:
+                self.set_next_interval(self.scheduler.error_delay())
             if self.first_init == 0:
                 raise ConfigEntryNotReady(msg) from error  # Never updated
             raise UpdateFailed(msg) from error  # After first update
@@ -145,14 +215,313 @@ class TFAmeDataCoordinator(DataUpdateCoordinator):
         except Exception as error:
             msg: str = "Exception requesting data: " + str(error.__doc__)
             _LOGGER.error(msg)
+            self.metrics.add_error(msg)
+            if self.adaptive:
+                self.set_next_interval(self.scheduler.error_delay())
             if self.first_init == 0:
                 raise ConfigEntryNotReady(msg) from error  # Never updated
             raise UpdateFailed(msg) from error  # After first update
 
+    # ---- Push mode: '/sensors' data posted to the webhook ----
+    async def async_push(self, content: aiohttp.StreamReader) -> None:
+        """Update records from pushed data like from a poll, update entities."""
+        async with self._store_lock:
+            start = time.perf_counter()
+            self.timing = PollTiming()
+            self.payload_bytes = 0
+            self.poll_ts = int(time.time())
+            try:
+                async with asyncio.timeout(HTTP_TIMEOUT):
+                    # Only data of this station is accepted
+                    changed = await self._parse_reply(content, self.gateway_id)
+            except (TimeoutError, ValueError, KeyError, TypeError) as error:
+                msg: str = "Invalid push data: " + str(error)
+                self.metrics.add_error(msg)
+                raise ValueError(msg) from error
+            self.timing.transfer = (
+                time.perf_counter() - start - self.timing.decode - self.timing.parse
+            )
+            self._finish_update(changed, start)
+            self.metrics.pushes += 1
+
+        # Update entities like after a poll, next safety poll starts again
+        self.async_set_updated_data(self.store.records)
+
+    # ---- Fast startup: entities from the records saved before restart ----
+    async def async_restore_snapshot(self) -> bool:
+        """Restore records of the last run, False when there are none."""
+        snapshot = await self.snapshot.async_load()
+        if not snapshot:
+            return False
+        self.poll_ts = int(time.time())
+        try:
+            # Records too old are stale (TIMEOUT_MAPPING) like after a poll
+            changed = self.store.update(snapshot, False, self.poll_ts)
+        except (AttributeError, KeyError, TypeError, ValueError) as error:
+            msg: str = "Stored snapshot invalid: " + str(error)
+            _LOGGER.warning(msg)
+            self.store = TFAmeRecordStore(self.multiple_entities)
+            return False
+        changed |= self.derived.update(self.store, changed)
+        self.changed_entities = changed | self.history.update(
+            self.store.records, changed, self.poll_ts
+        )
+        self.generation += 1
+        self.gateway_id = self.store.gateway_id
+        self.first_init = 1  # Failed polls do not fail the setup
+        self._update_expiry(changed)
+        self.data = self.store.records
+        msg = f"Restored {len(self.store.sensors)} sensors of {self.host}"
+        _LOGGER.debug(msg)
+        return True
+
+    async def async_refresh_after_restore(self) -> None:
+        """First poll after a restore (in background), add new sensors."""
+        await self.async_refresh()
+        if self.last_update_success:
+            await self.async_discover_new_entities()
+
+    # ---- Options flow actions: one poll, entities written in one pass ----
+    async def async_refresh_entities(self, entity_ids: Iterable[str]) -> None:
+        """Poll once and write the state of the given entities."""
+        self.forced_entities = set(entity_ids)
+        try:
+            await self.async_refresh()
+            if self.last_update_success and not self.forced_entities.issubset(
+                self.changed_entities
+            ):
+                # Refresh used a poll which was already running or the last
+                # records (single flight): write the entities now
+                self.changed_entities = self.forced_entities
+                self.generation += 1
+                self.async_update_listeners()
+        finally:
+            self.forced_entities = set()
+
+    # ---- Records were updated by a poll or a push ----
+    def _finish_update(self, changed: set[str] | None, start: float) -> None:
+        """Update derived data and metrics, next generation for entities.
+
+        'changed' is None when the data equals the last one and was not
+        parsed, then only entities going stale are changed.
+        """
+        unchanged = changed is None
+        if changed is None:
+            self.metrics.add_unchanged(self.parse_cost)
+            changed = self.store.refresh(self.poll_ts)
+        else:
+            changed |= self.derived.update(self.store, changed)
+        self.changed_entities = (
+            changed
+            | self.history.update(self.store.records, changed, self.poll_ts)
+            | self.forced_entities
+        )
+        self.generation += 1
+        self.gateway_id = self.store.gateway_id
+        if self._reset_rain_parsed:
+            self.reset_rain_sensors = False
+            self._reset_rain_parsed = False
+        if not unchanged:
+            self.snapshot.async_schedule_save(self.store)
+        self._last_update = time.monotonic()
+        self._update_expiry(changed)
+        if self.first_init < 2:
+            self.first_init += 1
+        self.metrics.sensors = len(self.store.sensors)
+        self.metrics.entities = len(self.entity_index)
+        self.metrics.add_poll(
+            self.timing, time.perf_counter() - start, self.payload_bytes
+        )
+
+    # ---- Staleness: entities are marked stale when their timeout is over ----
+    @callback
+    def _update_expiry(self, changed: set[str]) -> None:
+        """New expiry times of changed sensors, timer for the next one."""
+        records = self.store.records
+        self.expiry.update(
+            records[ent_id].sensor for ent_id in changed if ent_id in records
+        )
+        expiry_at = self.expiry.next_expiry()
+        if expiry_at == self._expiry_at:
+            return  # Timer already set
+        self._cancel_expiry()
+        if expiry_at is not None:
+            self._expiry_at = expiry_at
+            self._unsub_expiry = async_call_later(
+                self.hass, max(0.0, expiry_at - time.time()), self._handle_expiry
+            )
+
+    @callback
+    def _handle_expiry(self, _now: Any) -> None:
+        """Timeout of sensors is over, update their entities."""
+        self._unsub_expiry = None
+        self._expiry_at = None
+        if self._store_lock.locked():
+            return  # Running poll checks staleness and sets the timer again
+        now_ts = int(time.time())
+        stale: set[str] = set()
+        for sensor_id in self.expiry.pop_expired(now_ts):
+            stale |= self.store.expire(self.entity_index.by_sensor(sensor_id), now_ts)
+        if stale:
+            # Only the expired entities write their state
+            self.poll_ts = now_ts
+            self.generation += 1
+            self.changed_entities = stale
+            self.async_update_listeners()
+        self._update_expiry(set())
+
+    @callback
+    def _cancel_expiry(self) -> None:
+        """Cancel expiry timer."""
+        if self._unsub_expiry is not None:
+            self._unsub_expiry()
+            self._unsub_expiry = None
+        self._expiry_at = None
+
+    # ---- Poll interval, only a slow safety net in push mode ----
+    def set_poll_interval(self, interval: timedelta) -> None:
+        """Set interval of polls."""
+        if self.push:
+            interval = max(interval, timedelta(seconds=PUSH_POLL_INTERVAL))
+        self.poll_interval = interval
+
+    # ---- Adaptive polling: set delay until next poll ----
+    def set_next_interval(self, seconds: float) -> None:
+        """Use new delay for next poll (own timer or hub)."""
+        self.next_interval = timedelta(seconds=seconds)
+        if not self.hub_mode:
+            # Timer is scheduled with this interval after the update
+            self.update_interval = self.next_interval
+
+    # ---- Request sensor list over shared keep-alive connection ----
+    async def request_sensors(self, url: str) -> set[str] | None:
+        """Request '/sensors', update records, return changed entity IDs.
+
+        Returns None when the reply is the same as the last one.
+        """
+        try:
+            return await self._request_records(url)
+        except aiohttp.ServerDisconnectedError:
+            # Station closed an idle keep-alive connection, try once again
+            _LOGGER.debug("Connection closed by station, request again")
+            return await self._request_records(url)
+
+    async def _request_records(self, url: str) -> set[str] | None:
+        """Single GET request, JSON reply is parsed into the record store."""
+        timing = self.timing
+        start = time.perf_counter()
+        connect = timing.connect
+        parse_time = timing.decode + timing.parse
+        # Conditional request when the station (or a proxy) sent an ETag,
+        # not when a rain reset needs the reply
+        headers = None
+        if self.etag is not None and not self.reset_rain_sensors:
+            headers = {aiohttp.hdrs.IF_NONE_MATCH: self.etag}
+        # Connect time is measured by the trace config of the session
+        async with self.session.get(
+            url, headers=headers, trace_request_ctx=timing
+        ) as response:
+            if response.status == 304:
+                # Not modified, records are up to date
+                self.metrics.not_modified += 1
+                changed = None
+            elif response.status != 200:
+                raise UpdateFailed(f"HTTP Error {response.status}")
+            else:
+                self.etag = None  # Set again when the reply was parsed
+                changed = await self._parse_reply(response.content)
+                self.etag = response.headers.get(aiohttp.hdrs.ETAG)
+
+        end = time.perf_counter()
+        # Rest of the request: sending, waiting for and receiving the reply
+        parse_time = timing.decode + timing.parse - parse_time
+        timing.transfer += end - start - (timing.connect - connect) - parse_time
+        return changed
+
+    async def _parse_reply(
+        self, content: aiohttp.StreamReader, gateway_id: str | None = None
+    ) -> set[str] | None:
+        """Parse '/sensors' data into the record store, return changed IDs.
+
+        The data is fingerprinted while it is received and only parsed when
+        it differs from the last parsed data (else None is returned), at
+        once with the fast decoder (decoder.py). Data larger than
+        DIAGNOSTICS_PAYLOAD_MAX is parsed while it is received, without the
+        check; the event loop is released after every chunk, so large
+        replies do not block it.
+        """
+        fingerprint = hashlib.blake2b(digest_size=16)
+        parser: TFAmeSensorStream | None = None
+        chunks: list[bytes] = []  # Kept for diagnostics & parsing, no copy
+        size = 0
+        async for chunk in content.iter_chunked(STREAM_CHUNK):
+            fingerprint.update(chunk)
+            size += len(chunk)
+            if parser is None and size > DIAGNOSTICS_PAYLOAD_MAX:
+                # Too large to keep: parse what was received and the rest
+                # while it is received
+                parser = self._new_parser(gateway_id)
+                for buffered in chunks:
+                    parser.feed(buffered)
+            if parser is None:
+                chunks.append(chunk)
+            else:
+                parser.feed(chunk)
+            await asyncio.sleep(0)
+        self.payload_bytes += size
+        self.last_payload = chunks
+        self.last_payload_truncated = parser is not None
+
+        digest = fingerprint.digest()
+        if parser is None:
+            if digest == self.fingerprint and not self.reset_rain_sensors:
+                return None  # Same data as last time
+            parser = self._new_parser(gateway_id)
+            changed = parser.parse_body(b"".join(chunks))
+        else:
+            changed = parser.close()
+        self.fingerprint = digest
+
+        self.parse_cost = parser.parse_time
+        self.timing.decode += parser.parse_time - parser.store_time
+        self.timing.parse += parser.store_time
+        return changed
+
+    def _new_parser(self, gateway_id: str | None) -> TFAmeSensorStream:
+        """Parser of one reply into the record store."""
+        # Records are changed from here, a failed parse is never skipped
+        self.fingerprint = b""
+        self._reset_rain_parsed = self.reset_rain_sensors
+        return TFAmeSensorStream(
+            self.store, self.reset_rain_sensors, self.poll_ts, gateway_id or None
+        )
+
+    # ---- Entity updates after a poll, timed for the metrics ----
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all entities of the station."""
+        dispatch = (self.generation, self.last_update_success)
+        if dispatch == self._dispatched:
+            return  # Refreshes which shared a poll
+        self._dispatched = dispatch
+        start = time.perf_counter()
+        super().async_update_listeners()
+        self.metrics.add_dispatch(time.perf_counter() - start)
+
     # ---- Try to resolve host name ----
     async def resolve_mdns(self, host_str: str) -> str:
-        """Try to resolve host name and to get IP."""
-        try:
-            return socket.gethostbyname(host_str)  # Resolve: name to IP
-        except socket.gaierror:
-            return host_str  # Error, just return original string
+        """Try to resolve host name and to get IP (cached, not blocking)."""
+        return await self.resolver.async_resolve(host_str)
+
+    async def async_shutdown(self) -> None:
+        """Cancel refresh timer, running poll and lookups, save rain history."""
+        await super().async_shutdown()
+        if self._inflight is not None:
+            # A poll done after unload would start the expiry timer and a
+            # snapshot save again
+            self._inflight.cancel()
+            await asyncio.wait((self._inflight,))
+        self._cancel_expiry()
+        await self.resolver.async_shutdown()
+        await self.history.async_save()
+        await self.snapshot.async_save(self.store)
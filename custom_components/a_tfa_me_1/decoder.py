@@ -0,0 +1,19 @@
+"""TFA.me station integration: decoder.py."""
+
+from collections.abc import Callable
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # Not installed (Home Assistant ships it)
+    orjson = None
+
+# ---- Decoder of complete replies: orjson when available, else json ----
+json_loads: Callable[[bytes], Any]
+if orjson is not None:
+    DECODER = "orjson"
+    json_loads = orjson.loads
+else:
+    DECODER = "json"
+    json_loads = json.loads
@@ -0,0 +1,258 @@
+"""TFA.me station integration: derived.py."""
+
+from bisect import bisect_right
+import math
+from typing import Any
+
+from .lookup import get_sensor_type
+from .records import SensorRecord, TFAmeRecordStore
+
+# Derived measurements (entities like the measurements of the station)
+DEW_POINT = "dew_point"  # °C, from temperature & humidity
+ABSOLUTE_HUMIDITY = "absolute_humidity"  # g/m³, from temperature & humidity
+HEAT_INDEX = "heat_index"  # °C, from temperature & humidity
+WIND_CHILL = "wind_chill"  # °C, from wind speed & outdoor temperature
+BEAUFORT = "beaufort"  # Bft, from wind speed
+RAIN_RATE = "rain_rate"  # mm/h, from rain of the last two transmissions
+
+# Upper limits (m/s) of Beaufort 0...11, above is 12
+BEAUFORT_LIMITS = (0.3, 1.6, 3.4, 5.5, 8.0, 10.8, 13.9, 17.2, 20.8, 24.5, 28.5, 32.7)
+
+# Input measurements of the derived measurements
+_INPUTS = ("temperature", "humidity", "wind_speed", "rain")
+
+
+# ---- Formulas, temperatures in °C ----
+def dew_point(temperature: float, humidity: float) -> float:
+    """Dew point (Magnus formula over water)."""
+    gamma = math.log(humidity / 100) + 17.62 * temperature / (243.12 + temperature)
+    return 243.12 * gamma / (17.62 - gamma)
+
+
+def absolute_humidity(temperature: float, humidity: float) -> float:
+    """Water vapour in g/m³."""
+    saturation = 6.112 * math.exp(17.67 * temperature / (temperature + 243.5))
+    return saturation * humidity * 2.1674 / (273.15 + temperature)
+
+
+def heat_index(temperature: float, humidity: float) -> float:
+    """Heat index (NOAA: Steadman, Rothfusz regression with adjustments)."""
+    t = temperature * 1.8 + 32  # °F
+    index = 0.5 * (t + 61.0 + (t - 68.0) * 1.2 + humidity * 0.094)
+    if (index + t) / 2 >= 80:
+        index = (
+            -42.379
+            + 2.04901523 * t
+            + 10.14333127 * humidity
+            - 0.22475541 * t * humidity
+            - 0.00683783 * t * t
+            - 0.05481717 * humidity * humidity
+            + 0.00122874 * t * t * humidity
+            + 0.00085282 * t * humidity * humidity
+            - 0.00000199 * t * t * humidity * humidity
+        )
+        if humidity < 13 and 80 <= t <= 112:
+            index -= (13 - humidity) / 4 * math.sqrt((17 - abs(t - 95)) / 17)
+        elif humidity > 85 and 80 <= t <= 87:
+            index += (humidity - 85) / 10 * (87 - t) / 5
+    return (index - 32) / 1.8
+
+
+def wind_chill(temperature: float, wind_speed: float) -> float:
+    """Wind chill (wind speed in m/s), the temperature when not defined."""
+    speed = wind_speed * 3.6  # km/h
+    if temperature > 10 or speed <= 4.8:
+        return temperature
+    factor = speed**0.16
+    return 13.12 + 0.6215 * temperature - 11.37 * factor + 0.3965 * temperature * factor
+
+
+def beaufort(wind_speed: float) -> int:
+    """Beaufort number of a wind speed in m/s."""
+    return bisect_right(BEAUFORT_LIMITS, wind_speed)
+
+
+def _number(record: Any) -> float | None:
+    """Value of a record as float, None when missing or no number."""
+    if record is None:
+        return None
+    try:
+        return float(record.value)
+    except (TypeError, ValueError):
+        return None
+
+
+# ---- Derived measurements of the changed sensors, calculated once per poll ----
+class TFAmeDerivedMetrics:
+    """Calculate derived measurements and keep them as records of the store.
+
+    Only sensors with changed entities (new transmission, stale, ...) or an
+    input measurement gone can have new derived values, they are calculated
+    in one batch per poll. Wind chill of all wind sensors is calculated again
+    when the outdoor temperature changed.
+    """
+
+    def __init__(self) -> None:
+        """Initialize, no sensor seen yet."""
+        # Rain sensor ID -> (ts, value) of the last transmission and rain rate
+        self.rain: dict[str, tuple[int, float]] = {}
+        self.rain_rates: dict[str, float] = {}
+        # Wind sensor ID -> last wind speed in m/s
+        self.wind_speeds: dict[str, float] = {}
+        # Outdoor temperature for wind chill: temperature of the sensor (no
+        # station) with the lowest sensor ID
+        self.outdoor_id: str | None = None
+        self.outdoor: float | None = None
+
+    def update(self, store: TFAmeRecordStore, changed: set[str]) -> set[str]:
+        """Update derived records of changed sensors, return changed entity IDs."""
+        # Sensors of the changed entities (a new transmission or going stale
+        # changes all entities of a sensor) and sensors with an input
+        # measurement gone
+        sensors: dict[str, SensorRecord] = {}
+        records = store.records
+        for ent_id in changed:
+            record = records.get(ent_id)
+            if record is not None and not record.derived and not record.suffix:
+                sensors[record.sensor_id] = record.sensor
+        for sensor_id in store.inputs_removed:
+            sensor = store.sensors.get(sensor_id)
+            if sensor is not None:
+                sensors[sensor_id] = sensor
+        # Input records of these sensors
+        inputs: dict[str, list[Any]] = {}
+        for sensor_id, sensor in sensors.items():
+            slot = [
+                records.get(store.entity_id(sensor.gateway_id, sensor_id, measurement))
+                for measurement in _INPUTS
+            ]
+            if sensor.derived or any(slot):
+                inputs[sensor_id] = [sensor, *slot]
+
+        # Input values of the sensors
+        climate: list[tuple[SensorRecord, float, float]] = []
+        wind: list[tuple[SensorRecord, float]] = []
+        outdoor_id = self.outdoor_id
+        outdoor = self.outdoor
+        if outdoor_id is not None and outdoor_id not in store.sensors:
+            outdoor_id, outdoor = self._find_outdoor(store)  # Sensor removed
+        results: list[tuple[SensorRecord, str, Any, str]] = []
+
+        for sensor_id, (sensor, *values) in inputs.items():
+            temperature, humidity, speed, rain = map(_number, values)
+            if temperature is not None:
+                if humidity is not None and 0 < humidity <= 100:
+                    climate.append((sensor, temperature, humidity))
+                if sensor_id == outdoor_id or (
+                    (outdoor_id is None or sensor_id < outdoor_id)
+                    and not get_sensor_type(sensor_id).is_station
+                ):
+                    outdoor_id = sensor_id
+                    outdoor = temperature
+            elif sensor_id == outdoor_id:
+                outdoor_id, outdoor = self._find_outdoor(store)  # No temperature
+            if speed is not None:
+                if values[2].unit == "km/h":
+                    speed /= 3.6
+                wind.append((sensor, speed))
+                self.wind_speeds[sensor_id] = speed
+            else:
+                self.wind_speeds.pop(sensor_id, None)
+            if rain is not None:
+                results.append(
+                    (sensor, RAIN_RATE, self._rain_rate(sensor, rain), "mm/h")
+                )
+            elif sensor_id in self.rain:
+                del self.rain[sensor_id]
+                self.rain_rates.pop(sensor_id, None)
+
+        # New outdoor temperature: wind chill of the other wind sensors too,
+        # removed without outdoor temperature
+        removed: set[str] = set()
+        self.outdoor_id = outdoor_id
+        if outdoor != self.outdoor:
+            self.outdoor = outdoor
+            for sensor_id, speed in list(self.wind_speeds.items()):
+                sensor = store.sensors.get(sensor_id)
+                if sensor is None:
+                    del self.wind_speeds[sensor_id]  # Sensor removed
+                elif sensor_id in inputs:
+                    continue
+                elif outdoor is None:
+                    ent_id = store.remove_derived(sensor, WIND_CHILL)
+                    if ent_id is not None:
+                        removed.add(ent_id)
+                else:
+                    wind.append((sensor, speed))
+
+        # Temperature & humidity
+        for sensor, temperature, humidity in climate:
+            results.append(
+                (sensor, DEW_POINT, round(dew_point(temperature, humidity), 1), "°C")
+            )
+            results.append(
+                (
+                    sensor,
+                    ABSOLUTE_HUMIDITY,
+                    round(absolute_humidity(temperature, humidity), 1),
+                    "g/m³",
+                )
+            )
+            results.append(
+                (sensor, HEAT_INDEX, round(heat_index(temperature, humidity), 1), "°C")
+            )
+
+        # Wind speed (and outdoor temperature)
+        for sensor, speed in wind:
+            if sensor.sensor_id in inputs:
+                results.append((sensor, BEAUFORT, beaufort(speed), "Bft"))
+            if outdoor is not None:
+                results.append(
+                    (sensor, WIND_CHILL, round(wind_chill(outdoor, speed), 1), "°C")
+                )
+
+        # Records of the store, written with the other entities of the sensor
+        derived_changed: set[str] = set()
+        for sensor, measurement, value, unit in results:
+            ent_id, value_changed = store.set_derived(sensor, measurement, value, unit)
+            if value_changed or sensor.sensor_id in inputs:
+                derived_changed.add(ent_id)
+        if len(self.rain) > len(store.sensors):
+            for sensor_id in [i for i in self.rain if i not in store.sensors]:
+                del self.rain[sensor_id]
+                self.rain_rates.pop(sensor_id, None)
+        return (
+            derived_changed
+            | removed
+            | store.finish_derived(slot[0] for slot in inputs.values())
+        )
+
+    def _find_outdoor(
+        self, store: TFAmeRecordStore
+    ) -> tuple[str | None, float | None]:
+        """Sensor ID and temperature of the outdoor sensor, search all records."""
+        found: tuple[str | None, float | None] = (None, None)
+        for record in store.records.values():
+            if (
+                record.measurement == "temperature"
+                and not record.suffix
+                and not record.derived
+                and (found[0] is None or record.sensor_id < found[0])
+                and not get_sensor_type(record.sensor_id).is_station
+            ):
+                temperature = _number(record)
+                if temperature is not None:
+                    found = (record.sensor_id, temperature)
+        return found
+
+    def _rain_rate(self, sensor: SensorRecord, rain: float) -> float | None:
+        """Rain in mm/h between the last two transmissions, None before."""
+        ts = int(sensor.ts)
+        last = self.rain.get(sensor.sensor_id)
+        if last is None or ts > last[0]:
+            if last is not None:
+                # Negative: rain counter was reset
+                rate = max(0.0, rain - last[1]) * 3600 / (ts - last[0])
+                self.rain_rates[sensor.sensor_id] = round(rate, 1)
+            self.rain[sensor.sensor_id] = (ts, rain)
+        return self.rain_rates.get(sensor.sensor_id)
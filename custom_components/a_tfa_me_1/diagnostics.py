@@ -0,0 +1,137 @@
+"""TFA.me station integration: diagnostics.py."""
+
+from datetime import UTC, datetime
+import json
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_IP_ADDRESS, CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant
+
+from .const import HISTOGRAM_BOUNDS_MS
+from .coordinator import TFAmeDataCoordinator
+from .decoder import DECODER
+from .metrics import PHASES, RollingStats
+
+# Network addresses of the stations, webhook of push mode
+TO_REDACT = {
+    CONF_IP_ADDRESS,
+    CONF_WEBHOOK_ID,
+    "host",
+    "ip",
+    "url",
+    "mac",
+    "ssid",
+}
+
+
+# ---- Diagnostics download of a station ----
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics of a config entry."""
+    coordinator: TFAmeDataCoordinator = entry.runtime_data
+    metrics = coordinator.metrics
+
+    return async_redact_data(
+        {
+            "config": {
+                "data": dict(entry.data),
+                "options": dict(entry.options),
+                "host": coordinator.host,
+                "gateway_id": coordinator.gateway_id,
+                "multiple_entities": coordinator.multiple_entities,
+                "poll_interval": coordinator.poll_interval.total_seconds(),
+                "next_interval": coordinator.next_interval.total_seconds(),
+                "hub_mode": coordinator.hub_mode,
+                "adaptive": coordinator.adaptive,
+                "push": coordinator.push,
+                "min_spacing": coordinator.min_spacing,
+                "decoder": DECODER,
+            },
+            "coordinator": {
+                "last_update_success": coordinator.last_update_success,
+                "generation": coordinator.generation,
+                "fingerprint": coordinator.fingerprint.hex(),
+                "etag": coordinator.etag,
+                "poll_ts": coordinator.poll_ts,
+                "sensors": len(coordinator.store.sensors),
+                "records": len(coordinator.store.records),
+                "stale_entities": sorted(coordinator.store.stale_entities),
+            },
+            "payload": _payload(coordinator),
+            "entities": _entities(coordinator),
+            "metrics": {
+                "polls": metrics.polls,
+                "pushes": metrics.pushes,
+                "unchanged": metrics.unchanged,
+                "not_modified": metrics.not_modified,
+                "hit_rate": metrics.hit_rate,
+                "cpu_saved_ms": metrics.saved * 1000,
+                "suppressed_writes": metrics.suppressed,
+                "coalesced": metrics.coalesced,
+                "spaced": metrics.spaced,
+                "errors": metrics.errors,
+                "sensors": metrics.sensors,
+                "entities": metrics.entities,
+                "phases_ms": {
+                    phase: _stats(metrics.phases[phase], 1000, HISTOGRAM_BOUNDS_MS)
+                    for phase in PHASES
+                },
+                "payload_bytes": _stats(metrics.payload_bytes),
+            },
+            "resolver": coordinator.resolver.stats(),
+            "failures": [
+                {
+                    "time": datetime.fromtimestamp(ts, UTC).isoformat(),
+                    "error": error,
+                }
+                for ts, error in metrics.failures
+            ],
+        },
+        TO_REDACT,
+    )
+
+
+def _stats(
+    stats: RollingStats,
+    scale: float = 1.0,
+    bounds: tuple[float, ...] | None = None,
+) -> dict[str, Any]:
+    """Percentiles (and histogram) of a rolling window."""
+    result: dict[str, Any] = {"samples": stats.count}
+    values = (stats.last, *stats.percentiles())
+    for key, value in zip(("last", "p50", "p95", "p99"), values, strict=True):
+        result[key] = None if value is None else value * scale
+    if bounds is not None:
+        result["histogram"] = stats.histogram(bounds, scale)
+    return result
+
+
+def _entities(coordinator: TFAmeDataCoordinator) -> dict[str, Any]:
+    """Entity index of the station."""
+    entities: dict[str, Any] = {}
+    for entity_id, (sensor_id, measurement) in coordinator.entity_index.keys.items():
+        entities[entity_id] = {
+            "sensor_id": sensor_id,
+            "measurement": measurement,
+            "changed": entity_id in coordinator.changed_entities,
+        }
+    return entities
+
+
+def _payload(coordinator: TFAmeDataCoordinator) -> dict[str, Any]:
+    """Last '/sensors' reply of the station."""
+    body = b"".join(coordinator.last_payload)
+    if coordinator.last_payload_truncated:
+        # Too large to keep completely, show the beginning
+        return {
+            "truncated": True,
+            "bytes": coordinator.metrics.payload_bytes.last,
+            "head": body[:4096].decode("utf-8", "replace"),
+        }
+    try:
+        return {"truncated": False, "json": json.loads(body)} if body else {}
+    except ValueError:
+        return {"truncated": False, "raw": body.decode("utf-8", "replace")}
@@ -0,0 +1,48 @@
+"""TFA.me station integration: expiry.py."""
+
+from collections.abc import Iterable
+import heapq
+
+from .records import SensorRecord
+
+
+# ---- Time when the values of a sensor get stale, for all sensors in one heap ----
+class TFAmeExpiryQueue:
+    """Expiry times (last "ts" + timeout) of the sensors of one station.
+
+    One heap for all sensors, so one timer is enough. An entry is replaced by
+    pushing a new one, old entries are dropped when they reach the top (also
+    entries of sensors no longer reported).
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty queue."""
+        self._heap: list[tuple[int, str]] = []
+        self._expiry: dict[str, int] = {}  # Sensor ID -> valid expiry time
+
+    def update(self, sensors: Iterable[SensorRecord]) -> None:
+        """Set expiry times of sensors with a new transmission."""
+        for sensor in sensors:
+            # Stale when (now - ts) > timeout
+            expiry = int(sensor.ts) + sensor.timeout + 1
+            if self._expiry.get(sensor.sensor_id) != expiry:
+                self._expiry[sensor.sensor_id] = expiry
+                heapq.heappush(self._heap, (expiry, sensor.sensor_id))
+
+    def next_expiry(self) -> int | None:
+        """Return next expiry time, None when there is none."""
+        heap = self._heap
+        while heap and self._expiry.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)  # Replaced or expired entry
+        return heap[0][0] if heap else None
+
+    def pop_expired(self, now_ts: int) -> list[str]:
+        """Remove and return IDs of sensors stale at 'now_ts'."""
+        expired: list[str] = []
+        heap = self._heap
+        while heap and heap[0][0] <= now_ts:
+            expiry, sensor_id = heapq.heappop(heap)
+            if self._expiry.get(sensor_id) == expiry:
+                del self._expiry[sensor_id]
+                expired.append(sensor_id)
+        return expired
@@ -0,0 +1,245 @@
+"""TFA.me station integration: history.py."""
+
+from array import array
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    HISTORY_BUCKET,
+    HISTORY_LONG_BUCKET,
+    HISTORY_LONG_MAX_AGE,
+    HISTORY_MAX_AGE,
+    HISTORY_SAVE_DELAY,
+    HISTORY_STORAGE_VERSION,
+)
+from .records import MeasurementRecord
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# Rain entities with totals of a time window: entity ID suffix, seconds
+# (None: since local midnight)
+RAIN_WINDOWS = (
+    ("_hour", HISTORY_MAX_AGE),
+    ("_24h", 24 * 60 * 60),
+    ("_7d", HISTORY_LONG_MAX_AGE),
+    ("_today", None),
+)
+# Buckets and sizes of the rings, stored histories of another layout are
+# not used
+_LAYOUT = [HISTORY_BUCKET, HISTORY_MAX_AGE, HISTORY_LONG_BUCKET, HISTORY_LONG_MAX_AGE]
+
+
+# ---- Running totals of one rain sensor per time bucket (prefix sums) ----
+class RainTotals:
+    """Ring buffer with the total rain at the end of every time bucket.
+
+    Rain of a time window is the newest total minus the total at the start of
+    the window, one lookup. Buckets without measurement get the total of the
+    bucket before when a newer one is added.
+    """
+
+    __slots__ = ("bucket", "first", "newest", "totals")
+
+    def __init__(self, max_age: int, bucket: int) -> None:
+        """Initialize empty ring."""
+        self.bucket = bucket
+        self.totals = array("d", bytes(8 * (max_age // bucket + 1)))
+        self.first = 0  # Bucket number of the first total, 0 = empty
+        self.newest = 0  # Bucket number of the newest total
+
+    def add(self, total: float, ts: int) -> None:
+        """Set the total at "ts" (not older than the newest one)."""
+        number = ts // self.bucket
+        totals = self.totals
+        size = len(totals)
+        if self.newest == 0:
+            self.first = number
+        elif number > self.newest:
+            # Fill buckets without measurement (at most one round)
+            last = totals[self.newest % size]
+            for gap in range(max(self.newest + 1, number - size + 1), number):
+                totals[gap % size] = last
+        self.newest = max(number, self.newest)
+        totals[number % size] = total
+
+    def total_at(self, ts: int) -> float:
+        """Return the total at the end of the bucket of "ts"."""
+        number = ts // self.bucket
+        if self.newest == 0 or number < self.first:
+            return 0.0  # Before first measurement
+        if number >= self.newest:
+            return self.totals[self.newest % len(self.totals)]
+        # Older than the ring: oldest total kept
+        number = max(number, self.newest - len(self.totals) + 1)
+        return self.totals[number % len(self.totals)]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return data to store."""
+        return {
+            "first": self.first,
+            "newest": self.newest,
+            "totals": self.totals.tolist(),
+        }
+
+    def load(self, data: dict[str, Any]) -> None:
+        """Restore stored totals (same bucket and size)."""
+        totals = array("d", data["totals"])
+        if len(totals) != len(self.totals):
+            raise ValueError("Rain totals of other size")
+        self.totals = totals
+        self.first = int(data["first"])
+        self.newest = int(data["newest"])
+
+
+# ---- History of one rain sensor for the rain of time windows ----
+class RainHistory:
+    """Total rain from the rain counter of a sensor, kept in two rings.
+
+    A counter going back (reset or wrap around) counts from 0 again. Values
+    with a "ts" not newer than the newest one are ignored (duplicates).
+    """
+
+    __slots__ = ("hour", "last_ts", "last_value", "long", "total")
+
+    def __init__(self) -> None:
+        """Initialize empty history."""
+        self.hour = RainTotals(HISTORY_MAX_AGE, HISTORY_BUCKET)
+        self.long = RainTotals(HISTORY_LONG_MAX_AGE, HISTORY_LONG_BUCKET)
+        self.total = 0.0  # Rain since first measurement
+        self.last_value = 0.0  # Last value of the rain counter
+        self.last_ts = 0
+
+    def add(self, value: float, ts: int) -> bool:
+        """Add measurement, return False when it was no new one."""
+        if ts <= self.last_ts:
+            return False
+        if self.last_ts:
+            difference = value - self.last_value
+            self.total += value if difference < 0 else difference
+        self.last_value = value
+        self.last_ts = ts
+        self.hour.add(self.total, ts)
+        self.long.add(self.total, ts)
+        return True
+
+    def get_rain(self, now_ts: int, seconds: int) -> float:
+        """Return rain of the last seconds."""
+        totals = self.hour if seconds <= HISTORY_MAX_AGE else self.long
+        return round(self.total - totals.total_at(now_ts - seconds), 1)
+
+    def get_rain_since(self, start_ts: int) -> float:
+        """Return rain since "start_ts" (on a border of the long buckets)."""
+        return round(self.total - self.long.total_at(start_ts - 1), 1)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return data to store."""
+        return {
+            "layout": _LAYOUT,
+            "total": self.total,
+            "last_value": self.last_value,
+            "last_ts": self.last_ts,
+            "hour": self.hour.as_dict(),
+            "long": self.long.as_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "RainHistory":
+        """Restore stored history (empty when layout changed)."""
+        history = cls()
+        if data.get("layout") != _LAYOUT:
+            return history
+        history.hour.load(data["hour"])
+        history.long.load(data["long"])
+        history.total = float(data["total"])
+        history.last_value = float(data["last_value"])
+        history.last_ts = int(data["last_ts"])
+        return history
+
+
+# ---- Rain histories of one station, persisted in HA storage ----
+class TFAmeRainHistoryStore:
+    """Rain histories, fed once per poll by the coordinator."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize store."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, HISTORY_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.rain_history"
+        )
+        self.histories: dict[str, RainHistory] = {}  # Key: rain entity ID
+        # Key: "_hour", "_24h", "_7d" and "_today" entity ID
+        self.rain_values: dict[str, float] = {}
+
+    async def async_load(self) -> None:
+        """Restore histories saved before restart."""
+        data = await self._store.async_load()
+        if not data:
+            return
+        for entity_id, history_data in data.get("histories", {}).items():
+            try:
+                self.histories[entity_id] = RainHistory.from_dict(history_data)
+            except (KeyError, TypeError, ValueError):
+                msg: str = "Stored rain history invalid: " + entity_id
+                _LOGGER.warning(msg)
+
+    def update(
+        self,
+        records: dict[str, MeasurementRecord],
+        changed: set[str],
+        now_ts: int,
+    ) -> set[str]:
+        """Add new rain values, return rain window entity IDs with a new value."""
+        added = False
+        for entity_id in changed:
+            record = records.get(entity_id)
+            if record is None or record.measurement != "rain" or record.suffix:
+                continue
+            history = self.histories.get(entity_id)
+            if history is None:
+                history = self.histories[entity_id] = RainHistory()
+            added |= history.add(float(record.value), int(record.ts))
+
+        if added:
+            self._store.async_delay_save(self._data_to_save, HISTORY_SAVE_DELAY)
+
+        # Values change also when old values get too old and at midnight
+        midnight = int(
+            dt_util.start_of_local_day(
+                dt_util.as_local(dt_util.utc_from_timestamp(now_ts))
+            ).timestamp()
+        )
+        rain_values = self.rain_values
+        window_changed: set[str] = set()
+        for entity_id, history in self.histories.items():
+            for suffix, seconds in RAIN_WINDOWS:
+                window_id = entity_id + suffix
+                if seconds is None:
+                    value = history.get_rain_since(midnight)
+                else:
+                    value = history.get_rain(now_ts, seconds)
+                if rain_values.get(window_id) != value:
+                    rain_values[window_id] = value
+                    window_changed.add(window_id)
+        return window_changed
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return data to store."""
+        return {
+            "histories": {
+                entity_id: history.as_dict()
+                for entity_id, history in self.histories.items()
+            }
+        }
+
+    async def async_save(self) -> None:
+        """Save now (when station is unloaded)."""
+        await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        """Remove the stored histories (when station is removed)."""
+        await self._store.async_remove()
@@ -0,0 +1,133 @@
+"""TFA.me station integration: hub.py."""
+
+import asyncio
+from datetime import datetime, timedelta
+import logging
+import time
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import DATA_HUB, HUB_CONCURRENCY, HUB_TICK
+from .coordinator import TFAmeDataCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class HubStation:
+    """Poll state of one station in the hub."""
+
+    def __init__(self, coordinator: TFAmeDataCoordinator, concurrency: int) -> None:
+        """Initialize station."""
+        self.coordinator = coordinator
+        self.concurrency = concurrency  # Cap configured in options of this entry
+        self.next_due: float = 0.0  # time.monotonic() of next poll
+        self.polling = False
+
+
+# ---- One scheduler for many stations (optional hub mode) ----
+class TFAmeHub:
+    """Poll all hub mode stations from one timer with bounded concurrency.
+
+    Stations are spread over their interval (staggered start) so polls do not
+    fire in the same second. The coordinators of the stations have no own
+    timer, a poll is a 'coordinator.async_refresh()' which updates the
+    entities of the station as before.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize hub."""
+        self.hass = hass
+        self.stations: dict[str, HubStation] = {}  # Key: config entry ID
+        self.concurrency = HUB_CONCURRENCY
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._unsub_timer: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_add_station(
+        self,
+        entry_id: str,
+        coordinator: TFAmeDataCoordinator,
+        concurrency: int = HUB_CONCURRENCY,
+    ) -> None:
+        """Add a station and restagger all stations."""
+        self.stations[entry_id] = HubStation(coordinator, concurrency)
+        self._update_concurrency()
+        self._stagger()
+        if self._unsub_timer is None:
+            self._unsub_timer = async_track_time_interval(
+                self.hass, self._async_tick, timedelta(seconds=HUB_TICK)
+            )
+
+    @callback
+    def async_remove_station(self, entry_id: str) -> bool:
+        """Remove a station, return True when hub has no stations left."""
+        self.stations.pop(entry_id, None)
+        if self.stations:
+            self._update_concurrency()
+            return False
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        return True
+
+    def _update_concurrency(self) -> None:
+        """Use the smallest cap of all stations."""
+        concurrency = min(station.concurrency for station in self.stations.values())
+        if concurrency != self.concurrency:
+            self.concurrency = concurrency
+            # Running polls keep the old semaphore, new polls use the new one
+            self._semaphore = asyncio.Semaphore(concurrency)
+
+    def _stagger(self) -> None:
+        """Spread next polls of all stations evenly over their interval."""
+        now = time.monotonic()
+        count = len(self.stations)
+        for number, station in enumerate(self.stations.values(), start=1):
+            interval = station.coordinator.poll_interval.total_seconds()
+            station.next_due = now + interval * number / count
+
+    @callback
+    def _async_tick(self, _now: datetime) -> None:
+        """Start polls of all due stations."""
+        now = time.monotonic()
+        for entry_id, station in self.stations.items():
+            if station.polling or now < station.next_due:
+                continue
+            interval = station.coordinator.poll_interval.total_seconds()
+            station.next_due = max(station.next_due + interval, now)
+            station.polling = True
+            self.hass.async_create_background_task(
+                self._async_poll(station), name=f"tfa_me hub poll {entry_id}"
+            )
+
+    async def _async_poll(self, station: HubStation) -> None:
+        """Poll one station, wait for a free slot first."""
+        try:
+            async with self._semaphore:
+                await station.coordinator.async_refresh()
+        finally:
+            station.polling = False
+            if station.coordinator.adaptive:
+                # Adaptive polling: coordinator calculated delay to next poll
+                station.next_due = (
+                    time.monotonic() + station.coordinator.next_interval.total_seconds()
+                )
+
+
+@callback
+def async_get_hub(hass: HomeAssistant) -> TFAmeHub:
+    """Get (and create on first use) the hub."""
+    hub: TFAmeHub | None = hass.data.get(DATA_HUB)
+    if hub is None:
+        hub = hass.data[DATA_HUB] = TFAmeHub(hass)
+    return hub
+
+
+@callback
+def async_remove_from_hub(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove a station from the hub, remove hub when it was the last one."""
+    hub: TFAmeHub | None = hass.data.get(DATA_HUB)
+    if hub is not None and hub.async_remove_station(entry_id):
+        hass.data.pop(DATA_HUB)
+        _LOGGER.debug("Hub stopped, no stations left")
@@ -0,0 +1,65 @@
+"""TFA.me station integration: index.py."""
+
+from collections.abc import Iterator
+from typing import Any
+
+
+# ---- Entities of one station, indexed by entity ID, sensor and measurement ----
+class TFAmeEntityIndex:
+    """Find entities by entity ID, sensor ID or measurement type in O(1)."""
+
+    def __init__(self) -> None:
+        """Initialize empty index."""
+        self.entities: dict[str, Any] = {}  # Entity ID -> entity
+        # Entity ID sets as dicts (ordered): key -> {entity ID: entity}
+        self.sensors: dict[str, dict[str, Any]] = {}
+        self.measurements: dict[str, dict[str, Any]] = {}
+        # Entity ID -> (sensor ID, measurement) for removal
+        self.keys: dict[str, tuple[str, str]] = {}
+
+    def add(
+        self, entity_id: str, sensor_id: str, measurement: str, entity: Any
+    ) -> None:
+        """Add an entity."""
+        self.entities[entity_id] = entity
+        self.keys[entity_id] = (sensor_id, measurement)
+        self.sensors.setdefault(sensor_id, {})[entity_id] = entity
+        self.measurements.setdefault(measurement, {})[entity_id] = entity
+
+    def remove(self, entity_id: str) -> None:
+        """Remove an entity (when removed from Home Assistant)."""
+        if self.entities.pop(entity_id, None) is None:
+            return
+        sensor_id, measurement = self.keys.pop(entity_id)
+        for index, key in (
+            (self.sensors, sensor_id),
+            (self.measurements, measurement),
+        ):
+            entities = index[key]
+            del entities[entity_id]
+            if not entities:
+                del index[key]
+
+    def get(self, entity_id: str) -> Any | None:
+        """Return entity for an entity ID."""
+        return self.entities.get(entity_id)
+
+    def by_sensor(self, sensor_id: str) -> dict[str, Any]:
+        """Return entities of a sensor, e.g. "a01234456"."""
+        return self.sensors.get(sensor_id, {})
+
+    def by_measurement(self, measurement: str) -> dict[str, Any]:
+        """Return entities of a measurement type, e.g. "rain"."""
+        return self.measurements.get(measurement, {})
+
+    def __contains__(self, entity_id: object) -> bool:
+        """Entity ID is in index."""
+        return entity_id in self.entities
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over all entity IDs."""
+        return iter(self.entities)
+
+    def __len__(self) -> int:
+        """Number of entities."""
+        return len(self.entities)
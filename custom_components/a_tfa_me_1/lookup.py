@@ -0,0 +1,236 @@
+"""TFA.me station integration: lookup.py."""
+
+from bisect import bisect_right
+from dataclasses import dataclass
+
+from .const import DEVICE_MAPPING, TIMEOUT_MAPPING, TRANSMIT_MAPPING
+
+# Used icons for entities, see also
+# https://pictogrammers.com/library/mdi/
+ICON_MAPPING = {
+    "temperature": {
+        "default": "mdi:thermometer",
+        "high": "mdi:thermometer-high",
+        "low": "mdi:thermometer-low",
+    },
+    "humidity": {"default": "mdi:water-percent", "alert": "mdi:water-percent-alert"},
+    "co2": {"default": "mdi:molecule-co2"},
+    "barometric_pressure": {"default": "mdi:gauge"},
+    "rssi": {
+        "default": "mdi:wifi",
+        "weak": "mdi:wifi-strength-1",
+        "middle": "mdi:wifi-strength-2",
+        "good": "mdi:wifi-strength-3",
+        "strong": "mdi:wifi-strength-4",
+    },
+    "lowbatt": {
+        "default": "mdi:battery",
+        "low": "mdi:battery-alert",
+        "full": "mdi:battery",
+    },
+    "wind_direction": {"default": "mdi:compass-outline"},
+    "wind": {
+        "default": "mdi:weather-windy",
+        "wind": "mdi:weather-windy-variant",
+        "gust": "mdi:weather-windy",
+    },
+    "rain": {
+        "none": "mdi:weather-sunny",
+        "light": "mdi:weather-partly-rainy",
+        "moderate": "mdi:weather-rainy",
+        "heavy": "mdi:weather-pouring",
+    },
+    # Derived measurements (derived.py)
+    "dew_point": {"default": "mdi:thermometer-water"},
+    "absolute_humidity": {"default": "mdi:water"},
+    "heat_index": {"default": "mdi:sun-thermometer"},
+    "wind_chill": {"default": "mdi:snowflake-thermometer"},
+    "beaufort": {"default": "mdi:windsock"},
+}
+ICON_UNKNOWN = "mdi:help-circle"  # Unknown measurement type
+
+# Arrows for wind direction 0...15, two directions share one arrow
+# Remark: there are only 8 arrows for direction but 16 wind direction so icon does not match optimal
+WIND_DIRECTION_ARROWS = (
+    "mdi:arrow-down",  # N (North)
+    "mdi:arrow-bottom-left",  # NE (North-East)
+    "mdi:arrow-left",  # E (East)
+    "mdi:arrow-top-left",  # SE (South-East)
+    "mdi:arrow-up",  # S (South)
+    "mdi:arrow-top-right",  # SW (South-West)
+    "mdi:arrow-right",  # W (West)
+    "mdi:arrow-bottom-right",  # NW (North-West)
+)
+
+# Limits of the icon tables:
+# ("<", x): icon for values below x, ("<=", x): icon for values up to x
+LESS = 0
+LESS_EQUAL = 1
+_OPERATORS = {"<": LESS, "<=": LESS_EQUAL}
+
+
+# ---- Icon of one measurement type, value to icon with bisect ----
+class IconTable:
+    """Sorted limits with the icon of every range.
+
+    Limits are kept as (value, LESS/LESS_EQUAL) keys, a value is looked up as
+    (value, LESS): it is in front of a ("<=", value) limit and behind a
+    ("<", value) limit.
+    """
+
+    __slots__ = ("icons", "keys", "none_icon")
+
+    def __init__(
+        self,
+        none_icon: str,
+        ranges: tuple[tuple[str, float, str], ...],
+        above_icon: str,
+    ) -> None:
+        """Compile table: (operator, limit, icon) ranges in ascending order."""
+        self.none_icon = none_icon  # Icon without value
+        self.keys = [(float(limit), _OPERATORS[op]) for op, limit, _icon in ranges]
+        self.icons = [icon for _op, _limit, icon in ranges]
+        self.icons.append(above_icon)  # Icon above the last limit
+        if self.keys != sorted(self.keys):
+            raise ValueError("Icon table limits not in ascending order")
+
+    def get_icon(self, value_state) -> str:
+        """Return icon for a value (ValueError when it is no number)."""
+        if value_state is None:
+            return self.none_icon
+        return self.icons[bisect_right(self.keys, (float(value_state), LESS))]
+
+
+def _constant(icon: str) -> IconTable:
+    """Icon table with one icon for all values."""
+    return IconTable(icon, (), icon)
+
+
+def _wind_direction_ranges() -> tuple[tuple[str, float, str], ...]:
+    """Ranges 0...1, 2...3, ... 14...15, other values show the compass."""
+    fallback = ICON_MAPPING["wind_direction"]["default"]
+    ranges: list[tuple[str, float, str]] = []
+    for number, arrow in enumerate(WIND_DIRECTION_ARROWS):
+        ranges.append(("<", 2 * number, fallback))
+        ranges.append(("<=", 2 * number + 1, arrow))
+    return tuple(ranges)
+
+
+# Icon tables of all measurement types
+# New measurement types only need a table here
+_TEMPERATURE = IconTable(
+    ICON_MAPPING["temperature"]["default"],
+    (
+        ("<=", 0, ICON_MAPPING["temperature"]["low"]),
+        ("<", 25, ICON_MAPPING["temperature"]["default"]),
+    ),
+    ICON_MAPPING["temperature"]["high"],
+)
+ICON_TABLES: dict[str, IconTable] = {
+    "temperature": _TEMPERATURE,
+    "temperature_probe": _TEMPERATURE,
+    "humidity": IconTable(
+        ICON_MAPPING["humidity"]["default"],
+        (
+            ("<=", 30, ICON_MAPPING["humidity"]["alert"]),
+            ("<", 65, ICON_MAPPING["humidity"]["default"]),
+        ),
+        ICON_MAPPING["humidity"]["alert"],
+    ),
+    "co2": _constant(ICON_MAPPING["co2"]["default"]),
+    "barometric_pressure": _constant(ICON_MAPPING["barometric_pressure"]["default"]),
+    # RSSI value for 868 MHz reception: range 0...255
+    "rssi": IconTable(
+        ICON_MAPPING["rssi"]["weak"],
+        (
+            ("<", 100, ICON_MAPPING["rssi"]["weak"]),
+            ("<", 150, ICON_MAPPING["rssi"]["middle"]),
+            ("<", 220, ICON_MAPPING["rssi"]["good"]),
+        ),
+        ICON_MAPPING["rssi"]["strong"],
+    ),
+    # Battery: 0 = good battery, 1 = low battery
+    "lowbatt": IconTable(
+        ICON_MAPPING["lowbatt"]["full"],
+        (
+            ("<", 1, ICON_MAPPING["lowbatt"]["full"]),
+            ("<=", 1, ICON_MAPPING["lowbatt"]["low"]),
+        ),
+        ICON_MAPPING["lowbatt"]["full"],
+    ),
+    "wind_direction": IconTable(
+        ICON_MAPPING["wind_direction"]["default"],
+        _wind_direction_ranges(),
+        ICON_MAPPING["wind_direction"]["default"],
+    ),
+    "wind_gust": _constant(ICON_MAPPING["wind"]["wind"]),
+    "wind_speed": _constant(ICON_MAPPING["wind"]["gust"]),
+    "rain": _constant(ICON_MAPPING["rain"]["moderate"]),
+    "dew_point": _constant(ICON_MAPPING["dew_point"]["default"]),
+    "absolute_humidity": _constant(ICON_MAPPING["absolute_humidity"]["default"]),
+    "heat_index": _constant(ICON_MAPPING["heat_index"]["default"]),
+    "wind_chill": _constant(ICON_MAPPING["wind_chill"]["default"]),
+    "beaufort": _constant(ICON_MAPPING["beaufort"]["default"]),
+    # Rain rate in mm/h: light < 2.5, moderate < 7.6, heavy above
+    "rain_rate": IconTable(
+        ICON_MAPPING["rain"]["none"],
+        (
+            ("<=", 0, ICON_MAPPING["rain"]["none"]),
+            ("<", 2.5, ICON_MAPPING["rain"]["light"]),
+            ("<", 7.6, ICON_MAPPING["rain"]["moderate"]),
+        ),
+        ICON_MAPPING["rain"]["heavy"],
+    ),
+}
+_UNKNOWN = _constant(ICON_UNKNOWN)
+
+
+def get_icon_table(measurement_type: str | None) -> IconTable:
+    """Return icon table of a measurement type (resolved once per entity)."""
+    return ICON_TABLES.get(measurement_type or "", _UNKNOWN)
+
+
+def get_icon(measurement_type: str | None, value_state) -> str:
+    """Return icon for a measurement type and value."""
+    return get_icon_table(measurement_type).get_icon(value_state)
+
+
+# ---- Station/sensor type of an ID, resolved once per sensor ----
+@dataclass(slots=True, frozen=True)
+class SensorType:
+    """Metadata of a station or sensor type (first 2 characters of the ID)."""
+
+    type_id: str
+    model: str  # e.g. "Sensor A1: Rain", "?" when unknown
+    timeout: int  # Seconds until values are old, 0 when unknown
+    interval: int  # Transmission interval in seconds, 0 when unknown
+    is_station: bool  # Stations (type < "A0") have a web interface
+
+
+def _sensor_type(type_id: str) -> SensorType:
+    """Build metadata of a type."""
+    try:
+        is_station = int(type_id, 16) < 0xA0
+    except ValueError:
+        is_station = False
+    return SensorType(
+        type_id=type_id,
+        model=DEVICE_MAPPING.get(type_id, "?"),
+        timeout=TIMEOUT_MAPPING.get(type_id, 0),
+        interval=TRANSMIT_MAPPING.get(type_id, 0),
+        is_station=is_station,
+    )
+
+
+SENSOR_TYPES: dict[str, SensorType] = {
+    type_id: _sensor_type(type_id) for type_id in DEVICE_MAPPING
+}
+
+
+def get_sensor_type(sensor_id: str) -> SensorType:
+    """Return metadata for a station/sensor ID (unknown types are added)."""
+    type_id = sensor_id[:2].upper()
+    sensor_type = SENSOR_TYPES.get(type_id)
+    if sensor_type is None:
+        sensor_type = SENSOR_TYPES[type_id] = _sensor_type(type_id)
+    return sensor_type
@@ -0,0 +1,148 @@
+"""TFA.me station integration: metrics.py."""
+
+from array import array
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass
+import time
+
+from .const import METRICS_FAILURES, METRICS_WINDOW
+
+# Phases of one poll
+PHASE_DNS = "dns"  # mDNS lookup (cached in resolver.py)
+PHASE_CONNECT = "connect"  # New TCP connection, 0 when a pooled one is used
+PHASE_TRANSFER = "transfer"  # Request sent until reply received, w/o parsing
+PHASE_DECODE = "decode"  # JSON decoding of the reply (stream.py)
+PHASE_PARSE = "parse"  # Update of the records (records.py)
+PHASE_DISPATCH = "dispatch"  # Entity updates & state writes
+PHASE_TOTAL = "total"  # Complete poll
+PHASES = (
+    PHASE_DNS,
+    PHASE_CONNECT,
+    PHASE_TRANSFER,
+    PHASE_DECODE,
+    PHASE_PARSE,
+    PHASE_DISPATCH,
+    PHASE_TOTAL,
+)
+
+
+# ---- Last values of one metric in a ring buffer ----
+class RollingStats:
+    """Rolling window of float values with percentiles."""
+
+    __slots__ = ("count", "last", "pos", "values")
+
+    def __init__(self, size: int = METRICS_WINDOW) -> None:
+        """Initialize empty window."""
+        self.values = array("d", bytes(8 * size))
+        self.pos = 0  # Next slot to write
+        self.count = 0  # Used slots
+        self.last: float | None = None
+
+    def add(self, value: float) -> None:
+        """Add a value, the oldest one is dropped when the window is full."""
+        self.values[self.pos] = value
+        self.pos = (self.pos + 1) % len(self.values)
+        self.count = min(self.count + 1, len(self.values))
+        self.last = value
+
+    def percentiles(
+        self, percents: tuple[int, ...] = (50, 95, 99)
+    ) -> tuple[float | None, ...]:
+        """Return percentiles (nearest rank) of the window with one sort."""
+        count = self.count
+        if count == 0:
+            return tuple(None for _ in percents)
+        ordered = sorted(self.values[:count])
+        # Rank = ceil(count * percent / 100), at least 1
+        return tuple(
+            ordered[max(1, -(-count * percent // 100)) - 1] for percent in percents
+        )
+
+    def histogram(
+        self, bounds: tuple[float, ...], scale: float = 1.0
+    ) -> dict[str, int]:
+        """Count values of the window per bucket "<= bound" and "> last bound"."""
+        counts = [0] * (len(bounds) + 1)
+        for value in self.values[: self.count]:
+            counts[bisect_left(bounds, value * scale)] += 1
+        histogram = {f"<={bound}": count for bound, count in zip(bounds, counts)}
+        histogram[f">{bounds[-1]}"] = counts[-1]
+        return histogram
+
+
+# ---- Timing of the poll running now ----
+@dataclass(slots=True)
+class PollTiming:
+    """Durations in seconds of the phases of one poll."""
+
+    dns: float = 0.0
+    connect: float = 0.0
+    transfer: float = 0.0
+    decode: float = 0.0
+    parse: float = 0.0
+    connect_start: float = 0.0  # perf_counter() at start of a new connection
+
+
+# ---- Metrics of one station ----
+class TFAmePollMetrics:
+    """Per-poll timings, payload size, counts and errors of one station."""
+
+    def __init__(self, size: int = METRICS_WINDOW) -> None:
+        """Initialize empty metrics."""
+        self.phases: dict[str, RollingStats] = {
+            phase: RollingStats(size) for phase in PHASES
+        }
+        self.payload_bytes = RollingStats(size)
+        self.polls = 0  # Polls & pushes
+        self.pushes = 0  # Data posted to the webhook (push mode)
+        self.errors = 0
+        # Replies equal to the last one (fingerprint or HTTP 304), not parsed
+        self.unchanged = 0
+        self.not_modified = 0  # Of them answered with HTTP 304
+        self.saved = 0.0  # Seconds of decoding & parsing saved (estimated)
+        # Refreshes which used a running poll or the last update (single
+        # flight, min. spacing) instead of a new request
+        self.coalesced = 0
+        self.spaced = 0
+        # State writes not done (deadband or replaced while delayed, state.py)
+        self.suppressed = 0
+        self.sensors = 0  # Stations/sensors in last reply
+        self.entities = 0  # Entities of the station
+        self.last_error: str | None = None
+        # Recent failed polls: (UTC timestamp, error)
+        self.failures: deque[tuple[float, str]] = deque(maxlen=METRICS_FAILURES)
+
+    def add_poll(self, timing: PollTiming, total: float, payload_bytes: int) -> None:
+        """Add timings of a successful poll."""
+        self.polls += 1
+        phases = self.phases
+        phases[PHASE_DNS].add(timing.dns)
+        phases[PHASE_CONNECT].add(timing.connect)
+        phases[PHASE_TRANSFER].add(timing.transfer)
+        phases[PHASE_DECODE].add(timing.decode)
+        phases[PHASE_PARSE].add(timing.parse)
+        phases[PHASE_TOTAL].add(total)
+        self.payload_bytes.add(payload_bytes)
+
+    def add_unchanged(self, saved: float) -> None:
+        """Count a reply which was not parsed, it equals the last one."""
+        self.unchanged += 1
+        self.saved += saved
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of polls & pushes with unchanged data in %."""
+        return round(100 * self.unchanged / self.polls, 1) if self.polls else 0.0
+
+    def add_error(self, error: str) -> None:
+        """Count a failed poll."""
+        self.polls += 1
+        self.errors += 1
+        self.last_error = error
+        self.failures.append((time.time(), error))
+
+    def add_dispatch(self, duration: float) -> None:
+        """Add time of the entity updates after a poll."""
+        self.phases[PHASE_DISPATCH].add(duration)
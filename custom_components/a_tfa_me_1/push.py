@@ -0,0 +1,51 @@
+"""TFA.me station integration: push.py."""
+
+from functools import partial
+from http import HTTPStatus
+import logging
+
+from aiohttp import web
+
+from homeassistant.components import webhook
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+from .coordinator import TFAmeDataCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# ---- Push mode: station or relay posts '/sensors' data to a webhook ----
+@callback
+def async_register_push(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: TFAmeDataCoordinator
+) -> None:
+    """Register the webhook of a station, unregistered on unload."""
+    webhook_id = entry.options[CONF_WEBHOOK_ID]
+
+    async def _handle_push(
+        hass: HomeAssistant, webhook_id: str, request: web.Request
+    ) -> web.Response:
+        """Parse posted data like a poll reply."""
+        try:
+            await coordinator.async_push(request.content)
+        except ValueError as error:
+            _LOGGER.warning(str(error))
+            return web.Response(status=HTTPStatus.BAD_REQUEST, text=str(error))
+        return web.Response(status=HTTPStatus.OK)
+
+    webhook.async_register(
+        hass,
+        DOMAIN,
+        entry.title,
+        webhook_id,
+        _handle_push,
+        local_only=True,  # Station or relay in the local network
+        allowed_methods=("POST", "PUT"),
+    )
+    entry.async_on_unload(partial(webhook.async_unregister, hass, webhook_id))
+
+    msg: str = "Push data to " + webhook.async_generate_path(webhook_id)
+    _LOGGER.info(msg)
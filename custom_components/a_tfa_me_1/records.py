@@ -0,0 +1,357 @@
+"""TFA.me station integration: records.py."""
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from .lookup import get_sensor_type
+
+
+@dataclass(slots=True)
+class SensorRecord:
+    """Data of one sensor/station, shared by all its measurement records."""
+
+    sensor_id: str
+    gateway_id: str
+    name: str
+    timestamp: str  # UTC time string, e.g. "2025-03-06T08:46:01Z"
+    ts: int  # Time stamp of last transmission
+    timeout: int  # Seconds until values are old, see TIMEOUT_MAPPING
+    interval: int  # Transmission interval in seconds, see TRANSMIT_MAPPING
+    generation: int = 0  # Poll which reported the sensor last
+    # Derived measurement -> entity ID of the sensor (derived.py)
+    derived: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class MeasurementRecord:
+    """One measurement of a sensor, this is the data of one entity."""
+
+    sensor: SensorRecord
+    measurement: str  # e.g. "temperature"
+    suffix: str  # "" or for rain entities " rel", " hour", " 24h", ...
+    value: Any
+    unit: str | None
+    reset_rain: bool = False
+    generation: int = 0  # Poll which reported the measurement last
+    derived: bool = False  # Calculated from other measurements (derived.py)
+
+    @property
+    def sensor_id(self) -> str:
+        """Sensor ID, e.g. "a01234456"."""
+        return self.sensor.sensor_id
+
+    @property
+    def gateway_id(self) -> str:
+        """Gateway (station) ID which received the sensor."""
+        return self.sensor.gateway_id
+
+    @property
+    def sensor_name(self) -> str:
+        """Sensor name with suffix, e.g. "A01234456 rel"."""
+        return self.sensor.name + self.suffix
+
+    @property
+    def timestamp(self) -> str:
+        """UTC time string of last transmission."""
+        return self.sensor.timestamp
+
+    @property
+    def ts(self) -> int:
+        """Time stamp of last transmission."""
+        return self.sensor.ts
+
+
+# Entity ID suffix and name suffix of the entities of one measurement
+NO_SUFFIX = (("", ""),)
+RAIN_SUFFIXES = (
+    ("", ""),
+    ("_rel", " rel"),
+    ("_hour", " hour"),
+    ("_24h", " 24h"),
+    ("_7d", " 7d"),
+    ("_today", " today"),
+)
+# Rain of a time window, calculated by the coordinator (history.py)
+RAIN_WINDOW_SUFFIXES = frozenset((" hour", " 24h", " 7d", " today"))
+
+
+# ---- Records of one station, updated in place with every poll ----
+class TFAmeRecordStore:
+    """Keep one record per entity and one shared record per sensor.
+
+    A poll is 'begin()', 'add_sensor()' for every sensor of the reply (this
+    allows to feed sensors while the reply is still received) and 'finish()'.
+    Derived measurements of the changed sensors are set after 'finish()' with
+    'set_derived()' and 'finish_derived()', they are stale and removed
+    together with their sensor.
+    """
+
+    def __init__(self, multiple_entities: bool) -> None:
+        """Initialize empty store."""
+        self.multiple_entities = multiple_entities
+        self.gateway_id = ""
+        self.sensors: dict[str, SensorRecord] = {}  # Key: sensor ID
+        self.records: dict[str, MeasurementRecord] = {}  # Key: entity ID
+        self.stale_entities: set[str] = set()
+        # Sensors with a measurement gone in the last poll, their derived
+        # measurements are calculated again
+        self.inputs_removed: set[str] = set()
+        self._derived = 0  # Number of derived records
+        # State of running poll
+        self._generation = 0
+        self._seen_records = 0
+        self._seen_sensors = 0
+        self._changed: set[str] = set()
+        self._stale: set[str] = set()
+        self._reset_rain = False
+        self._now_ts = 0
+
+    def update(self, json_data: dict, reset_rain: bool, now_ts: int) -> set[str]:
+        """Update records from a decoded '/sensors' reply, return changed IDs."""
+        self.begin(json_data.get("gateway_id", "tfame"), reset_rain, now_ts)
+        for sensor in json_data.get("sensors", []):
+            self.add_sensor(sensor)
+        return self.finish()
+
+    def begin(self, gateway_id: str, reset_rain: bool, now_ts: int) -> None:
+        """Start a poll."""
+        self.gateway_id = gateway_id.lower()
+        self._generation += 1
+        self._seen_records = 0
+        self._seen_sensors = 0
+        # Changes of a poll which failed before 'finish()' are kept
+        self._stale = set()
+        self._reset_rain = reset_rain
+        self._now_ts = now_ts
+
+    def add_sensor(self, sensor: dict) -> None:
+        """Update the records of one sensor of the reply."""
+        gateway_id = self.gateway_id
+        generation = self._generation
+        changed = self._changed
+        old_stale = self.stale_entities
+        records = self.records
+
+        sensor_id = sensor["sensor_id"]
+        ts = sensor["ts"]
+        self._seen_sensors += 1
+
+        info = self.sensors.get(sensor_id)
+        if info is None:
+            sensor_type = get_sensor_type(sensor_id)
+            info = SensorRecord(
+                sensor_id=sensor_id,
+                gateway_id=gateway_id,
+                name=sensor["name"],
+                timestamp=sensor.get("timestamp", "unknown"),
+                ts=ts,
+                timeout=sensor_type.timeout,
+                interval=sensor_type.interval,
+                generation=generation,
+            )
+            self.sensors[sensor_id] = info
+            sensor_changed = True
+        else:
+            sensor_changed = info.ts != ts
+            if sensor_changed:
+                info.ts = ts
+                info.timestamp = sensor.get("timestamp", "unknown")
+                info.name = sensor["name"]
+            info.generation = generation
+
+        is_stale = (self._now_ts - int(ts)) > info.timeout
+        if is_stale and info.derived:
+            self._stale.update(info.derived.values())
+
+        for measurement, values in sensor.get("measurements", {}).items():
+            entity_id = self.entity_id(gateway_id, sensor_id, measurement)
+            if measurement == "rain":
+                entity_ids = RAIN_SUFFIXES
+                rain_reset = self._reset_rain
+            else:
+                entity_ids = NO_SUFFIX
+                rain_reset = False
+
+            for id_suffix, suffix in entity_ids:
+                ent_id = entity_id + id_suffix
+                self._seen_records += 1
+                if is_stale:
+                    self._stale.add(ent_id)
+
+                record = records.get(ent_id)
+                if record is None:
+                    records[ent_id] = MeasurementRecord(
+                        sensor=info,
+                        measurement=measurement,
+                        suffix=suffix,
+                        value=values["value"],
+                        unit=values["unit"],
+                        reset_rain=rain_reset and suffix != "",
+                        generation=generation,
+                    )
+                    changed.add(ent_id)
+                    continue
+
+                # Update values in place
+                record.generation = generation
+                record.value = values["value"]
+                record.unit = values["unit"]
+                if suffix:
+                    record.reset_rain = rain_reset
+                if (
+                    sensor_changed
+                    or (rain_reset and suffix != "")
+                    or is_stale != (ent_id in old_stale)
+                ):
+                    changed.add(ent_id)
+
+    def finish(self) -> set[str]:
+        """End a poll, return changed entity IDs.
+
+        An entity has changed when it is new, its "ts" moved, it went stale or
+        became valid again, a rain reset is pending or it is gone.
+        """
+        generation = self._generation
+        inputs_removed: set[str] = set()
+
+        # Entities and sensors no longer reported by the station
+        if self._seen_records + self._derived != len(self.records):
+            for ent_id, record in list(self.records.items()):
+                if record.generation != generation and not record.derived:
+                    del self.records[ent_id]
+                    self._changed.add(ent_id)
+                    inputs_removed.add(record.sensor_id)
+        if self._seen_sensors != len(self.sensors):
+            for sensor_id, info in list(self.sensors.items()):
+                if info.generation != generation:
+                    del self.sensors[sensor_id]
+                    for ent_id in info.derived.values():
+                        del self.records[ent_id]
+                        self._changed.add(ent_id)
+                    self._derived -= len(info.derived)
+
+        self.stale_entities = self._stale
+        self.inputs_removed = inputs_removed
+        changed = self._changed
+        self._changed = set()
+        return changed
+
+    def set_derived(
+        self, sensor: SensorRecord, measurement: str, value: Any, unit: str | None
+    ) -> tuple[str, bool]:
+        """Set a derived measurement of a sensor, return entity ID and if changed."""
+        ent_id = sensor.derived.get(measurement)
+        if ent_id is None:
+            ent_id = self.entity_id(sensor.gateway_id, sensor.sensor_id, measurement)
+            sensor.derived[measurement] = ent_id
+        record = self.records.get(ent_id)
+        if record is not None and not record.derived:
+            del sensor.derived[measurement]  # Reported by the station itself
+            return ent_id, False
+        # Stale like the measurements of its sensor
+        if (self._now_ts - int(sensor.ts)) > sensor.timeout:
+            self.stale_entities.add(ent_id)
+        else:
+            self.stale_entities.discard(ent_id)
+        if record is None:
+            self.records[ent_id] = MeasurementRecord(
+                sensor=sensor,
+                measurement=measurement,
+                suffix="",
+                value=value,
+                unit=unit,
+                generation=self._generation,
+                derived=True,
+            )
+            self._derived += 1
+            return ent_id, True
+        record.generation = self._generation
+        if record.value == value and record.unit == unit:
+            return ent_id, False
+        record.value = value
+        record.unit = unit
+        return ent_id, True
+
+    def finish_derived(self, sensors: Iterable[SensorRecord]) -> set[str]:
+        """End derived measurements of changed sensors, return removed IDs.
+
+        Derived records of these sensors not set in this poll are removed (an
+        input measurement is gone).
+        """
+        generation = self._generation
+        removed: set[str] = set()
+        for sensor in sensors:
+            derived = sensor.derived
+            for measurement, ent_id in list(derived.items()):
+                if self.records[ent_id].generation != generation:
+                    del self.records[ent_id]
+                    del derived[measurement]
+                    removed.add(ent_id)
+        self._derived -= len(removed)
+        self.stale_entities -= removed
+        return removed
+
+    def remove_derived(self, sensor: SensorRecord, measurement: str) -> str | None:
+        """Remove one derived measurement of a sensor, return removed ID."""
+        ent_id = sensor.derived.pop(measurement, None)
+        if ent_id is not None:
+            del self.records[ent_id]
+            self._derived -= 1
+            self.stale_entities.discard(ent_id)
+        return ent_id
+
+    def expire(self, entity_ids: Iterable[str], now_ts: int) -> set[str]:
+        """Mark entities stale when too old at 'now_ts', return newly stale IDs."""
+        stale = self.stale_entities
+        changed: set[str] = set()
+        for ent_id in entity_ids:
+            record = self.records.get(ent_id)
+            if (
+                record is not None
+                and ent_id not in stale
+                and (now_ts - int(record.sensor.ts)) > record.sensor.timeout
+            ):
+                changed.add(ent_id)
+        if changed:
+            self.stale_entities = stale | changed
+        return changed
+
+    def as_reply(self) -> dict[str, Any]:
+        """Return the records in the format of a '/sensors' reply."""
+        sensors: dict[str, dict[str, Any]] = {}
+        for record in self.records.values():
+            if record.suffix or record.derived:
+                continue  # Rain "rel" & "hour" and derived entities
+            info = record.sensor
+            sensor = sensors.get(info.sensor_id)
+            if sensor is None:
+                sensor = sensors[info.sensor_id] = {
+                    "sensor_id": info.sensor_id,
+                    "name": info.name,
+                    "timestamp": info.timestamp,
+                    "ts": info.ts,
+                    "measurements": {},
+                }
+            sensor["measurements"][record.measurement] = {
+                "value": record.value,
+                "unit": record.unit,
+            }
+        return {"gateway_id": self.gateway_id, "sensors": list(sensors.values())}
+
+    def refresh(self, now_ts: int) -> set[str]:
+        """Same reply as last poll, return entity IDs which went stale now."""
+        stale = {
+            ent_id
+            for ent_id, record in self.records.items()
+            if (now_ts - int(record.sensor.ts)) > record.sensor.timeout
+        }
+        changed = stale ^ self.stale_entities
+        self.stale_entities = stale
+        return changed
+
+    def entity_id(self, gateway_id: str, sensor_id: str, measurement: str) -> str:
+        """Entity ID of a measurement."""
+        if self.multiple_entities:
+            return f"sensor.{gateway_id}_{sensor_id}_{measurement}"
+        return f"sensor.{sensor_id}_{measurement}"
@@ -0,0 +1,129 @@
+"""TFA.me station integration: resolver.py."""
+
+import asyncio
+from dataclasses import dataclass
+import logging
+import socket
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .const import MDNS_RETRY, MDNS_TIMEOUT, MDNS_TTL
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class ResolvedHost:
+    """Cached result of a lookup."""
+
+    ip: str
+    expires: float  # time.monotonic() when IP should be resolved again
+    resolved: float  # time.time() of last successful lookup
+
+
+# ---- Non-blocking, cached mDNS resolver ----
+class TFAmeResolver:
+    """Resolve 'tfa-me-XXX-XXX-XXX.local' names in the executor and cache the IP.
+
+    - Valid cache entry: IP is returned without lookup (hit)
+    - Expired cache entry: old IP is returned, lookup runs in the background
+    - No cache entry: lookup is awaited (miss)
+    - Failed lookup: last known IP is used, else the name itself
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        ttl: float = MDNS_TTL,
+        retry: float = MDNS_RETRY,
+        timeout: float = MDNS_TIMEOUT,
+    ) -> None:
+        """Initialize resolver."""
+        self.hass = hass
+        self.ttl = ttl
+        self.retry = retry
+        self.timeout = timeout
+        self.cache: dict[str, ResolvedHost] = {}
+        self._pending: dict[str, asyncio.Task[str]] = {}
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.failures = 0
+        self.last_error: str | None = None
+
+    async def async_resolve(self, host_str: str) -> str:
+        """Return IP for a host name."""
+        cached = self.cache.get(host_str)
+        if cached is not None:
+            self.hits += 1
+            if time.monotonic() >= cached.expires and host_str not in self._pending:
+                # Serve last IP now, re-resolve in background
+                self.refreshes += 1
+                self._start_lookup(host_str)
+            return cached.ip
+
+        self.misses += 1
+        task = self._pending.get(host_str) or self._start_lookup(host_str)
+        return await asyncio.shield(task)
+
+    def _start_lookup(self, host_str: str) -> asyncio.Task[str]:
+        """Start one lookup task per host name."""
+        task = self.hass.async_create_background_task(
+            self._async_lookup(host_str), name=f"tfa_me resolve {host_str}"
+        )
+        self._pending[host_str] = task
+        return task
+
+    async def _async_lookup(self, host_str: str) -> str:
+        """Resolve name in executor, update cache."""
+        try:
+            async with asyncio.timeout(self.timeout):
+                ip = await self.hass.async_add_executor_job(
+                    socket.gethostbyname, host_str
+                )
+        except (OSError, TimeoutError) as error:
+            self.failures += 1
+            self.last_error = f"{host_str}: {error!r}"
+            msg: str = "Cannot resolve '" + host_str + "': " + repr(error)
+            _LOGGER.debug(msg)
+            cached = self.cache.get(host_str)
+            if cached is None:
+                return host_str  # Error, just return original string
+            # Keep last known IP, try again later
+            cached.expires = time.monotonic() + self.retry
+            return cached.ip
+        else:
+            self.cache[host_str] = ResolvedHost(
+                ip=ip, expires=time.monotonic() + self.ttl, resolved=time.time()
+            )
+            return ip
+        finally:
+            self._pending.pop(host_str, None)
+
+    def stats(self) -> dict[str, Any]:
+        """Return statistics and cache state."""
+        now = time.monotonic()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "cache": {
+                name: {
+                    "ip": entry.ip,
+                    "resolved": entry.resolved,
+                    "expires_in": round(entry.expires - now, 1),
+                }
+                for name, entry in self.cache.items()
+            },
+        }
+
+    async def async_shutdown(self) -> None:
+        """Cancel running lookups."""
+        for task in list(self._pending.values()):
+            task.cancel()
+        self._pending.clear()
@@ -0,0 +1,70 @@
+"""TFA.me station integration: scheduler.py."""
+
+from collections.abc import Iterable
+
+from .const import ADAPTIVE_MARGIN, ADAPTIVE_MAX_INTERVAL, ADAPTIVE_MIN_INTERVAL
+from .records import SensorRecord
+
+
+# ---- Adaptive poll interval from sensor transmission intervals ----
+class TFAmeAdaptiveScheduler:
+    """Calculate the delay until the next poll of a station.
+
+    - Next poll: shortly after the next expected "ts" of all valid sensors
+    - Nothing due: back off up to the longest interval
+    - Missed transmission (sensor late, not yet stale): poll again soon, the
+      delay doubles with every poll without the expected update
+    - Request error: retry soon, the delay doubles with every error
+    """
+
+    def __init__(
+        self,
+        min_interval: float = ADAPTIVE_MIN_INTERVAL,
+        max_interval: float = ADAPTIVE_MAX_INTERVAL,
+        margin: float = ADAPTIVE_MARGIN,
+    ) -> None:
+        """Initialize scheduler."""
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.margin = margin
+        self.errors = 0  # Errors in a row
+        self.misses = 0  # Polls in a row with a missed transmission
+        self.last_delay: float = min_interval
+
+    def _clamp(self, delay: float) -> float:
+        """Limit delay to min/max interval."""
+        self.last_delay = max(self.min_interval, min(self.max_interval, delay))
+        return self.last_delay
+
+    def _backoff(self, count: int) -> float:
+        """Delay for a retry, doubles with every try."""
+        return self.min_interval * (2 ** min(count - 1, 16))
+
+    def next_delay(self, sensors: Iterable[SensorRecord], now_ts: float) -> float:
+        """Return seconds until next poll after a successful request."""
+        self.errors = 0
+        next_due: float | None = None
+        missed = False
+
+        for info in sensors:
+            if info.interval <= 0:
+                continue  # Unknown sensor type
+            expected = info.ts + info.interval + self.margin
+            if expected > now_ts:
+                if next_due is None or expected < next_due:
+                    next_due = expected
+            elif now_ts - info.ts <= info.timeout:
+                missed = True  # Late, but not stale yet
+
+        delay = self.max_interval if next_due is None else next_due - now_ts
+        if missed:
+            self.misses += 1
+            delay = min(delay, self._backoff(self.misses))
+        else:
+            self.misses = 0
+        return self._clamp(delay)
+
+    def error_delay(self) -> float:
+        """Return seconds until next poll after a failed request."""
+        self.errors += 1
+        return self._clamp(self._backoff(self.errors))
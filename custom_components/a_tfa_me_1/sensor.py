@@ -1,114 +1,157 @@
 """TFA.me station integration: sensor.py."""
 
-from collections import deque
-from datetime import datetime
+from collections.abc import Callable
+from dataclasses import dataclass
 import logging
+import time
 from typing import Any
 
-from homeassistant.components.sensor import SensorEntity, StateType
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+    StateType,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import TFAmeDataCoordinator
-
-# Used icons for entities, see also
-# https://pictogrammers.com/library/mdi/
-ICON_MAPPING = {
-    "temperature": {
-        "default": "mdi:thermometer",
-        "high": "mdi:thermometer-high",
-        "low": "mdi:thermometer-low",
-    },
-    "humidity": {"default": "mdi:water-percent", "alert": "mdi:water-percent-alert"},
-    "co2": {"default": "mdi:molecule-co2"},
-    "barometric_pressure": {"default": "mdi:gauge"},
-    "rssi": {
-        "default": "mdi:wifi",
-        "weak": "mdi:wifi-strength-1",
-        "middle": "mdi:wifi-strength-2",
-        "good": "mdi:wifi-strength-3",
-        "strong": "mdi:wifi-strength-4",
-    },
-    "lowbatt": {
-        "default": "mdi:battery",
-        "low": "mdi:battery-alert",
-        "full": "mdi:battery",
-    },
-    "wind_direction": {"default": "mdi:compass-outline"},
-    "wind": {
-        "default": "mdi:weather-windy",
-        "wind": "mdi:weather-windy-variant",
-        "gust": "mdi:weather-windy",
-    },
-    "rain": {
-        "none": "mdi:weather-sunny",
-        "light": "mdi:weather-partly-rainy",
-        "moderate": "mdi:weather-rainy",
-        "heavy": "mdi:weather-pouring",
-    },
-}
-
-# Short description of all stations & sensors
-DEVICE_MAPPING = {
-    # Stations
-    "01": "Station 01: T/H",
-    "02": "Station 02: T/H",
-    "03": "Station 03: T/H",
-    "04": "Station 04: T/H",
-    "05": "Station 05: T/H/BP",
-    "06": "Station 06: T/H",
-    "07": "Station 07: T/H",
-    "08": "Station 08: T/H",
-    # Add other stations here ...
-    # Debug station ID
-    "99": "Station 99: T/H/BP/CO2",
-    # Sensors
-    "A0": "Sensor A0: T/H",
-    "A1": "Sensor A1: Rain",
-    "A2": "Sensor A2: Wind: D/W/G",
-    "A3": "Sensor A3: T/TP",
-    "A4": "Sensor Prof. A4: T/H/TP",
-    "A5": "Sensor A5: T",
-    "A6": "Sensor Prof. A6: T/H",
-    # Add other sensors here ...
-}
-
-# Timeout time use sensor marked "old"/unavailable
-# Rule: Timeout time = 2 * (transmission interval in seconds) + 30
-TIMEOUT_FOR_1_MIN = (2 * 1 * 60) + 30
-TIMEOUT_FOR_5_MIN = (2 * 5 * 60) + 30
-TIMEOUT_FOR_120_MIN = (2 * 120 * 60) + 30
-
-TIMEOUT_MAPPING = {
-    # Stations
-    "01": TIMEOUT_FOR_5_MIN,
-    "02": TIMEOUT_FOR_5_MIN,
-    "03": TIMEOUT_FOR_5_MIN,
-    "04": TIMEOUT_FOR_5_MIN,
-    "05": TIMEOUT_FOR_5_MIN,
-    "06": TIMEOUT_FOR_5_MIN,
-    "07": TIMEOUT_FOR_5_MIN,
-    "08": TIMEOUT_FOR_5_MIN,
-    # Add other stations here ...
-    # Debug station ID
-    "99": TIMEOUT_FOR_5_MIN,
-    # Sensors
-    "A0": TIMEOUT_FOR_5_MIN,  # Sensor A0: T/H
-    "A1": TIMEOUT_FOR_120_MIN,  # Sensor A1: Rain
-    "A2": TIMEOUT_FOR_5_MIN,  # Sensor A2: Wind: D/W/G
-    "A3": TIMEOUT_FOR_5_MIN,  # Sensor A3: T/TP
-    "A4": TIMEOUT_FOR_1_MIN,  # Sensor Prof. A4: T/H/TP
-    "A5": TIMEOUT_FOR_5_MIN,  # Sensor A5: T
-    "A6": TIMEOUT_FOR_1_MIN,  # Sensor Prof. A6: T/H
-    # Add other sensors here ...
-}
+from .lookup import get_sensor_type
+from .metrics import (
+    PHASE_CONNECT,
+    PHASE_DECODE,
+    PHASE_DISPATCH,
+    PHASE_DNS,
+    PHASE_PARSE,
+    PHASE_TOTAL,
+    PHASE_TRANSFER,
+    RollingStats,
+    TFAmePollMetrics,
+)
+from .state import TFAmeEntityState, TFAmePublishFilter
 
 _LOGGER = logging.getLogger(__name__)
 
 
+# ---- Diagnostic sensors of the poll metrics (metrics.py) ----
+@dataclass(frozen=True, kw_only=True)
+class TFAmeMetricDescription(SensorEntityDescription):
+    """Poll metric shown as diagnostic sensor."""
+
+    value_fn: Callable[[TFAmePollMetrics], StateType]
+    attributes_fn: Callable[[TFAmePollMetrics], dict[str, Any]] | None = None
+
+
+def _stats_attributes(stats: RollingStats, scale: float) -> dict[str, Any]:
+    """Rolling p50/p95/p99 and last value."""
+    attributes: dict[str, Any] = {
+        f"p{percent}": None if value is None else round(value * scale, 2)
+        for percent, value in zip((50, 95, 99), stats.percentiles(), strict=True)
+    }
+    attributes["last"] = None if stats.last is None else round(stats.last * scale, 2)
+    attributes["samples"] = stats.count
+    return attributes
+
+
+def _p95_ms(stats: RollingStats) -> float | None:
+    """Rolling p95 of a duration in ms."""
+    value = stats.percentiles((95,))[0]
+    return None if value is None else round(value * 1000, 2)
+
+
+def _phase_description(
+    phase: str, label: str, enabled: bool = False
+) -> TFAmeMetricDescription:
+    """Duration of a poll phase: state is the p95 in ms."""
+    return TFAmeMetricDescription(
+        key=f"poll_{phase}",
+        entity_registry_enabled_default=enabled,
+        name=f"Poll {label} p95",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda metrics: _p95_ms(metrics.phases[phase]),
+        attributes_fn=lambda metrics: _stats_attributes(metrics.phases[phase], 1000),
+    )
+
+
+METRIC_DESCRIPTIONS: tuple[TFAmeMetricDescription, ...] = (
+    _phase_description(PHASE_TOTAL, "time", enabled=True),
+    _phase_description(PHASE_DNS, "DNS"),
+    _phase_description(PHASE_CONNECT, "connect"),
+    _phase_description(PHASE_TRANSFER, "transfer"),
+    _phase_description(PHASE_DECODE, "decode"),
+    _phase_description(PHASE_PARSE, "parse"),
+    _phase_description(PHASE_DISPATCH, "dispatch"),
+    TFAmeMetricDescription(
+        key="poll_payload",
+        entity_registry_enabled_default=False,
+        name="Poll payload",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: metrics.payload_bytes.last,
+        attributes_fn=lambda metrics: _stats_attributes(metrics.payload_bytes, 1),
+    ),
+    TFAmeMetricDescription(
+        key="poll_sensors",
+        entity_registry_enabled_default=False,
+        name="Poll sensors",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: metrics.sensors,
+    ),
+    TFAmeMetricDescription(
+        key="poll_entities",
+        entity_registry_enabled_default=False,
+        name="Poll entities",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: metrics.entities,
+    ),
+    TFAmeMetricDescription(
+        key="poll_errors",
+        name="Poll errors",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.errors,
+        attributes_fn=lambda metrics: {
+            "polls": metrics.polls,
+            "pushes": metrics.pushes,
+            "last_error": metrics.last_error,
+        },
+    ),
+    TFAmeMetricDescription(
+        key="poll_unchanged",
+        entity_registry_enabled_default=False,
+        name="Poll unchanged",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.unchanged,
+        attributes_fn=lambda metrics: {
+            "hit_rate": metrics.hit_rate,
+            "not_modified": metrics.not_modified,
+            "cpu_saved_ms": round(metrics.saved * 1000, 1),
+        },
+    ),
+    TFAmeMetricDescription(
+        key="poll_coalesced",
+        entity_registry_enabled_default=False,
+        name="Poll requests coalesced",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.coalesced + metrics.spaced,
+        attributes_fn=lambda metrics: {
+            "running_poll": metrics.coalesced,
+            "min_spacing": metrics.spaced,
+        },
+    ),
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,  # TFAmeConfigEntry,
@@ -124,15 +167,20 @@ async def async_setup_entry(
         # Collect all entities (entities are part of device)
         sensors_start = []
         for entity_id in coordinator.data:
-            sensor_id = coordinator.data[entity_id]["sensor_id"]
-            if entity_id not in coordinator.sensor_entity_list:
+            sensor_id = coordinator.data[entity_id].sensor_id
+            if entity_id not in coordinator.entity_index:
                 sensors_start.append(
                     TFAmeSensorEntity(coordinator, sensor_id, entity_id)
                 )
-                coordinator.sensor_entity_list.append(entity_id)
 
-        # Add all entities
-        async_add_entities(sensors_start, True)
+        # Add all entities, state is pushed by coordinator (no update before add)
+        async_add_entities(sensors_start)
+
+        # Diagnostic sensors of the poll metrics of this station
+        async_add_entities(
+            TFAmeMetricEntity(coordinator, description)
+            for description in METRIC_DESCRIPTIONS
+        )
 
     except Exception as error:
         raise ConfigEntryNotReady(
@@ -146,10 +194,9 @@ async def async_setup_entry(
 
         new_sensors = []
         for entity_id in coordinator.data:
-            sensor_id = coordinator.data[entity_id]["sensor_id"]
-            if entity_id not in coordinator.sensor_entity_list:
+            sensor_id = coordinator.data[entity_id].sensor_id
+            if entity_id not in coordinator.entity_index:
                 new_sensors.append(TFAmeSensorEntity(coordinator, sensor_id, entity_id))
-                coordinator.sensor_entity_list.append(entity_id)
 
         if new_sensors:
             async_add_entities(new_sensors)
@@ -161,8 +208,15 @@ async def async_setup_entry(
 
 
 # ---- TFA.me sensor entity ----
-class TFAmeSensorEntity(SensorEntity):
-    """Represents in Home Assistant a single measurement of a sensor."""
+class TFAmeSensorEntity(CoordinatorEntity[TFAmeDataCoordinator], SensorEntity):
+    """Represents in Home Assistant a single measurement of a sensor.
+
+    No polling: coordinator pushes state once per update (see
+    _handle_coordinator_update).
+    """
+
+    # Change often, not worth a new attributes row in the recorder
+    _unrecorded_attributes = frozenset({"timestamp", "icon", "suppressed_writes"})
 
     def __init__(
         self,
@@ -171,14 +225,15 @@ class TFAmeSensorEntity(SensorEntity):
         entity_id: str,
     ) -> None:
         """Initialize sensor entity."""
-        self.coordinator = coordinator
+        super().__init__(coordinator)
         self.host = coordinator.host
         self.multiple_entities = coordinator.multiple_entities
         # self.gateway_id = gateway_id
         self.entity_id = entity_id
-        self.gateway_id = self.coordinator.data[self.entity_id]["gateway_id"]
+        self.gateway_id = self.coordinator.data[self.entity_id].gateway_id
         self.sensor_id = sensor_id
-        self._attr_icon = ""
+        # Station/sensor type, resolved once
+        self.sensor_type = get_sensor_type(sensor_id)
         self._attr_unique_id = entity_id  # just the entity ID
         self._attr_name = entity_id  # just the entity ID
         ids_str = f"{sensor_id}_{self.gateway_id}"
@@ -193,49 +248,43 @@ class TFAmeSensorEntity(SensorEntity):
                 self.sensor_id, self.gateway_id, self.multiple_entities
             ),  # 'TFA.me XXX-XXX-XXX'
             "manufacturer": "TFA/Dostmann",
-            "model": self.format_string_tfa_type(sensor_id),  # 'Sensor/Station type XX'
+            "model": self.sensor_type.model,  # 'Sensor/Station type XX'
             # "sw_version": "1.0",
             # "hw_version": "1.0",
             # "serial_number": "123"
         }
-        # History
-        self.rain_history: SensorHistory = SensorHistory(max_age_minutes=60)
+        # Availability of last state write
+        self.written_available = True
+        # Deadband & min. interval of state writes, delayed write
+        self.publish_filter = TFAmePublishFilter(
+            self.coordinator.data[self.entity_id].measurement
+        )
+        self._unsub_publish: CALLBACK_TYPE | None = None
 
         # When this is a station add URL to station
-        hex_value = int(sensor_id[:2], 16)
-        if hex_value < 160:
+        if self.sensor_type.is_station:
             self._attr_device_info["configuration_url"] = (
                 f"http://{coordinator.host}/ha_menu"
             )
 
-        # Add icon for measurement
-        self.measure_name = self.coordinator.data[self.entity_id]["measurement"]
-        self.init_measure_value = self.coordinator.data[self.entity_id]["value"]
-
-        self._attr_icon = self.get_icon(
-            self.measure_name, float(self.init_measure_value)
+        # Value, icon, name & attributes, calculated once per poll
+        self.measure_name = self.coordinator.data[self.entity_id].measurement
+        self.entity_state = TFAmeEntityState(
+            entity_id, self.coordinator.data[self.entity_id]
         )
 
+        # Register in index of coordinator
+        coordinator.entity_index.add(entity_id, sensor_id, self.measure_name, self)
+
     # ---- String helper for sensor names ----
-    def format_string_tfa_id(self, s: str, gw_id: str, multiple_entities: bool):
+    @staticmethod
+    def format_string_tfa_id(s: str, gw_id: str, multiple_entities: bool):
         """Convert string 'xxxxxxxxx' into 'TFA.me XXX-XXX-XXX'."""
         if multiple_entities:
             return f"TFA.me {s[:3].upper()}-{s[3:6].upper()}-{s[6:].upper()}({gw_id.upper()})"
         # else:
         return f"TFA.me {s[:3].upper()}-{s[3:6].upper()}-{s[6:].upper()}"
 
-    # ---- String helper for sensor/station types ----
-    def format_string_tfa_type(self, s: str):
-        """Convert string 'xxxxxxxxx' into 'Sensor/station type XX'."""
-
-        type_id: str = (s[:2]).upper()
-        info_str: str = "?"
-        try:
-            info_str = DEVICE_MAPPING[type_id]
-        except KeyError:
-            info_str = "?"
-        return info_str
-
     # ---- Property: Unique entity ID ----
     # "tfame_sensor.id_measurement" e.g. "tfame_sensor.a12345678_temperature"
     @property
@@ -243,25 +292,33 @@ class TFAmeSensorEntity(SensorEntity):
         """Unique entity ID for Home Assistant."""
         return f"tfame_{self.entity_id}"
 
+    # ---- Derived state of this poll, calculated on first read ----
+    @property
+    def state_cache(self) -> TFAmeEntityState:
+        """State of last poll (value, icon, name, attributes)."""
+        state = self.entity_state
+        coordinator = self.coordinator
+        if state.generation != coordinator.generation:
+            state.update(
+                coordinator.data.get(self.entity_id),
+                coordinator.generation,
+                coordinator.poll_ts,
+                coordinator.history.rain_values,
+            )
+        return state
+
     # ---- Property: Name of sensor entity in HA: "ID MEASUEREMENT",  e.g. "A01234456 Temperature" ----
     @property
     def name(self) -> str:
         """Name of sensors in Home Assistant."""
-        try:
-            sensor_data = self.coordinator.data[self.entity_id]
-            str1 = f"{sensor_data['sensor_name']} {sensor_data['measurement'].capitalize()}"
-            str2 = str1.replace("Rssi", "RSSI")
-            str3 = str2.replace("Co2", "CO2")
-            return str3.replace("_", " ")
-        except (ValueError, TypeError, KeyError):
-            return "None"
+        return self.state_cache.name
 
     # ---- Property: Name of measurement value in HA: "measurement", e.g. "temperature" ----
     @property
     def measurement_name(self):
         """Name of measurement."""
         try:
-            measurement_name = self.coordinator.data[self.entity_id]["measurement"]
+            measurement_name = self.coordinator.data[self.entity_id].measurement
         except (ValueError, TypeError, KeyError):
             return None
 
@@ -269,62 +326,9 @@ class TFAmeSensorEntity(SensorEntity):
 
     # ---- Property: measurement value of an entity itself ----
     @property
-    # def state(self) -> None | int | float | str | StateType:
     def native_value(self) -> StateType:  # None | int | float | str | StateType:
         """Actual measurement value."""
-        try:
-            # Is measurement value still valid or old
-            last_update_ts: int = int(self.coordinator.data[self.entity_id]["ts"])
-            utc_now = datetime.now()
-            utc_now_ts = int(utc_now.timestamp())
-            timeout = self.get_timeout(self.sensor_id)
-            if (utc_now_ts - last_update_ts) <= (timeout):
-                measurement_value = self.coordinator.data[self.entity_id]["value"]
-
-                # Is this rain sensor relative values
-                if "rain_rel" in self.entity_id:
-                    reset_rain = self.coordinator.data[self.entity_id]["reset_rain"]
-                    if reset_rain:
-                        self.init_measure_value = measurement_value
-                        self.coordinator.data[self.entity_id]["reset_rain"] = False
-
-                    measurement_value = float(
-                        float(measurement_value) - float(self.init_measure_value)
-                    )
-                    measurement_value = round(measurement_value, 1)
-
-                # Is this rain sensor last hour
-                elif "rain_hour" in self.entity_id:
-                    try:
-                        str_rain = self.entity_id
-                        str_rain = str_rain.replace("_hour", "")
-                        value = self.coordinator.data[str_rain]["value"]
-                        ts = self.coordinator.data[str_rain]["ts"]
-                        self.rain_history.add_measurement(value, ts)
-                        measurement_value = float(0)
-                        if len(self.rain_history.data) >= 2:
-                            oldest, newest = self.rain_history.get_oldest_and_newest()
-                            measurement_value = float(newest[0]) - float(oldest[0])
-                            measurement_value = round(measurement_value, 1)
-                    except Exception as error:
-                        msg: str = (
-                            "Exception requesting data: str_rain = '"
-                            + str_rain
-                            + "' "
-                            + str(error.__doc__)
-                        )
-                        _LOGGER.error(msg)
-                        measurement_value = float(0)
-                        measurement_value = round(measurement_value, 1)
-                        raise
-
-            else:
-                measurement_value = None  # STATE_UNAVAILABLE  #   None  # TO.DO insert again or use other value STATE_UNAVAILABLE
-
-        except (ValueError, TypeError, KeyError):
-            return None  # Wrong data, Home Assistant shows sensor as "unavailable"
-
-        return measurement_value
+        return self.state_cache.value
 
     # ---- Property: Unit of measurement value, e.g. for wind speed unit is "m/s" ----
     @property
@@ -332,7 +336,7 @@ class TFAmeSensorEntity(SensorEntity):
     def native_unit_of_measurement(self) -> str | None:
         """Unit of measurement value."""
         try:
-            unit = self.coordinator.data[self.entity_id]["unit"]
+            unit = self.coordinator.data[self.entity_id].unit
             if unit is None:
                 return None  # Home Assistant shows "unavailable" ?
             return str(unit)
@@ -347,173 +351,147 @@ class TFAmeSensorEntity(SensorEntity):
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Additional attributes."""
-
-        try:
-            sensor_data = self.coordinator.data[self.entity_id]
-            return {
-                "sensor_name": sensor_data["sensor_name"],
-                "measurement": sensor_data["measurement"],
-                "timestamp": sensor_data["timestamp"],
-                "icon": self._attr_icon,
-            }
-        except (ValueError, TypeError, KeyError):
-            return {}
+        return self.state_cache.attributes
 
     # ---- Property: Icon for a measurement value ----
     @property
     def icon(self) -> str:
         """Returns icon based on actual measurement value."""
-        value = self.native_value  # self.state  # actual value
-        # get the icon
-        return self.get_icon(self.measurement_name, value)
-
-    # ---- Get an icon for measurement type based on measurement value (see MDI list) ----
-    def get_icon(self, measurement_type, value_state):
-        """Return icon for a sensor type."""
-
-        if value_state is None:
-            value = value_state  # use None
-        else:
-            value = float(value_state)
-
-        # Temperature & temperatue probe
-        if (measurement_type == "temperature") | (
-            measurement_type == "temperature_probe"
+        return self.state_cache.icon
+
+    # ---- Remove from index of coordinator ----
+    async def async_will_remove_from_hass(self) -> None:
+        """Entity is removed from Home Assistant."""
+        await super().async_will_remove_from_hass()
+        self._cancel_publish()
+        self.coordinator.entity_index.remove(self.entity_id)
+
+    # ---- Write state only when this entity has new data ----
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        coordinator = self.coordinator
+        # Failed or recovered request changes availability of all entities,
+        # options flow actions write at once too
+        if (
+            self.available != self.written_available
+            or self.entity_id in coordinator.forced_entities
         ):
-            if value is None:
-                return ICON_MAPPING["temperature"]["default"]
-            if value >= 25:
-                return ICON_MAPPING["temperature"]["high"]
-            if value <= 0:
-                return ICON_MAPPING["temperature"]["low"]
-            return ICON_MAPPING["temperature"]["default"]
-
-        # Humidity
-        if measurement_type == "humidity":
-            if value is None:
-                return ICON_MAPPING["humidity"]["default"]
-            if (value >= 65) | (value <= 30):
-                return ICON_MAPPING["humidity"]["alert"]
-            return ICON_MAPPING["humidity"]["default"]
-
-        # Air quality CO2
-        if measurement_type == "co2":
-            return ICON_MAPPING["co2"]["default"]
-
-        # Barometric pressure
-        if measurement_type == "barometric_pressure":
-            return ICON_MAPPING["barometric_pressure"]["default"]
-
-        # RSSI value for 868 MHz reception: range 0...255
-        if measurement_type == "rssi":
-            if value is None:
-                return ICON_MAPPING["rssi"]["weak"]
-
-            if value < 100:
-                return ICON_MAPPING["rssi"]["weak"]
-            if value < 150:
-                return ICON_MAPPING["rssi"]["middle"]
-            if value < 220:
-                return ICON_MAPPING["rssi"]["good"]
-            return ICON_MAPPING["rssi"]["strong"]
-
-        # Battery: 0 = low battery, 1 = good battery
-        if measurement_type == "lowbatt":
-            return (
-                ICON_MAPPING["lowbatt"]["low"]
-                if value == 1
-                else ICON_MAPPING["lowbatt"]["full"]
-            )
+            self._publish()
+        elif self.entity_id in coordinator.changed_entities:
+            self._publish_filtered()
+
+    @callback
+    def _publish_filtered(self) -> None:
+        """Write new value unless within deadband, wait for min. interval."""
+        publish_filter = self.publish_filter
+        delay = publish_filter.delay(self.state_cache.value, time.monotonic())
+        if delay is None:
+            publish_filter.suppressed += 1
+            self.coordinator.metrics.suppressed += 1
+            return
+        if delay > 0:
+            if self._unsub_publish is None:
+                self._unsub_publish = async_call_later(
+                    self.hass, delay, self._publish_delayed
+                )
+            else:
+                # Delayed write is pending, it writes this value instead
+                publish_filter.suppressed += 1
+                self.coordinator.metrics.suppressed += 1
+            return
+        self._publish()
+
+    @callback
+    def _publish_delayed(self, _now: Any) -> None:
+        """Min. interval is over, write the value of the last poll."""
+        self._unsub_publish = None
+        self._publish_filtered()
+
+    @callback
+    def _publish(self) -> None:
+        """Write state now."""
+        self._cancel_publish()
+        state = self.state_cache
+        self.written_available = self.available
+        self.publish_filter.set_published(state.value, time.monotonic())
+        if state.attributes:
+            state.attributes["suppressed_writes"] = self.publish_filter.suppressed
+        self.async_write_ha_state()
+
+    @callback
+    def _cancel_publish(self) -> None:
+        """Cancel delayed write."""
+        if self._unsub_publish is not None:
+            self._unsub_publish()
+            self._unsub_publish = None
+
+
+# ---- Diagnostic sensor of a poll metric ----
+class TFAmeMetricEntity(CoordinatorEntity[TFAmeDataCoordinator], SensorEntity):
+    """Poll metric of a station, part of the device of the station."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    # Rolling statistics & counters change with every poll, not worth a new
+    # attributes row in the recorder
+    _unrecorded_attributes = frozenset(
+        {
+            "p50",
+            "p95",
+            "p99",
+            "last",
+            "samples",
+            "polls",
+            "pushes",
+            "hit_rate",
+            "not_modified",
+            "cpu_saved_ms",
+            "running_poll",
+            "min_spacing",
+        }
+    )
+    entity_description: TFAmeMetricDescription
 
-        # Wind direction, speed & gust
-        if measurement_type == "wind_direction":
-            return self.get_wind_direction_icon(value)
-        if measurement_type == "wind_gust":
-            return ICON_MAPPING["wind"]["wind"]
-        if measurement_type == "wind_speed":
-            return ICON_MAPPING["wind"]["gust"]
-
-        # Rain:
-        if measurement_type == "rain":
-            return ICON_MAPPING["rain"]["moderate"]
-
-        # Unknown measurement type
-        return "mdi:help-circle"  # Fallback-Icon
-
-    # ---- Get an icon for wind direction based on values (o...15) ----
-    # Remark: there are only 8 arrows for direction but 16 wind direction so icon does not match optimal
-    def get_wind_direction_icon(self, value):
-        """Return icon for wind direction based on value 0 to 15."""
-        if value is None:
-            return "mdi:compass-outline"
-
-        if 0 <= value <= 1:
-            return "mdi:arrow-down"  # N (North)
-        if 2 <= value <= 3:
-            return "mdi:aarrow-bottom-left"  # NE (North-East)
-        if 4 <= value <= 5:
-            return "mdi:arrow-left"  # E (East)
-        if 6 <= value <= 7:
-            return "mdi:arrow-top-left"  # SE (South-East)
-        if 8 <= value <= 9:
-            return "mdi:arrow-up"  # S (South)
-        if 10 <= value <= 11:
-            return "mdi:arrow-top-right"  # SW (South-West)t
-        if 12 <= value <= 13:
-            return "mdi:arrow-right"  # W (West)
-        if 14 <= value <= 15:
-            return "mdi:arrow-bottom-right"  # NW (North-West)
-        return "mdi:compass-outline"  # Fallback, should not happen
-
-    # ---- Get the timeout time for a station or a sensor ----
-    def get_timeout(self, sensor_id: str):
-        """Return the timeout time for a station or sensor."""
+    def __init__(
+        self,
+        coordinator: TFAmeDataCoordinator,
+        description: TFAmeMetricDescription,
+    ) -> None:
+        """Initialize metric entity."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        gateway_id = coordinator.gateway_id
+        self.entity_id = f"sensor.{gateway_id}_{description.key}"
+        self._attr_unique_id = f"tfame_{self.entity_id}"
+        self._attr_name = f"{gateway_id.upper()} {description.name}"
+        sensor_type = get_sensor_type(gateway_id)
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, f"{gateway_id}_{gateway_id}")},
+            "name": TFAmeSensorEntity.format_string_tfa_id(
+                gateway_id, gateway_id, coordinator.multiple_entities
+            ),
+            "manufacturer": "TFA/Dostmann",
+            "model": sensor_type.model,
+        }
+        if sensor_type.is_station:
+            self._attr_device_info["configuration_url"] = (
+                f"http://{coordinator.host}/ha_menu"
+            )
 
-        try:
-            timeout_val = TIMEOUT_MAPPING[sensor_id[:2].upper()]
-        except KeyError:
-            timeout_val = 0
-        return timeout_val
-
-    # ----  ----
-    async def async_update(self) -> None:
-        """Manual Updating."""
-        await self.coordinator.async_request_refresh()
-
-
-# ---- Class to store history, specially for rain sensor to calculate rain of "last hour" ----
-class SensorHistory:
-    """History queue."""
-
-    def __init__(self, max_age_minutes=60) -> None:
-        """Initalaize history queue."""
-        self.max_age = max_age_minutes * 60
-        self.data: deque[tuple[float, int]] = deque()  # Stores (value, timestamp)
-
-    def add_measurement(self, value, ts):
-        """Add new value with time stamp."""
-        self.data.append((value, ts))
-        self.cleanup()
-
-    def cleanup(self):
-        """Remove entries older max_age seconds."""
-        utc_now = datetime.now()
-        utc_now_ts = int(utc_now.timestamp())
-        run = 1
-        while self.data and (run == 1):
-            ts1 = int(self.data[0][1])
-            ts2 = utc_now_ts - self.max_age
-            if ts1 < ts2:
-                self.data.popleft()
-            else:
-                run = 0
+    # ---- Metrics are also available when the last poll failed ----
+    @property
+    def available(self) -> bool:
+        """Metrics are always available."""
+        return True
 
-    def get_data(self):
-        """Return list with values."""
-        return list(self.data)
+    @property
+    def native_value(self) -> StateType:
+        """Actual metric value."""
+        return self.entity_description.value_fn(self.coordinator.metrics)
 
-    def get_oldest_and_newest(self):
-        """Return oldest and newest measuerement tuple."""
-        if not self.data:
-            return None, None  # If list is empty
-        return self.data[0], self.data[-1]  # First and last entry
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Percentiles & counts of the metric."""
+        if self.entity_description.attributes_fn is None:
+            return None
+        return self.entity_description.attributes_fn(self.coordinator.metrics)
@@ -0,0 +1,47 @@
+"""TFA.me station integration: snapshot.py."""
+
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, SNAPSHOT_SAVE_DELAY, SNAPSHOT_STORAGE_VERSION
+from .records import TFAmeRecordStore
+
+
+# ---- Records of the last poll, persisted in HA storage ----
+class TFAmeSnapshotStore:
+    """Last known data of a station in '/sensors' format, used at startup."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize store."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.snapshot"
+        )
+        self._save_at: float | None = None  # Monotonic time of pending save
+
+    async def async_load(self) -> dict[str, Any] | None:
+        """Return the snapshot saved before restart."""
+        return await self._store.async_load()
+
+    def async_schedule_save(self, records: TFAmeRecordStore) -> None:
+        """Save records later (changes of several polls in one write).
+
+        A pending save is not moved: 'async_delay_save()' starts its delay
+        again on every call and would never save with frequent changes.
+        """
+        now = time.monotonic()
+        if self._save_at is not None and now < self._save_at:
+            return  # Pending save writes the records as they are then
+        self._save_at = now + SNAPSHOT_SAVE_DELAY
+        self._store.async_delay_save(records.as_reply, SNAPSHOT_SAVE_DELAY)
+
+    async def async_save(self, records: TFAmeRecordStore) -> None:
+        """Save now (when station is unloaded)."""
+        if records.records:
+            await self._store.async_save(records.as_reply())
+
+    async def async_remove(self) -> None:
+        """Remove the snapshot (when station is removed)."""
+        await self._store.async_remove()
@@ -0,0 +1,143 @@
+"""TFA.me station integration: state.py."""
+
+from typing import Any
+
+from .const import PUBLISH_FILTER_MAPPING, PUBLISH_MAX_AGE
+from .lookup import get_icon_table
+from .records import RAIN_WINDOW_SUFFIXES, MeasurementRecord
+
+
+# ---- Name of sensor entity in HA: "ID MEASUREMENT", e.g. "A01234456 Temperature" ----
+def format_entity_name(record: MeasurementRecord) -> str:
+    """Name of an entity from its record."""
+    name = f"{record.sensor_name} {record.measurement.capitalize()}"
+    return name.replace("Rssi", "RSSI").replace("Co2", "CO2").replace("_", " ")
+
+
+# ---- Derived state of one entity, calculated once per poll ----
+class TFAmeEntityState:
+    """Value, icon, name and attributes of one entity.
+
+    State writes read these several times (icon needs the value, ...), so they
+    are calculated once per coordinator generation with the "now" of the poll.
+    """
+
+    __slots__ = (
+        "attributes",
+        "entity_id",
+        "generation",
+        "icon",
+        "icon_table",
+        "name",
+        "rain_offset",
+        "value",
+    )
+
+    def __init__(self, entity_id: str, record: MeasurementRecord) -> None:
+        """Initialize empty state."""
+        self.entity_id = entity_id
+        self.rain_offset = record.value  # "_rel" rain: value at last reset
+        self.icon_table = get_icon_table(record.measurement)
+        self.generation = -1  # Not calculated yet
+        self.value: Any = None
+        self.icon = ""
+        self.name = "None"
+        self.attributes: dict[str, Any] = {}
+
+    def update(
+        self,
+        record: MeasurementRecord | None,
+        generation: int,
+        now_ts: int,
+        rain_values: dict[str, float],
+    ) -> None:
+        """Calculate state from record of the poll."""
+        self.generation = generation
+        if record is None:
+            # Entity no longer reported by the station
+            self.value = None
+            self.name = "None"
+            self.attributes = {}
+            self.icon = self.icon_table.none_icon
+            return
+
+        self.value = self._get_value(record, now_ts, rain_values)
+        self.name = format_entity_name(record)
+        try:
+            self.icon = self.icon_table.get_icon(self.value)
+        except (ValueError, TypeError):
+            self.icon = self.icon_table.none_icon
+        self.attributes = {
+            "sensor_name": record.sensor_name,
+            "measurement": record.measurement,
+            "timestamp": record.timestamp,
+            "icon": self.icon,
+        }
+
+    def _get_value(
+        self, record: MeasurementRecord, now_ts: int, rain_values: dict[str, float]
+    ) -> Any:
+        """Actual measurement value, None when too old."""
+        try:
+            # Is measurement value still valid or old
+            if (now_ts - int(record.ts)) > record.sensor.timeout:
+                return None  # Home Assistant shows sensor as "unknown"
+
+            # Is this rain sensor relative values
+            if record.suffix == " rel":
+                if record.reset_rain:
+                    self.rain_offset = record.value
+                    record.reset_rain = False
+                return round(float(record.value) - float(self.rain_offset), 1)
+
+            # Is this rain of last hour, 24h, 7d or today, calculated by
+            # coordinator (history.py)
+            if record.suffix in RAIN_WINDOW_SUFFIXES:
+                return rain_values.get(self.entity_id, 0.0)
+
+        except (ValueError, TypeError):
+            return None  # Wrong data, Home Assistant shows sensor as "unavailable"
+
+        return record.value
+
+
+# ---- Deadband & min. interval of the state writes of one entity ----
+class TFAmePublishFilter:
+    """Decide if a new value of an entity is written (see PUBLISH_FILTER_MAPPING)."""
+
+    __slots__ = ("deadband", "min_interval", "published", "published_at", "suppressed")
+
+    def __init__(self, measurement: str) -> None:
+        """Initialize filter of a measurement type, nothing written yet."""
+        self.deadband, self.min_interval = PUBLISH_FILTER_MAPPING.get(
+            measurement, (0, 0)
+        )
+        self.published: Any = None  # Last written value
+        self.published_at: float | None = None  # Monotonic time of last write
+        self.suppressed = 0  # Writes not done (deadband, replaced while delayed)
+
+    def delay(self, value: Any, now: float) -> float | None:
+        """Return seconds until value may be written, None: within deadband.
+
+        A value within the deadband is written when the last write is older
+        than PUBLISH_MAX_AGE, so small changes and "timestamp" catch up.
+        """
+        last = self.published
+        if self.published_at is None or (value is None) != (last is None):
+            return 0.0  # First write, going stale or valid again
+        if (
+            self.deadband
+            and value is not None
+            and now - self.published_at < PUBLISH_MAX_AGE
+        ):
+            try:
+                if round(abs(float(value) - float(last)), 3) < self.deadband:
+                    return None
+            except (TypeError, ValueError):
+                pass  # Not a number, no deadband
+        return max(0.0, self.published_at + self.min_interval - now)
+
+    def set_published(self, value: Any, now: float) -> None:
+        """Value was written."""
+        self.published = value
+        self.published_at = now
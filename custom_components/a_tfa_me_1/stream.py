@@ -0,0 +1,244 @@
+"""TFA.me station integration: stream.py."""
+
+from collections.abc import Callable
+import codecs
+import json
+import time
+from typing import Any
+
+from .decoder import json_loads
+from .records import TFAmeRecordStore
+
+# Parser states
+_START = 0  # Expect "{"
+_KEY = 1  # Expect key or "}"
+_COLON = 2  # Expect ":"
+_VALUE = 3  # Expect value
+_AFTER_VALUE = 4  # Expect "," or "}"
+_ITEMS = 5  # In "sensors" array, expect first sensor or "]"
+_ITEM = 6  # Expect sensor object
+_AFTER_ITEM = 7  # Expect "," or "]"
+_END = 8  # Top level object done
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = ",}]" + _WHITESPACE  # End of a number or literal
+
+
+def _valid_sensor(sensor: Any) -> bool:
+    """Sensor has all keys the record store reads, "ts" is made an int."""
+    if not (
+        isinstance(sensor, dict)
+        and isinstance(sensor.get("sensor_id"), str)
+        and isinstance(sensor.get("name"), str)
+        and not isinstance(sensor.get("ts"), bool)
+    ):
+        return False
+    try:
+        sensor["ts"] = int(sensor["ts"])  # Float or string of some relays
+    except (KeyError, TypeError, ValueError, OverflowError):
+        return False
+    measurements = sensor.get("measurements", {})
+    return isinstance(measurements, dict) and all(
+        isinstance(values, dict) and "value" in values and "unit" in values
+        for values in measurements.values()
+    )
+
+
+# ---- Incremental parser for '/sensors' replies ----
+class TFAmeSensorStream:
+    """Parse a '/sensors' reply chunk by chunk and feed sensors to the store.
+
+    Only one sensor object is decoded at a time, the complete object tree of
+    the reply is never built. Sensors are fed to the record store as soon as
+    they are complete (and the "gateway_id" is known, it is needed for the
+    entity IDs). A reply which was received completely can be parsed at once
+    with the faster decoder of decoder.py ('parse_body()').
+    """
+
+    def __init__(
+        self,
+        store: TFAmeRecordStore,
+        reset_rain: bool,
+        now_ts: int,
+        gateway_id: str | None = None,
+    ) -> None:
+        """Initialize parser for one reply (expected "gateway_id" optional)."""
+        self.store = store
+        self.gateway_id = gateway_id
+        self.reset_rain = reset_rain
+        self.now_ts = now_ts
+        self.head: dict = {}  # Top level values except "sensors"
+        self.sensors = 0  # Number of parsed sensors
+        self.bytes = 0  # Number of received bytes
+        # Seconds spent in feed()/close() and of it in the record store
+        self.parse_time = 0.0
+        self.store_time = 0.0
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._state = _START
+        self._key = ""
+        self._started = False  # store.begin() called
+        self._pending: list[dict] = []  # Sensors received before "gateway_id"
+
+    def feed(self, chunk: bytes) -> None:
+        """Parse next chunk of the reply."""
+        start = time.perf_counter()
+        self.bytes += len(chunk)
+        self._buffer += self._utf8.decode(chunk)
+        self._parse(final=False)
+        self.parse_time += time.perf_counter() - start
+
+    def close(self) -> set[str]:
+        """End of reply, return changed entity IDs of the store."""
+        start = time.perf_counter()
+        self._buffer += self._utf8.decode(b"", final=True)
+        self._parse(final=True)
+        if self._state != _END:
+            raise ValueError("Incomplete JSON reply")
+        self._begin()
+        store_start = time.perf_counter()
+        changed = self.store.finish()
+        end = time.perf_counter()
+        self.store_time += end - store_start
+        self.parse_time += end - start
+        return changed
+
+    def parse_body(
+        self, body: bytes, loads: Callable[[bytes], Any] = json_loads
+    ) -> set[str]:
+        """Parse a complete reply at once, return changed entity IDs."""
+        start = time.perf_counter()
+        self.bytes += len(body)
+        data = loads(body)
+        if not isinstance(data, dict):
+            raise ValueError("JSON reply is no object")
+        self.head = {key: value for key, value in data.items() if key != "sensors"}
+        sensors = data.get("sensors", [])
+        if not isinstance(sensors, list):
+            raise ValueError("Sensors of JSON reply are no array")
+        self._begin()
+        for sensor in sensors:
+            self._add_sensor(sensor)
+        store_start = time.perf_counter()
+        changed = self.store.finish()
+        end = time.perf_counter()
+        self.store_time += end - store_start
+        self.parse_time += end - start
+        return changed
+
+    def _begin(self) -> None:
+        """Start poll of the store, feed waiting sensors."""
+        if self._started:
+            return
+        gateway_id = str(self.head.get("gateway_id", "tfame"))
+        if self.gateway_id and gateway_id.lower() != self.gateway_id:
+            # Data of another station, keep the records unchanged
+            raise ValueError("Unexpected gateway ID " + gateway_id)
+        self._started = True
+        start = time.perf_counter()
+        self.store.begin(gateway_id, self.reset_rain, self.now_ts)
+        for sensor in self._pending:
+            self.store.add_sensor(sensor)
+        self._pending.clear()
+        self.store_time += time.perf_counter() - start
+
+    def _add_sensor(self, sensor: Any) -> None:
+        """Feed one sensor to the store (ValueError when it is invalid)."""
+        if not _valid_sensor(sensor):
+            raise ValueError("Invalid sensor in JSON reply: " + str(sensor)[:100])
+        self.sensors += 1
+        if self._started:
+            start = time.perf_counter()
+            self.store.add_sensor(sensor)
+            self.store_time += time.perf_counter() - start
+        else:
+            self._pending.append(sensor)
+
+    def _parse(self, final: bool) -> None:
+        """Parse as much of the buffer as possible."""
+        buffer = self._buffer
+        length = len(buffer)
+        pos = 0
+        state = self._state
+        raw_decode = self._decoder.raw_decode
+
+        while True:
+            while pos < length and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos >= length:
+                break
+            char = buffer[pos]
+
+            if state == _START:
+                if char != "{":
+                    raise ValueError("JSON reply is no object")
+                pos += 1
+                state = _KEY
+            elif state == _KEY:
+                if char == "}":
+                    pos += 1
+                    state = _END
+                    continue
+                try:
+                    self._key, pos = raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    break  # Wait for rest of key
+                state = _COLON
+            elif state == _COLON:
+                if char != ":":
+                    raise ValueError("Expected ':' in JSON reply")
+                pos += 1
+                state = _VALUE
+            elif state == _VALUE:
+                if self._key == "sensors":
+                    if char != "[":
+                        raise ValueError("Sensors of JSON reply are no array")
+                    pos += 1
+                    state = _ITEMS
+                    continue
+                try:
+                    value, end = raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    break  # Wait for rest of value
+                if not final and (end >= length or buffer[end] not in _DELIMITERS):
+                    # Number or literal may continue in next chunk ("12." or
+                    # "1e" are decoded as 12 and 1)
+                    break
+                self.head[self._key] = value
+                pos = end
+                state = _AFTER_VALUE
+                if self._key == "gateway_id":
+                    self._begin()
+            elif state in (_AFTER_VALUE, _AFTER_ITEM):
+                pos += 1
+                if char == ",":
+                    state = _KEY if state == _AFTER_VALUE else _ITEM
+                elif char == ("}" if state == _AFTER_VALUE else "]"):
+                    state = _END if state == _AFTER_VALUE else _AFTER_VALUE
+                else:
+                    raise ValueError("Unexpected '" + char + "' in JSON reply")
+            elif state == _ITEMS:
+                if char == "]":
+                    pos += 1
+                    state = _AFTER_VALUE
+                else:
+                    state = _ITEM
+            elif state == _ITEM:
+                try:
+                    sensor, pos = raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    break  # Wait for rest of sensor
+                self._add_sensor(sensor)
+                state = _AFTER_ITEM
+            else:  # _END
+                raise ValueError("Data after JSON reply")
+
+        self._buffer = buffer[pos:]
+        self._state = state
@@ -0,0 +1,25 @@
+"""TFA.me station integration: test setup, also used by the benchmarks."""
+
+import importlib
+from pathlib import Path
+import sys
+import types
+
+PACKAGE = "custom_components.a_tfa_me_1"
+PACKAGE_DIR = Path(__file__).parent.parent / "custom_components" / "a_tfa_me_1"
+
+
+def load_integration_module(name: str) -> types.ModuleType:
+    """Import a module of the integration without running its '__init__.py'.
+
+    Only works for modules without Home Assistant imports (const, records, ...).
+    """
+    for pkg_name, path in (
+        ("custom_components", PACKAGE_DIR.parent),
+        (PACKAGE, PACKAGE_DIR),
+    ):
+        if pkg_name not in sys.modules:
+            package = types.ModuleType(pkg_name)
+            package.__path__ = [str(path)]
+            sys.modules[pkg_name] = package
+    return importlib.import_module(f"{PACKAGE}.{name}")
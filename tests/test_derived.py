@@ -0,0 +1,88 @@
+"""TFA.me station integration: tests of the derived measurements."""
+
+import pytest
+
+from conftest import load_integration_module
+
+derived = load_integration_module("derived")
+records = load_integration_module("records")
+
+NOW_TS = 1741250761
+WIND_CHILL = "sensor.a2000000c_wind_chill"
+
+
+def _sensor(sensor_id: str, ts: int, **values: float) -> dict:
+    """Sensor of a '/sensors' reply."""
+    units = {"temperature": "°C", "humidity": "%", "wind_speed": "m/s"}
+    return {
+        "sensor_id": sensor_id,
+        "name": sensor_id.upper(),
+        "ts": ts,
+        "measurements": {
+            name: {"value": str(value), "unit": units[name]}
+            for name, value in values.items()
+        },
+    }
+
+
+def _poll(store, metrics, sensors: list[dict]) -> set[str]:
+    """Poll and derived update, return changed entity IDs."""
+    changed = store.update(
+        {"gateway_id": "017654321", "sensors": sensors}, False, NOW_TS
+    )
+    return changed | metrics.update(store, changed)
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_outdoor_lowest_sensor_id(reverse: bool) -> None:
+    """Wind chill uses the outdoor sensor with the lowest ID, in any order."""
+    sensors = [
+        _sensor("a5bbbbbbb", NOW_TS, temperature=60),
+        _sensor("a0aaaaaaa", NOW_TS, temperature=5),
+        _sensor("a2000000c", NOW_TS, wind_speed=10),
+        _sensor("0100000ff", NOW_TS, temperature=-20),  # Station
+    ]
+    store = records.TFAmeRecordStore(False)
+    metrics = derived.TFAmeDerivedMetrics()
+    _poll(store, metrics, sensors[::-1] if reverse else sensors)
+    assert metrics.outdoor_id == "a0aaaaaaa"
+    assert store.records[WIND_CHILL].value == round(derived.wind_chill(5, 10), 1)
+
+
+def test_outdoor_sensor_removed() -> None:
+    """Next outdoor sensor when it is gone, no wind chill without any."""
+    outdoor = _sensor("a0aaaaaaa", NOW_TS, temperature=5)
+    second = _sensor("a5bbbbbbb", NOW_TS, temperature=-5)
+    wind = _sensor("a2000000c", NOW_TS, wind_speed=10)
+    store = records.TFAmeRecordStore(False)
+    metrics = derived.TFAmeDerivedMetrics()
+    _poll(store, metrics, [outdoor, second, wind])
+
+    changed = _poll(store, metrics, [second, wind])
+    assert metrics.outdoor_id == "a5bbbbbbb"
+    assert WIND_CHILL in changed
+    assert store.records[WIND_CHILL].value == round(derived.wind_chill(-5, 10), 1)
+
+    changed = _poll(store, metrics, [wind])
+    assert metrics.outdoor_id is None
+    assert metrics.outdoor is None
+    assert WIND_CHILL in changed
+    assert WIND_CHILL not in store.records
+    assert "sensor.a2000000c_beaufort" in store.records
+
+
+def test_input_removed() -> None:
+    """Derived measurements of an input gone without new transmission."""
+    store = records.TFAmeRecordStore(False)
+    metrics = derived.TFAmeDerivedMetrics()
+    sensor = _sensor("a2000000c", NOW_TS, temperature=5, humidity=80, wind_speed=10)
+    _poll(store, metrics, [sensor])
+    assert "sensor.a2000000c_dew_point" in store.records
+
+    del sensor["measurements"]["humidity"]
+    changed = _poll(store, metrics, [sensor])
+    for measurement in ("dew_point", "absolute_humidity", "heat_index"):
+        assert f"sensor.a2000000c_{measurement}" in changed
+        assert f"sensor.a2000000c_{measurement}" not in store.records
+    assert store.records[WIND_CHILL].value == round(derived.wind_chill(5, 10), 1)
+    assert "sensor.a2000000c_beaufort" in store.records
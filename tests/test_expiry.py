@@ -0,0 +1,62 @@
+"""TFA.me station integration: tests of the expiry queue."""
+
+from conftest import load_integration_module
+
+expiry = load_integration_module("expiry")
+records = load_integration_module("records")
+
+NOW_TS = 1741250761
+
+
+def _sensor(sensor_id: str, ts: int, timeout: int = 630) -> "records.SensorRecord":
+    """Sensor record."""
+    return records.SensorRecord(
+        sensor_id=sensor_id,
+        gateway_id="017654321",
+        name=sensor_id.upper(),
+        timestamp="2025-03-06T08:46:01Z",
+        ts=ts,
+        timeout=timeout,
+        interval=300,
+    )
+
+
+def test_order() -> None:
+    """Sensors expire in order of "ts" + timeout, one second after."""
+    queue = expiry.TFAmeExpiryQueue()
+    assert queue.next_expiry() is None
+    queue.update([_sensor("a0", NOW_TS), _sensor("a1", NOW_TS - 100, 150)])
+    assert queue.next_expiry() == NOW_TS + 51
+    assert queue.pop_expired(NOW_TS + 50) == []
+    assert queue.pop_expired(NOW_TS + 51) == ["a1"]
+    assert queue.next_expiry() == NOW_TS + 631
+    assert queue.pop_expired(NOW_TS + 1000) == ["a0"]
+    assert queue.next_expiry() is None
+
+
+def test_new_transmission_replaces_entry() -> None:
+    """Old entry of a sensor with a new "ts" is dropped."""
+    queue = expiry.TFAmeExpiryQueue()
+    sensor = _sensor("a0", NOW_TS)
+    queue.update([sensor])
+    sensor.ts = NOW_TS + 300
+    queue.update([sensor])
+    queue.update([sensor])  # Same "ts": no new entry
+    assert len(queue._heap) == 2  # noqa: SLF001
+    assert queue.next_expiry() == NOW_TS + 931
+    assert len(queue._heap) == 1  # noqa: SLF001
+    assert queue.pop_expired(NOW_TS + 631) == []
+    assert queue.pop_expired(NOW_TS + 931) == ["a0"]
+
+
+def test_expired_sensor_again() -> None:
+    """A sensor updated after it expired is queued again."""
+    queue = expiry.TFAmeExpiryQueue()
+    sensor = _sensor("a0", NOW_TS)
+    queue.update([sensor])
+    assert queue.pop_expired(NOW_TS + 631) == ["a0"]
+    queue.update([sensor])  # Same "ts", expires at once
+    assert queue.pop_expired(NOW_TS + 632) == ["a0"]
+    sensor.ts = NOW_TS + 700
+    queue.update([sensor])
+    assert queue.next_expiry() == NOW_TS + 1331
@@ -0,0 +1,119 @@
+"""TFA.me station integration: tests of the rain history rings."""
+
+import pytest
+
+from conftest import load_integration_module
+
+pytest.importorskip("homeassistant")
+
+const = load_integration_module("const")
+history = load_integration_module("history")
+
+BUCKET = 60
+START = 1741250700 // 900 * 900  # On a border of all buckets
+
+
+def _ts(bucket: int) -> int:
+    """Time stamp within a bucket of the test ring."""
+    return START + bucket * BUCKET + 5
+
+
+def _totals() -> "history.RainTotals":
+    """Ring of 6 buckets."""
+    totals = history.RainTotals(5 * BUCKET, BUCKET)
+    assert len(totals.totals) == 6
+    return totals
+
+
+def test_totals_empty() -> None:
+    """No total before the first measurement."""
+    totals = _totals()
+    assert totals.total_at(_ts(0)) == 0.0
+    totals.add(2.0, _ts(3))
+    assert totals.total_at(_ts(2)) == 0.0
+    assert totals.total_at(_ts(3)) == 2.0
+    assert totals.total_at(_ts(100)) == 2.0  # Newer than the newest
+
+
+def test_totals_gap_filled() -> None:
+    """Buckets without measurement have the total of the bucket before."""
+    totals = _totals()
+    totals.add(1.0, _ts(4))
+    totals.add(3.0, _ts(7))  # Over the end of the ring (modulo 6)
+    assert [totals.total_at(_ts(bucket)) for bucket in range(4, 9)] == [
+        1.0,
+        1.0,
+        1.0,
+        3.0,
+        3.0,
+    ]
+    totals.add(4.0, _ts(7))  # Same bucket: newest total
+    assert totals.total_at(_ts(7)) == 4.0
+
+
+def test_totals_gap_longer_than_ring() -> None:
+    """A gap longer than the ring fills it once, older times use the oldest."""
+    totals = _totals()
+    totals.add(1.0, _ts(0))
+    totals.add(5.0, _ts(20))
+    assert totals.total_at(_ts(20)) == 5.0
+    for bucket in range(15, 20):
+        assert totals.total_at(_ts(bucket)) == 1.0
+    # Older than the ring: clamped to the oldest bucket kept
+    assert totals.total_at(_ts(10)) == 1.0
+    totals.add(6.0, _ts(25))
+    assert totals.total_at(_ts(10)) == 5.0  # Oldest bucket is 20 now
+
+
+def test_history_counter_reset_and_wrap() -> None:
+    """A counter going back counts from 0, duplicates are ignored."""
+    rain = history.RainHistory()
+    assert rain.add(10.0, START)
+    assert rain.add(12.5, START + 60)
+    assert not rain.add(20.0, START + 60)  # Same "ts"
+    assert not rain.add(20.0, START)  # Older "ts"
+    assert rain.add(1.0, START + 120)  # Reset: 1.0 since then
+    assert rain.add(0.5, START + 180)  # Wrap around: 0.5 since then
+    assert rain.total == 4.0
+    assert rain.get_rain(START + 180, 3600) == 4.0
+    assert rain.get_rain(START + 180, 90) == 1.5  # Since START + 90
+
+
+def test_history_windows() -> None:
+    """Rain of the last hour and 24 hours from the two rings."""
+    rain = history.RainHistory()
+    for minute in range(0, 25 * 60, 10):
+        rain.add(minute / 10, START + minute * 60)  # 0.1 mm per minute
+    now = START + (25 * 60 - 10) * 60
+    assert rain.get_rain(now, const.HISTORY_MAX_AGE) == 6.0
+    assert rain.get_rain(now, 24 * 60 * 60) == 144.0
+    assert rain.get_rain(now, const.HISTORY_LONG_MAX_AGE) == rain.total
+
+
+@pytest.mark.parametrize(("offset", "today"), [(-1, 0.0), (0, 2.0), (1, 2.0)])
+def test_history_since_midnight(offset: int, today: float) -> None:
+    """Rain at midnight belongs to the new day, one second before not."""
+    midnight = START + 24 * 60 * 60
+    rain = history.RainHistory()
+    rain.add(5.0, midnight - 3600)
+    rain.add(7.0, midnight + offset)
+    assert rain.get_rain_since(midnight) == today
+
+
+def test_history_stored() -> None:
+    """Stored history is restored, not with another layout."""
+    rain = history.RainHistory()
+    rain.add(1.0, START)
+    rain.add(3.0, START + 600)
+    data = rain.as_dict()
+    restored = history.RainHistory.from_dict(data)
+    assert restored.as_dict() == data
+    assert restored.get_rain(START + 600, 3600) == 2.0
+
+    other = history.RainHistory.from_dict({**data, "layout": [1, 2, 3, 4]})
+    assert other.total == 0.0
+    assert other.last_ts == 0
+    with pytest.raises(ValueError):
+        history.RainHistory.from_dict(
+            {**data, "hour": {**data["hour"], "totals": []}}
+        )
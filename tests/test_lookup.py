@@ -0,0 +1,111 @@
+"""TFA.me station integration: tests of the icon tables and sensor types."""
+
+import pytest
+
+from conftest import load_integration_module
+
+lookup = load_integration_module("lookup")
+
+ICON_MAPPING = lookup.ICON_MAPPING
+
+
+def _old_icon(measurement_type: str, value_state) -> str:
+    """Icon of the if-chains in 'TFAmeSensorEntity' before the icon tables."""
+    value = None if value_state is None else float(value_state)
+    if measurement_type in ("temperature", "temperature_probe"):
+        if value is None:
+            return ICON_MAPPING["temperature"]["default"]
+        if value >= 25:
+            return ICON_MAPPING["temperature"]["high"]
+        if value <= 0:
+            return ICON_MAPPING["temperature"]["low"]
+        return ICON_MAPPING["temperature"]["default"]
+    if measurement_type == "humidity":
+        if value is None:
+            return ICON_MAPPING["humidity"]["default"]
+        if value >= 65 or value <= 30:
+            return ICON_MAPPING["humidity"]["alert"]
+        return ICON_MAPPING["humidity"]["default"]
+    if measurement_type == "co2":
+        return ICON_MAPPING["co2"]["default"]
+    if measurement_type == "barometric_pressure":
+        return ICON_MAPPING["barometric_pressure"]["default"]
+    if measurement_type == "rssi":
+        if value is None or value < 100:
+            return ICON_MAPPING["rssi"]["weak"]
+        if value < 150:
+            return ICON_MAPPING["rssi"]["middle"]
+        if value < 220:
+            return ICON_MAPPING["rssi"]["good"]
+        return ICON_MAPPING["rssi"]["strong"]
+    if measurement_type == "lowbatt":
+        if value == 1:
+            return ICON_MAPPING["lowbatt"]["low"]
+        return ICON_MAPPING["lowbatt"]["full"]
+    if measurement_type == "wind_direction":
+        if value is not None:
+            for number, arrow in enumerate(lookup.WIND_DIRECTION_ARROWS):
+                if 2 * number <= value <= 2 * number + 1:
+                    return arrow
+        return ICON_MAPPING["wind_direction"]["default"]
+    if measurement_type == "wind_gust":
+        return ICON_MAPPING["wind"]["wind"]
+    if measurement_type == "wind_speed":
+        return ICON_MAPPING["wind"]["gust"]
+    if measurement_type == "rain":
+        return ICON_MAPPING["rain"]["moderate"]
+    return "mdi:help-circle"
+
+
+# Limits of the old if-chains, tested below, at and above
+LIMITS = {
+    "temperature": (0, 25),
+    "temperature_probe": (0, 25),
+    "humidity": (30, 65),
+    "co2": (600,),
+    "barometric_pressure": (1013,),
+    "rssi": (100, 150, 220),
+    "lowbatt": (0, 1),
+    "wind_direction": tuple(range(16)),
+    "wind_gust": (0,),
+    "wind_speed": (0,),
+    "rain": (0,),
+    "unknown": (0,),
+}
+
+
+@pytest.mark.parametrize("measurement", LIMITS)
+def test_icon_tables_as_if_chains(measurement: str) -> None:
+    """Same icons as the old if-chains at every limit."""
+    values = [None, -1000.0, 1000.0]
+    for limit in LIMITS[measurement]:
+        values += [limit - 0.5, limit - 0.01, limit, str(limit), limit + 0.01]
+    for value in values:
+        assert lookup.get_icon(measurement, value) == _old_icon(
+            measurement, value
+        ), value
+
+
+def test_icon_no_number() -> None:
+    """ValueError for a value which is no number, like float()."""
+    with pytest.raises(ValueError):
+        lookup.get_icon("temperature", "n/a")
+
+
+def test_icon_table_order() -> None:
+    """Limits must be in ascending order."""
+    with pytest.raises(ValueError):
+        lookup.IconTable("a", (("<", 2, "b"), ("<", 1, "c")), "d")
+
+
+def test_sensor_type() -> None:
+    """Type of a station or sensor from the first two characters of its ID."""
+    station = lookup.get_sensor_type("017654321")
+    assert station.is_station
+    assert station.model == "Station 01: T/H"
+    sensor = lookup.get_sensor_type("a01234456")
+    assert not sensor.is_station
+    assert sensor.timeout > sensor.interval > 0
+    unknown = lookup.get_sensor_type("zz0000000")
+    assert (unknown.model, unknown.timeout, unknown.interval) == ("?", 0, 0)
+    assert not unknown.is_station
@@ -0,0 +1,59 @@
+"""TFA.me station integration: tests of the adaptive poll scheduler."""
+
+from conftest import load_integration_module
+
+records = load_integration_module("records")
+scheduler = load_integration_module("scheduler")
+
+NOW_TS = 1741250761
+
+
+def _sensor(ts: int, interval: int = 60, timeout: int = 150) -> "records.SensorRecord":
+    """Sensor record."""
+    return records.SensorRecord(
+        sensor_id="a4",
+        gateway_id="017654321",
+        name="A4",
+        timestamp="2025-03-06T08:46:01Z",
+        ts=ts,
+        timeout=timeout,
+        interval=interval,
+    )
+
+
+def _scheduler() -> "scheduler.TFAmeAdaptiveScheduler":
+    """Scheduler with 10 s to 300 s and 3 s margin."""
+    return scheduler.TFAmeAdaptiveScheduler(10, 300, 3)
+
+
+def test_next_expected_transmission() -> None:
+    """Poll shortly after the next expected "ts" of all sensors."""
+    sensors = [_sensor(NOW_TS - 20), _sensor(NOW_TS - 5, 300, 630)]
+    assert _scheduler().next_delay(sensors, NOW_TS) == 60 - 20 + 3
+
+
+def test_clamped() -> None:
+    """Delay within min. and max. interval."""
+    assert _scheduler().next_delay([_sensor(NOW_TS - 58)], NOW_TS) == 10
+    assert _scheduler().next_delay([_sensor(NOW_TS, 3600, 7230)], NOW_TS) == 300
+    assert _scheduler().next_delay([], NOW_TS) == 300  # Nothing due
+    assert _scheduler().next_delay([_sensor(NOW_TS, 0)], NOW_TS) == 300  # Unknown
+
+
+def test_missed_transmission_backoff() -> None:
+    """Late sensor: poll soon, the delay doubles while it stays late."""
+    schedule = _scheduler()
+    late = [_sensor(NOW_TS - 100)]
+    assert [schedule.next_delay(late, NOW_TS) for _ in range(3)] == [10, 20, 40]
+    assert schedule.next_delay([_sensor(NOW_TS)], NOW_TS) == 63
+    assert schedule.misses == 0
+    # Stale sensor is not waited for
+    assert schedule.next_delay([_sensor(NOW_TS - 200)], NOW_TS) == 300
+
+
+def test_error_backoff() -> None:
+    """Errors: retry soon, the delay doubles up to the max. interval."""
+    schedule = _scheduler()
+    assert [schedule.error_delay() for _ in range(7)] == [10, 20, 40, 80, 160, 300, 300]
+    schedule.next_delay([_sensor(NOW_TS)], NOW_TS)
+    assert schedule.error_delay() == 10
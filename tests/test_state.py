@@ -0,0 +1,40 @@
+"""TFA.me station integration: tests of the publish filter of entities."""
+
+from conftest import load_integration_module
+
+const = load_integration_module("const")
+state = load_integration_module("state")
+
+
+def test_deadband() -> None:
+    """Small changes are not written, larger ones at once."""
+    publish_filter = state.TFAmePublishFilter("temperature")
+    assert publish_filter.delay(20.0, 0.0) == 0.0  # First write
+    publish_filter.set_published(20.0, 0.0)
+    assert publish_filter.delay(20.1, 60.0) is None
+    assert publish_filter.delay(20.3, 60.0) == 0.0
+    assert publish_filter.delay(None, 60.0) == 0.0  # Going stale
+
+
+def test_deadband_max_age() -> None:
+    """A value within the deadband is written after the max. age."""
+    publish_filter = state.TFAmePublishFilter("temperature")
+    publish_filter.set_published(20.0, 0.0)
+    assert publish_filter.delay(20.1, const.PUBLISH_MAX_AGE - 1) is None
+    assert publish_filter.delay(20.1, const.PUBLISH_MAX_AGE) == 0.0
+    assert publish_filter.delay(20.0, const.PUBLISH_MAX_AGE) == 0.0  # Heartbeat
+
+
+def test_min_interval() -> None:
+    """Values are delayed until the min. interval after the last write."""
+    publish_filter = state.TFAmePublishFilter("rssi")
+    publish_filter.set_published(180, 0.0)
+    assert publish_filter.delay(150, 60.0) == 15 * 60 - 60
+    assert publish_filter.delay(175, 60.0) is None  # Within deadband
+
+
+def test_no_filter() -> None:
+    """Measurements without filter are written at once."""
+    publish_filter = state.TFAmePublishFilter("rain")
+    publish_filter.set_published(1.0, 0.0)
+    assert publish_filter.delay(1.0, 1.0) == 0.0
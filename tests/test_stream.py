@@ -0,0 +1,165 @@
+"""TFA.me station integration: tests of the incremental reply parser."""
+
+import json
+
+from conftest import load_integration_module
+import pytest
+
+records = load_integration_module("records")
+stream = load_integration_module("stream")
+
+NOW_TS = 1741250761
+
+# Numbers split after "." or "e" are valid JSON when the rest follows
+REPLY = json.dumps(
+    {
+        "gateway_id": "017654321",
+        "version": 12.5,
+        "scale": 1e5,
+        "offset": -0.25e-3,
+        "enabled": True,
+        "sensors": [
+            {
+                "sensor_id": "a01234456",
+                "name": "A01234456",
+                "timestamp": "2025-03-06T08:46:01Z",
+                "ts": NOW_TS - 60,
+                "measurements": {
+                    "temperature": {"value": 21.5, "unit": "°C"},
+                    "humidity": {"value": 45, "unit": "%"},
+                },
+            },
+            {
+                "sensor_id": "a11234457",
+                "name": "A11234457",
+                "timestamp": "2025-03-06T08:46:01Z",
+                "ts": NOW_TS - 120,
+                "measurements": {"rain": {"value": 1.2e1, "unit": "mm"}},
+            },
+        ],
+        "uptime": 3600,
+    },
+    indent=1,
+).encode()
+
+
+def _records(store) -> dict:
+    """Values of the records of a store."""
+    return {
+        ent_id: (record.sensor_name, record.value, record.unit, record.ts)
+        for ent_id, record in store.records.items()
+    }
+
+
+def _parse_body() -> tuple[dict, dict, set[str]]:
+    """Parse the reply at once."""
+    store = records.TFAmeRecordStore(False)
+    parser = stream.TFAmeSensorStream(store, False, NOW_TS)
+    changed = parser.parse_body(REPLY, json.loads)
+    return parser.head, _records(store), changed
+
+
+def _feed(chunks: list[bytes]) -> tuple[dict, dict, set[str]]:
+    """Parse the reply chunk by chunk."""
+    store = records.TFAmeRecordStore(False)
+    parser = stream.TFAmeSensorStream(store, False, NOW_TS)
+    for chunk in chunks:
+        parser.feed(chunk)
+    changed = parser.close()
+    return parser.head, _records(store), changed
+
+
+def test_split_at_every_byte() -> None:
+    """Two chunks, split at every position, give the same records."""
+    expected = _parse_body()
+    for pos in range(len(REPLY) + 1):
+        assert _feed([REPLY[:pos], REPLY[pos:]]) == expected, pos
+
+
+def test_byte_by_byte() -> None:
+    """One byte per chunk gives the same records."""
+    assert _feed([REPLY[pos : pos + 1] for pos in range(len(REPLY))]) == (
+        _parse_body()
+    )
+
+
+@pytest.mark.parametrize(
+    ("first", "second"),
+    [
+        (b'{"gateway_id":"ab","n":12.', b'5,"sensors":[]}'),
+        (b'{"gateway_id":"ab","n":1e', b'5,"sensors":[]}'),
+        (b'{"gateway_id":"ab","n":-', b'1,"sensors":[]}'),
+        (b'{"gateway_id":"ab","n":tr', b'ue,"sensors":[]}'),
+    ],
+)
+def test_split_number(first: bytes, second: bytes) -> None:
+    """Numbers and literals continued in the next chunk."""
+    head, _values, _changed = _feed([first, second])
+    assert head["n"] == json.loads(first + second)["n"]
+
+
+def test_invalid_number() -> None:
+    """Invalid number is rejected at the end of the reply."""
+    with pytest.raises(ValueError):
+        _feed([b'{"gateway_id":"ab","n":12.x,"sensors":[]}'])
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b'{"sensors":[{"sensor_id":"a"}]}',
+        b'{"sensors":[1]}',
+        b'{"sensors":{"a":1}}',
+        b'{"sensors":[{"sensor_id":"a","name":"A","ts":1,"measurements":[]}]}',
+        b'{"sensors":[{"sensor_id":"a","name":"A","ts":true}]}',
+        b'{"sensors":[{"sensor_id":"a","name":"A","ts":"x"}]}',
+        b'{"sensors":[{"sensor_id":"a","name":"A","ts":null}]}',
+        b'{"sensors":[{"sensor_id":"a","name":"A","ts":1,'
+        b'"measurements":{"rain":{"value":1}}}]}',
+    ],
+)
+def test_invalid_sensor(body: bytes) -> None:
+    """Invalid sensors are rejected with ValueError, at once and chunked."""
+    with pytest.raises(ValueError):
+        stream.TFAmeSensorStream(
+            records.TFAmeRecordStore(False), False, NOW_TS
+        ).parse_body(body, json.loads)
+    with pytest.raises(ValueError):
+        _feed([body])
+
+
+@pytest.mark.parametrize("ts", [NOW_TS, float(NOW_TS), str(NOW_TS)])
+def test_ts_normalized(ts: int | float | str) -> None:
+    """Time stamps as float or string are accepted as int."""
+    sensor = {
+        "sensor_id": "a01234456",
+        "name": "A01234456",
+        "ts": ts,
+        "measurements": {"temperature": {"value": 21.5, "unit": "°C"}},
+    }
+    body = json.dumps({"gateway_id": "017654321", "sensors": [sensor]}).encode()
+    store = records.TFAmeRecordStore(False)
+    stream.TFAmeSensorStream(store, False, NOW_TS).parse_body(body, json.loads)
+    assert store.sensors["a01234456"].ts == NOW_TS
+    _head, values, _changed = _feed([body])
+    assert values["sensor.a01234456_temperature"][3] == NOW_TS
+
+
+def test_changes_of_failed_poll_kept() -> None:
+    """Entities updated by a poll which failed are changed after the next."""
+    store = records.TFAmeRecordStore(False)
+    stream.TFAmeSensorStream(store, False, NOW_TS).parse_body(REPLY, json.loads)
+    reply = json.loads(REPLY)
+    reply["sensors"][0]["ts"] += 60
+    failed = dict(reply, sensors=[*reply["sensors"], {"sensor_id": "a"}])
+    with pytest.raises(ValueError):
+        stream.TFAmeSensorStream(store, False, NOW_TS).parse_body(
+            json.dumps(failed).encode(), json.loads
+        )
+    changed = stream.TFAmeSensorStream(store, False, NOW_TS).parse_body(
+        json.dumps(reply).encode(), json.loads
+    )
+    assert changed == {
+        "sensor.a01234456_temperature",
+        "sensor.a01234456_humidity",
+    }